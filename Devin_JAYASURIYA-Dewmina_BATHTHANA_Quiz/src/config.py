@@ -2,7 +2,7 @@
 """Module de configuration du générateur de quiz."""
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -19,11 +19,23 @@ class Settings(BaseSettings):
     anthropic_model: str = "claude-3-5-sonnet-latest"
     embedding_model: str = "text-embedding-3-large"
 
+    # Routage des modèles (modèle rapide pour les requêtes simples)
+    routing_enabled: bool = True
+    fast_model: str = "gpt-4o-mini"
+    routing_fast_max_difficulty: int = 2
+    routing_fast_max_chars: int = 4000
+    routing_fast_question_types: List[str] = ["qcm", "ouvert"]
+    routing_min_success_rate: float = 0.8
+    routing_stats_path: Optional[str] = None
+    routing_decay: float = 0.1  # poids d'un nouvel appel dans les moyennes
+    routing_explore_every: int = 20  # une requête simple sur N sonde le modèle rapide écarté
+
     # Configuration de sortie
     output_language: str = "fr"
     default_difficulty: int = 1  # 1-5
     min_questions: int = 5
     max_questions: int = 20
+    chunk_max_chars: int = 8000  # Taille max d'un morceau envoyé au LLM
 
     # Options de génération
     include_explanations: bool = True
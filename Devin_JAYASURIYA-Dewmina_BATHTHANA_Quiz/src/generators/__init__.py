@@ -2,9 +2,14 @@
 """Module de génération de quiz à partir de documents."""
 
 from .base_generator import BaseGenerator
+from .checkpoint import CheckpointJournal
+from .exporters import export_quiz_formats, resolve_formats
 from .quiz_generator import QuizGenerator
 
 __all__ = [
     "BaseGenerator",
+    "CheckpointJournal",
     "QuizGenerator",
+    "export_quiz_formats",
+    "resolve_formats",
 ]
@@ -0,0 +1,81 @@
+"""Journal de reprise pour la génération de quiz par morceaux."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any
+
+
+class CheckpointJournal:
+    """
+    Journal en ajout seul des morceaux déjà générés pour un document.
+
+    Chaque ligne du fichier JSONL contient la clé d'un morceau et le quiz
+    partiel produit pour ce morceau. Une ligne tronquée (arrêt brutal en
+    cours d'écriture) est ignorée au rechargement.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    @classmethod
+    def for_file(cls, checkpoint_dir: str | Path, file_path: str | Path) -> "CheckpointJournal":
+        """
+        Retourne le journal associé au contenu d'un document.
+
+        Args:
+            checkpoint_dir: Dossier des journaux
+            file_path: Document source (son contenu identifie le journal)
+
+        Returns:
+            Journal du document
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(block)
+        name = f"{Path(file_path).stem}-{digest.hexdigest()[:16]}.jsonl"
+        return cls(Path(checkpoint_dir) / name)
+
+    @staticmethod
+    def chunk_key(content: str, **params) -> str:
+        """Calcule la clé d'un morceau à partir de son contenu et des paramètres de génération."""
+        payload = json.dumps(params, sort_keys=True, default=str) + "\n" + content
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Retourne les quiz partiels déjà enregistrés, par clé de morceau."""
+        if not self.path.exists():
+            return {}
+
+        done = {}
+        with self.path.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                    done[entry["chunk_key"]] = entry["quiz"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return done
+
+    def append(self, chunk_key: str, quiz: Dict[str, Any]) -> None:
+        """Enregistre durablement le quiz partiel d'un morceau terminé."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"chunk_key": chunk_key, "quiz": quiz}, ensure_ascii=False) + "\n"
+
+        # Isoler une éventuelle ligne tronquée laissée par un arrêt brutal
+        if self.path.exists() and self.path.stat().st_size:
+            with self.path.open("rb") as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    line = "\n" + line
+
+        with self.path.open("a", encoding="utf-8") as file:
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def discard(self) -> None:
+        """Supprime le journal (génération terminée ou reprise refusée)."""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,237 @@
+"""Exporteurs de quiz (JSON, Markdown, Anki, Quizlet).
+
+Chaque exporteur écrit son fichier de manière incrémentale : un en-tête,
+une entrée par question, puis un pied. Cela permet de produire tous les
+formats en un seul passage sur les questions, qu'elles viennent d'un quiz
+en mémoire ou d'un itérateur.
+"""
+
+import json
+import textwrap
+from contextlib import ExitStack
+from io import StringIO
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, TextIO
+
+
+class QuizExporter:
+    """Classe de base pour les exporteurs de quiz ligne par ligne."""
+
+    extension = ".txt"
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._first_line = True
+
+    def write_lines(self, lines: List[str]) -> None:
+        """Écrit des lignes en les séparant par des retours à la ligne."""
+        for line in lines:
+            if not self._first_line:
+                self.stream.write("\n")
+            self.stream.write(line)
+            self._first_line = False
+
+    def begin(self, quiz: Dict[str, Any]) -> None:
+        """Écrit l'en-tête du quiz."""
+
+    def add_question(self, index: int, question: Dict[str, Any]) -> None:
+        """Écrit une question (index commençant à 1)."""
+
+    def end(self, quiz: Dict[str, Any]) -> None:
+        """Écrit le pied du quiz."""
+
+
+class JsonExporter(QuizExporter):
+    """Exporte le quiz en JSON, les questions étant écrites au fil de l'eau."""
+
+    extension = ".json"
+
+    def begin(self, quiz: Dict[str, Any]) -> None:
+        self.stream.write("{\n")
+        for key, value in quiz.items():
+            if key == "questions":
+                continue
+            encoded = json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+            self.stream.write(f'  {json.dumps(key)}: {encoded},\n')
+        self.stream.write('  "questions": [')
+        self._count = 0
+
+    def add_question(self, index: int, question: Dict[str, Any]) -> None:
+        separator = "," if self._count else ""
+        encoded = json.dumps(question, indent=2, ensure_ascii=False)
+        self.stream.write(f"{separator}\n{textwrap.indent(encoded, '    ')}")
+        self._count += 1
+
+    def end(self, quiz: Dict[str, Any]) -> None:
+        self.stream.write("\n  ]\n}" if self._count else "]\n}")
+
+
+class MarkdownExporter(QuizExporter):
+    """Exporte le quiz en Markdown."""
+
+    extension = ".md"
+
+    def begin(self, quiz: Dict[str, Any]) -> None:
+        lines = [f"# {quiz.get('title', 'Quiz')}", ""]
+        if "description" in quiz:
+            lines.append(f"{quiz['description']}\n")
+        self.write_lines(lines)
+
+    def add_question(self, index: int, question: Dict[str, Any]) -> None:
+        lines = [f"## Question {index}", "", f"**{question.get('question', '')}**", ""]
+
+        if question.get("type") == "qcm":
+            for option in question.get("options", []):
+                lines.append(f"- {option}")
+            lines.append("")
+            lines.append(f"**Réponse correcte:** {question.get('correct_answer')}")
+        else:
+            lines.append(f"**Réponse:** {question.get('correct_answer')}")
+
+        if question.get("explanation"):
+            lines.append("")
+            lines.append(f"**Explication:** {question['explanation']}")
+
+        if question.get("difficulty"):
+            lines.append("")
+            lines.append(f"**Difficulté:** {question['difficulty']}/5")
+
+        lines.append("")
+        self.write_lines(lines)
+
+
+class AnkiExporter(QuizExporter):
+    """Exporte le quiz pour Anki (format CSV tabulé)."""
+
+    extension = ".csv"
+
+    def begin(self, quiz: Dict[str, Any]) -> None:
+        self.write_lines(["Question\tRéponse\tExplication\tDifficulté"])
+
+    def add_question(self, index: int, question: Dict[str, Any]) -> None:
+        q = question.get("question", "").replace("\t", " ").replace("\n", " ")
+        a = question.get("correct_answer", "").replace("\t", " ").replace("\n", " ")
+        e = question.get("explanation", "").replace("\t", " ").replace("\n", " ")
+        d = question.get("difficulty", 1)
+        self.write_lines([f"{q}\t{a}\t{e}\t{d}"])
+
+
+class QuizletExporter(QuizExporter):
+    """Exporte le quiz pour Quizlet (format texte)."""
+
+    extension = ".txt"
+
+    def begin(self, quiz: Dict[str, Any]) -> None:
+        self.write_lines([f"{quiz.get('title', 'Quiz')}", "=" * 50, ""])
+
+    def add_question(self, index: int, question: Dict[str, Any]) -> None:
+        self.write_lines([
+            f"Q: {question.get('question', '')}",
+            f"A: {question.get('correct_answer', '')}",
+            "",
+        ])
+
+
+EXPORTERS = {
+    "json": JsonExporter,
+    "markdown": MarkdownExporter,
+    "anki": AnkiExporter,
+    "quizlet": QuizletExporter,
+}
+
+
+def resolve_formats(formats: str | Iterable[str]) -> List[str]:
+    """
+    Normalise une liste de formats d'export.
+
+    Args:
+        formats: Un format, une liste de formats, des valeurs séparées
+            par des virgules ou "all"
+
+    Returns:
+        Liste ordonnée et dédoublonnée des formats demandés
+    """
+    if isinstance(formats, str):
+        formats = [formats]
+
+    resolved = []
+    for value in formats:
+        for name in value.split(","):
+            name = name.strip().lower()
+            if not name:
+                continue
+            if name == "all":
+                candidates = list(EXPORTERS)
+            elif name in EXPORTERS:
+                candidates = [name]
+            else:
+                raise ValueError(f"Format inconnu: {name}")
+            resolved.extend(c for c in candidates if c not in resolved)
+
+    if not resolved:
+        raise ValueError("Aucun format d'export demandé.")
+    return resolved
+
+
+def quiz_filename(quiz: Dict[str, Any], format: str) -> str:
+    """Construit le nom de fichier d'export d'un quiz."""
+    title = quiz.get("title", "default").replace(" ", "_")
+    return f"quiz_{title}{EXPORTERS[format].extension}"
+
+
+def render_quiz(quiz: Dict[str, Any], format: str) -> str:
+    """Rend un quiz en mémoire dans un format donné."""
+    if format not in EXPORTERS:
+        raise ValueError(f"Format inconnu: {format}")
+
+    buffer = StringIO()
+    exporter = EXPORTERS[format](buffer)
+    exporter.begin(quiz)
+    for index, question in enumerate(quiz.get("questions", []), 1):
+        exporter.add_question(index, question)
+    exporter.end(quiz)
+    return buffer.getvalue()
+
+
+def export_quiz_formats(
+    quiz: Dict[str, Any],
+    formats: str | Iterable[str],
+    output_path: str | Path,
+    questions: Optional[Iterable[Dict[str, Any]]] = None
+) -> Dict[str, str]:
+    """
+    Exporte un quiz dans plusieurs formats en un seul passage.
+
+    Args:
+        quiz: Le quiz (titre, description, métadonnées, questions)
+        formats: Formats de sortie (voir resolve_formats)
+        output_path: Dossier de sortie
+        questions: Itérateur de questions optionnel, utilisé à la place de
+            quiz["questions"] (les questions ne sont parcourues qu'une fois)
+
+    Returns:
+        Dictionnaire format -> chemin du fichier écrit
+    """
+    formats = resolve_formats(formats)
+    output_path = Path(output_path)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    if questions is None:
+        questions = quiz.get("questions", [])
+
+    paths = {fmt: output_path / quiz_filename(quiz, fmt) for fmt in formats}
+
+    with ExitStack() as stack:
+        exporters = [
+            EXPORTERS[fmt](stack.enter_context(path.open("w", encoding="utf-8")))
+            for fmt, path in paths.items()
+        ]
+        for exporter in exporters:
+            exporter.begin(quiz)
+        for index, question in enumerate(questions, 1):
+            for exporter in exporters:
+                exporter.add_question(index, question)
+        for exporter in exporters:
+            exporter.end(quiz)
+
+    return {fmt: str(path) for fmt, path in paths.items()}
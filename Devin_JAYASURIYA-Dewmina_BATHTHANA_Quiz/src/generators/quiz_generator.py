@@ -1,12 +1,16 @@
 """Générateur de quiz utilisant les LLM."""
 
 import json
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from datetime import datetime
 
 from ..config import settings
 from ..llm.client import LLMClient
+from ..llm.router import ModelRouter
+from .checkpoint import CheckpointJournal
+from .exporters import EXPORTERS, export_quiz_formats, render_quiz
 
 
 class QuizGenerator:
@@ -50,18 +54,32 @@ class QuizGenerator:
 - Les questions doivent être en français
 """
 
-    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        output_path: str | Path = None,
+        router: Optional[ModelRouter] = None
+    ):
         """
         Initialise le générateur de quiz.
 
         Args:
-            model: Modèle LLM à utiliser (gpt-4o, claude-3-5-sonnet-latest, etc.)
+            model: Modèle LLM à utiliser (gpt-4o, claude-3-5-sonnet-latest, etc.).
+                Un modèle explicite désactive le routage.
             api_key: Clé API pour l'accès au LLM
+            output_path: Dossier de sortie par défaut des exports
+            router: Routeur de modèles (par défaut construit depuis la configuration)
         """
         self.model = model or settings.openai_model
         self.api_key = api_key or settings.openai_api_key
+        self.output_path = Path(output_path or settings.output_path)
         self.client = LLMClient(api_key=self.api_key, model=self.model)
 
+        if router is None and model is None and settings.routing_enabled:
+            router = ModelRouter.from_settings()
+        self.router = router
+
     def generate_quiz_from_text(
         self,
         text: str,
@@ -89,9 +107,9 @@ class QuizGenerator:
         question_types = question_types or ["qcm", "ouvert"]
 
         # Tronquer le texte si trop long
-        max_tokens = 8000
-        if len(text) > max_tokens:
-            text = text[:max_tokens]
+        max_chars = settings.chunk_max_chars
+        if len(text) > max_chars:
+            text = text[:max_chars]
 
         prompt = self.PROMPT_TEMPLATE.format(
             content=text,
@@ -99,46 +117,208 @@ class QuizGenerator:
             num_options=num_options
         )
 
-        # Appel au LLM pour générer le quiz
-        response = self.client.generate(
-            prompt=prompt,
-            response_format={"type": "json_object"}
-        )
-
-        quiz = json.loads(response)
+        # Choix du modèle : modèle rapide pour les requêtes simples,
+        # repli sur le modèle fort si la validation échoue
+        if self.router:
+            models = self.router.candidates(difficulty, len(text), question_types)
+            complexity = self.router.complexity(difficulty, len(text), question_types)
+        else:
+            models = [self.model]
+
+        attempts = []
+        quiz = None
+        for i, model in enumerate(models):
+            is_last = i == len(models) - 1
+            start = time.perf_counter()
+            try:
+                response = self.client.generate(
+                    prompt=prompt,
+                    response_format={"type": "json_object"},
+                    model=model
+                )
+                candidate = json.loads(response)
+                error = self._validation_error(candidate, num_questions, strict=not is_last)
+            except Exception as e:
+                if is_last:
+                    if self.router:
+                        self.router.record(model, time.perf_counter() - start, success=False,
+                                           complexity=complexity)
+                    raise
+                candidate, error = None, str(e)
+
+            latency = time.perf_counter() - start
+            if self.router:
+                self.router.record(model, latency, success=error is None, complexity=complexity)
+            attempts.append({"model": model, "latency": round(latency, 3), "error": error})
+
+            if error is None:
+                quiz = candidate
+                break
+
+        if quiz is None:
+            raise ValueError(f"Le quiz généré est invalide: {attempts[-1]['error']}")
 
         # Ajouter des métadonnées
         quiz["metadata"] = {
             "generated_at": datetime.now().isoformat(),
-            "model": self.model,
+            "model": attempts[-1]["model"],
             "num_questions": num_questions,
-            "difficulty": difficulty
+            "difficulty": difficulty,
+            "attempts": attempts
         }
 
         return quiz
 
+    def _validation_error(
+        self,
+        quiz: Dict[str, Any],
+        num_questions: int,
+        strict: bool = True
+    ) -> Optional[str]:
+        """
+        Vérifie la structure d'un quiz généré.
+
+        Args:
+            quiz: Le quiz renvoyé par le modèle
+            num_questions: Nombre de questions demandé
+            strict: Exige aussi le nombre de questions demandé
+
+        Returns:
+            Message d'erreur, ou None si le quiz est valide
+        """
+        if not isinstance(quiz, dict) or "title" not in quiz:
+            return "titre manquant"
+
+        questions = quiz.get("questions")
+        if not isinstance(questions, list) or not questions:
+            return "aucune question"
+
+        for question in questions:
+            if not isinstance(question, dict) or not question.get("question") \
+                    or not question.get("correct_answer"):
+                return "question incomplète"
+
+        if strict and len(questions) < num_questions:
+            return f"{len(questions)} questions au lieu de {num_questions}"
+
+        return None
+
     def generate_quiz_from_sections(
         self,
         sections: List[Dict[str, Any]],
+        checkpoint: Optional[CheckpointJournal] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
         Génère un quiz à partir de sections parseées.
 
+        Les documents longs sont découpés en morceaux générés un par un ;
+        les questions sont réparties selon la taille des morceaux.
+
         Args:
             sections: Liste de sections avec titre et contenu
+            checkpoint: Journal de reprise optionnel. Chaque morceau terminé
+                y est enregistré, et les morceaux déjà présents ne sont pas
+                régénérés.
 
         Returns:
             Dictionnaire contenant le quiz généré
         """
-        # Assembler le contenu des sections
-        full_content = ""
+        chunks = self._chunk_sections(sections, settings.chunk_max_chars)
+        num_questions = kwargs.pop("num_questions", None) or settings.min_questions
+        allocation = self._allocate_questions([len(chunk) for chunk in chunks], num_questions)
+
+        done = checkpoint.load() if checkpoint else {}
+        parts = []
+        resumed = 0
+
+        for chunk, chunk_questions in zip(chunks, allocation):
+            if not chunk_questions:
+                continue
+
+            key = CheckpointJournal.chunk_key(chunk, num_questions=chunk_questions, **kwargs)
+            if key in done:
+                parts.append(done[key])
+                resumed += 1
+                continue
+
+            part = self.generate_quiz_from_text(chunk, num_questions=chunk_questions, **kwargs)
+            if checkpoint:
+                checkpoint.append(key, part)
+            parts.append(part)
+
+        if len(parts) == 1:
+            return parts[0]
+        return self._merge_quizzes(parts, num_questions, resumed)
+
+    def _chunk_sections(self, sections: List[Dict[str, Any]], max_chars: int) -> List[str]:
+        """Regroupe les sections en morceaux d'au plus max_chars caractères."""
+        chunks = []
+        current = ""
         for section in sections:
             title = section.get("title", "Section")
             content = section.get("content", "")
-            full_content += f"## {title}\n\n{content}\n\n"
-
-        return self.generate_quiz_from_text(full_content, **kwargs)
+            block = f"## {title}\n\n{content}\n\n"
+
+            if current and len(current) + len(block) > max_chars:
+                chunks.append(current)
+                current = ""
+
+            # Découper une section trop longue à elle seule
+            while len(block) > max_chars:
+                chunks.append(block[:max_chars])
+                block = block[max_chars:]
+            current += block
+
+        if current or not chunks:
+            chunks.append(current)
+        return chunks
+
+    def _allocate_questions(self, chunk_sizes: List[int], num_questions: int) -> List[int]:
+        """Répartit les questions proportionnellement à la taille des morceaux."""
+        total = sum(chunk_sizes) or 1
+        shares = [num_questions * size / total for size in chunk_sizes]
+        allocation = [int(share) for share in shares]
+
+        # Distribuer le reste aux plus grands restes
+        remaining = num_questions - sum(allocation)
+        by_remainder = sorted(range(len(shares)), key=lambda i: shares[i] - allocation[i], reverse=True)
+        for i in by_remainder[:remaining]:
+            allocation[i] += 1
+        return allocation
+
+    def _merge_quizzes(
+        self,
+        parts: List[Dict[str, Any]],
+        num_questions: int,
+        resumed: int = 0
+    ) -> Dict[str, Any]:
+        """Fusionne les quiz partiels des morceaux en un seul quiz."""
+        questions = []
+        for part in parts:
+            for question in part.get("questions", []):
+                questions.append(dict(question, id=len(questions) + 1))
+
+        first = parts[0]
+        models = []
+        for part in parts:
+            model = part.get("metadata", {}).get("model")
+            if model and model not in models:
+                models.append(model)
+
+        return {
+            "title": first.get("title", "Quiz"),
+            "description": first.get("description", ""),
+            "questions": questions,
+            "metadata": {
+                "generated_at": datetime.now().isoformat(),
+                "model": ", ".join(models),
+                "num_questions": num_questions,
+                "difficulty": first.get("metadata", {}).get("difficulty"),
+                "chunks": len(parts),
+                "resumed_chunks": resumed
+            }
+        }
 
     def export_quiz(
         self,
@@ -156,89 +336,43 @@ class QuizGenerator:
             output_path: Chemin de sortie optionnel
 
         Returns:
-            Chaîne de caractères avec le quiz formaté
+            Chemin du fichier écrit
         """
-        output_path = Path(output_path or self.output_path)
-        output_path.mkdir(parents=True, exist_ok=True)
-
-        if format == "json":
-            content = json.dumps(quiz, indent=2, ensure_ascii=False)
-            filename = f"quiz_{quiz.get('title', 'default').replace(' ', '_')}.json"
-
-        elif format == "markdown":
-            content = self._export_markdown(quiz)
-            filename = f"quiz_{quiz.get('title', 'default').replace(' ', '_')}.md"
-
-        elif format == "anki":
-            content = self._export_anki(quiz)
-            filename = f"quiz_{quiz.get('title', 'default').replace(' ', '_')}.csv"
+        if format not in EXPORTERS:
+            raise ValueError(f"Format inconnu: {format}")
 
-        elif format == "quizlet":
-            content = self._export_quizlet(quiz)
-            filename = f"quiz_{quiz.get('title', 'default').replace(' ', '_')}.txt"
+        return self.export_quiz_formats(quiz, [format], output_path)[format]
 
-        else:
-            raise ValueError(f"Format inconnu: {format}")
+    def export_quiz_formats(
+        self,
+        quiz: Dict[str, Any],
+        formats: str | Iterable[str] = "all",
+        output_path: str | Path = None,
+        questions: Optional[Iterable[Dict[str, Any]]] = None
+    ) -> Dict[str, str]:
+        """
+        Exporte le quiz dans plusieurs formats en un seul passage.
 
-        # Écrire le fichier
-        full_path = output_path / filename
-        full_path.write_text(content, encoding='utf-8')
+        Args:
+            quiz: Le quiz à exporter
+            formats: Formats de sortie (liste, valeurs séparées par des virgules ou "all")
+            output_path: Chemin de sortie optionnel
+            questions: Itérateur de questions optionnel (remplace quiz["questions"])
 
-        return str(full_path)
+        Returns:
+            Dictionnaire format -> chemin du fichier écrit
+        """
+        output_path = Path(output_path or self.output_path)
+        return export_quiz_formats(quiz, formats, output_path, questions=questions)
 
     def _export_markdown(self, quiz: Dict[str, Any]) -> str:
         """Exporte le quiz en Markdown."""
-        lines = [f"# {quiz.get('title', 'Quiz')}", ""]
-        if "description" in quiz:
-            lines.append(f"{quiz['description']}\n")
-
-        for i, question in enumerate(quiz.get("questions", []), 1):
-            lines.append(f"## Question {i}")
-            lines.append("")
-            lines.append(f"**{question.get('question', '')}**")
-            lines.append("")
-
-            if question.get("type") == "qcm":
-                for option in question.get("options", []):
-                    lines.append(f"- {option}")
-                lines.append("")
-                lines.append(f"**Réponse correcte:** {question.get('correct_answer')}")
-            else:
-                lines.append(f"**Réponse:** {question.get('correct_answer')}")
-
-            if question.get("explanation"):
-                lines.append("")
-                lines.append(f"**Explication:** {question['explanation']}")
-
-            if question.get("difficulty"):
-                lines.append("")
-                lines.append(f"**Difficulté:** {question['difficulty']}/5")
-
-            lines.append("")
-
-        return "\n".join(lines)
+        return render_quiz(quiz, "markdown")
 
     def _export_anki(self, quiz: Dict[str, Any]) -> str:
         """Exporte le quiz pour Anki (format CSV)."""
-        lines = ["Question\tRéponse\tExplication\tDifficulté"]
-
-        for question in quiz.get("questions", []):
-            q = question.get("question", "").replace("\t", " ").replace("\n", " ")
-            a = question.get("correct_answer", "").replace("\t", " ").replace("\n", " ")
-            e = question.get("explanation", "").replace("\t", " ").replace("\n", " ")
-            d = question.get("difficulty", 1)
-
-            lines.append(f"{q}\t{a}\t{e}\t{d}")
-
-        return "\n".join(lines)
+        return render_quiz(quiz, "anki")
 
     def _export_quizlet(self, quiz: Dict[str, Any]) -> str:
         """Exporte le quiz pour Quizlet (format texte)."""
-        lines = [f"{quiz.get('title', 'Quiz')}", "=" * 50, ""]
-
-        for question in quiz.get("questions", []):
-            lines.append(f"Q: {question.get('question', '')}")
-            lines.append(f"A: {question.get('correct_answer', '')}")
-            lines.append("")
-
-        return "\n".join(lines)
+        return render_quiz(quiz, "quizlet")
@@ -0,0 +1,224 @@
+"""Routage des requêtes de génération vers le modèle le plus adapté."""
+
+import json
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from ..config import settings
+
+
+class ModelRouter:
+    """
+    Choisit un modèle par requête selon la difficulté, la taille du contenu
+    et les types de questions.
+
+    Les requêtes simples partent vers un modèle rapide et peu coûteux ; le
+    modèle fort n'est utilisé qu'en repli lorsque la validation échoue, ou
+    directement pour les requêtes exigeantes. Les latences et taux de
+    réussite observés par modèle et par classe de requête ("simple" ou
+    "complex") sont des moyennes à décroissance exponentielle : les appels
+    récents pèsent plus lourd. Un modèle rapide écarté reste sondé de temps
+    en temps pour que le routage puisse se rétablir.
+    """
+
+    COMPLEXITY_CLASSES = ("simple", "complex")
+
+    def __init__(
+        self,
+        fast_model: str,
+        strong_model: str,
+        max_fast_difficulty: int = 2,
+        max_fast_chars: int = 4000,
+        fast_question_types: Optional[List[str]] = None,
+        min_success_rate: float = 0.8,
+        min_samples: int = 5,
+        stats_path: str | Path = None,
+        decay: float = 0.1,
+        explore_every: int = 20
+    ):
+        """
+        Initialise le routeur.
+
+        Args:
+            fast_model: Modèle rapide utilisé pour les requêtes simples
+            strong_model: Modèle fort utilisé en repli
+            max_fast_difficulty: Difficulté maximale acceptée par le modèle rapide
+            max_fast_chars: Taille maximale du contenu (caractères) pour le modèle rapide
+            fast_question_types: Types de questions acceptés par le modèle rapide
+            min_success_rate: Taux de réussite minimal du modèle rapide
+            min_samples: Nombre d'appels avant de tenir compte des statistiques
+            stats_path: Fichier JSON optionnel où persister les statistiques
+            decay: Poids d'un nouvel appel dans les moyennes (0-1)
+            explore_every: Une requête simple sur N sonde le modèle rapide
+                même s'il est écarté (0 pour ne jamais sonder)
+        """
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.max_fast_difficulty = max_fast_difficulty
+        self.max_fast_chars = max_fast_chars
+        self.fast_question_types = fast_question_types or ["qcm", "ouvert"]
+        self.min_success_rate = min_success_rate
+        self.min_samples = min_samples
+        self.stats_path = Path(stats_path) if stats_path else None
+        self.decay = decay
+        self.explore_every = explore_every
+
+        self._lock = threading.Lock()
+        self._skipped = 0
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        if self.stats_path and self.stats_path.exists():
+            try:
+                self._stats = self._load(json.loads(self.stats_path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                self._stats = {}
+
+    @classmethod
+    def from_settings(cls) -> "ModelRouter":
+        """Construit un routeur à partir de la configuration globale."""
+        return cls(
+            fast_model=settings.fast_model,
+            strong_model=settings.openai_model,
+            max_fast_difficulty=settings.routing_fast_max_difficulty,
+            max_fast_chars=settings.routing_fast_max_chars,
+            fast_question_types=settings.routing_fast_question_types,
+            min_success_rate=settings.routing_min_success_rate,
+            stats_path=settings.routing_stats_path,
+            decay=settings.routing_decay,
+            explore_every=settings.routing_explore_every,
+        )
+
+    def complexity(
+        self,
+        difficulty: int,
+        content_length: int,
+        question_types: List[str]
+    ) -> str:
+        """Classe de la requête : "simple" si le modèle rapide peut la traiter, sinon "complex"."""
+        is_simple = (
+            difficulty <= self.max_fast_difficulty
+            and content_length <= self.max_fast_chars
+            and all(t in self.fast_question_types for t in question_types)
+        )
+        return "simple" if is_simple else "complex"
+
+    def candidates(
+        self,
+        difficulty: int,
+        content_length: int,
+        question_types: List[str]
+    ) -> List[str]:
+        """
+        Retourne les modèles à essayer, dans l'ordre.
+
+        Args:
+            difficulty: Difficulté cible (1-5)
+            content_length: Taille du contenu en caractères
+            question_types: Types de questions demandés
+
+        Returns:
+            Liste ordonnée de modèles (le premier est le choix principal,
+            les suivants sont les replis)
+        """
+        if self.fast_model == self.strong_model:
+            return [self.strong_model]
+
+        if self.complexity(difficulty, content_length, question_types) != "simple":
+            return [self.strong_model]
+        if self._is_healthy(self.fast_model) or self._should_explore():
+            return [self.fast_model, self.strong_model]
+        return [self.strong_model]
+
+    def record(self, model: str, latency: float, success: bool, complexity: str = "simple") -> None:
+        """Enregistre le résultat d'un appel (latence en secondes) pour une classe de requête."""
+        with self._lock:
+            entry = self._stats.setdefault(model, {}).get(complexity)
+            if entry is None:
+                # Premier appel : la moyenne part de la valeur observée
+                entry = {"calls": 0, "success_rate": 1.0 if success else 0.0, "latency": latency}
+                self._stats[model][complexity] = entry
+            entry["calls"] += 1
+            entry["success_rate"] += self.decay * ((1.0 if success else 0.0) - entry["success_rate"])
+            entry["latency"] += self.decay * (latency - entry["latency"])
+            self._save()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retourne les statistiques par modèle : appels, taux de réussite et latence
+        moyenne toutes classes confondues, et le détail par classe (by_complexity).
+        """
+        with self._lock:
+            result = {}
+            for model, classes in self._stats.items():
+                by_complexity = {
+                    name: {
+                        "calls": int(entry["calls"]),
+                        "success_rate": entry["success_rate"],
+                        "avg_latency": entry["latency"],
+                    }
+                    for name, entry in classes.items()
+                    if entry["calls"]
+                }
+                calls = sum(entry["calls"] for entry in by_complexity.values())
+                if not calls:
+                    continue
+                result[model] = {
+                    "calls": calls,
+                    "success_rate": sum(e["success_rate"] * e["calls"] for e in by_complexity.values()) / calls,
+                    "avg_latency": sum(e["avg_latency"] * e["calls"] for e in by_complexity.values()) / calls,
+                    "by_complexity": by_complexity,
+                }
+            return result
+
+    def _is_healthy(self, model: str) -> bool:
+        """
+        Vérifie que le modèle rapide reste fiable et plus rapide que le modèle
+        fort, en comparant les latences sur les requêtes simples uniquement.
+        """
+        stats = self.stats()
+        fast = stats.get(model, {}).get("by_complexity", {}).get("simple")
+        if not fast or fast["calls"] < self.min_samples:
+            return True
+        if fast["success_rate"] < self.min_success_rate:
+            return False
+
+        strong = stats.get(self.strong_model, {}).get("by_complexity", {}).get("simple")
+        if strong and strong["calls"] >= self.min_samples:
+            return fast["avg_latency"] <= strong["avg_latency"]
+        return True
+
+    def _should_explore(self) -> bool:
+        """Sonde le modèle rapide écarté une requête simple sur explore_every."""
+        if not self.explore_every:
+            return False
+        with self._lock:
+            self._skipped += 1
+            if self._skipped >= self.explore_every:
+                self._skipped = 0
+                return True
+            return False
+
+    def _load(self, data: Dict[str, Any]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Relit les statistiques persistées (les anciens cumuls sans classe sont ignorés)."""
+        stats = {}
+        for model, classes in data.items():
+            if not isinstance(classes, dict):
+                continue
+            kept = {
+                name: entry for name, entry in classes.items()
+                if name in self.COMPLEXITY_CLASSES and isinstance(entry, dict)
+                and {"calls", "success_rate", "latency"} <= entry.keys()
+            }
+            if kept:
+                stats[model] = kept
+        return stats
+
+    def _save(self) -> None:
+        """Persiste les statistiques si un fichier est configuré."""
+        if not self.stats_path:
+            return
+        try:
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            self.stats_path.write_text(json.dumps(self._stats, indent=2), encoding="utf-8")
+        except OSError:
+            pass
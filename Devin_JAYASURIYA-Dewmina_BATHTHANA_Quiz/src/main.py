@@ -1,15 +1,18 @@
 """Point d'entrée CLI pour le Générateur de Quiz."""
 
 import sys
+import json
 import click
 from pathlib import Path
 
 from .config import settings
-from .parsers.pdf_parser import PdfParser
-from .parsers.docx_parser import DocxParser
-from .parsers.pptx_parser import PptxParser
-from .parsers.text_parser import TextParser
+from .parsers import PARSERS
 from .generators.quiz_generator import QuizGenerator
+from .generators.exporters import EXPORTERS, export_quiz_formats
+from .generators.checkpoint import CheckpointJournal
+
+
+FORMAT_CHOICES = click.Choice(list(EXPORTERS) + ["all"])
 
 
 @click.group()
@@ -22,12 +25,13 @@ def cli():
 @cli.command()
 @click.argument("file_path", type=click.Path(exists=True))
 @click.option("-o", "--output", type=click.Path(), default="./output", help="Dossier de sortie")
-@click.option("-f", "--format", type=click.Choice(["json", "markdown", "anki", "quizlet"]), default="json", help="Format de sortie")
-@click.option("-n", "--num-questions", type=int, default=None, help="Nombre de questions")
+@click.option("-f", "--format", "formats", type=FORMAT_CHOICES, multiple=True, default=["json"], help="Format de sortie (répétable, ou 'all')")
+@click.option("-n", "--num-questions", type=click.IntRange(1, settings.max_questions), default=None, help="Nombre de questions")
 @click.option("-t", "--question-type", type=click.Choice(["qcm", "ouvert", "mixed"]), default="mixed", help="Type de questions")
 @click.option("-d", "--difficulty", type=click.Choice(["1", "2", "3", "4", "5"]), default=None, help="Difficulté cible (1-5)")
+@click.option("--resume/--no-resume", default=True, help="Reprendre une génération interrompue (journal dans <sortie>/.checkpoints)")
 @click.option("--api-key", envvar="OPENAI_API_KEY", help="Clé API OpenAI")
-def generate(file_path, output, format, num_questions, question_type, difficulty, api_key):
+def generate(file_path, output, formats, num_questions, question_type, difficulty, resume, api_key):
     """
     Génère un quiz à partir d'un document.
 
@@ -39,22 +43,14 @@ def generate(file_path, output, format, num_questions, question_type, difficulty
     # Sélectionner le parser en fonction de l'extension
     extension = file_path.suffix.lower()
 
-    parsers = {
-        ".pdf": PdfParser,
-        ".docx": DocxParser,
-        ".pptx": PptxParser,
-        ".txt": TextParser,
-        ".md": TextParser,
-    }
-
-    if extension not in parsers:
+    if extension not in PARSERS:
         click.echo(f"Format de fichier non supporté: {extension}")
         click.echo("Formats supportés: PDF, DOCX, PPTX, TXT, MD")
         sys.exit(1)
 
     # Parse le document
     click.echo(f"Parsing du fichier: {file_path}")
-    parser = parsers[extension](file_path)
+    parser = PARSERS[extension](file_path)
     sections = parser.parse()
     click.echo(f"Nombre de sections trouvées: {len(sections)}")
 
@@ -64,9 +60,17 @@ def generate(file_path, output, format, num_questions, question_type, difficulty
     # Configurer le générateur
     generator = QuizGenerator(api_key=api_key)
 
+    # Journal de reprise : les morceaux déjà générés ne sont pas relancés
+    checkpoint = CheckpointJournal.for_file(output / ".checkpoints", file_path)
+    if not resume:
+        checkpoint.discard()
+    elif checkpoint.path.exists():
+        click.echo(f"Reprise depuis le journal: {checkpoint.path}")
+
     # Générer le quiz
     quiz = generator.generate_quiz_from_sections(
         sections,
+        checkpoint=checkpoint,
         num_questions=num_questions,
         question_types=(
             ["qcm"] if question_type == "qcm"
@@ -76,15 +80,83 @@ def generate(file_path, output, format, num_questions, question_type, difficulty
         difficulty=int(difficulty) if difficulty else None
     )
 
-    # Exporter le quiz
-    output_path = generator.export_quiz(quiz, format=format, output_path=output)
-    click.echo(f"Quiz généré avec succès: {output_path}")
+    # Exporter le quiz dans tous les formats demandés en un seul passage
+    output_paths = generator.export_quiz_formats(quiz, formats, output_path=output)
+    for output_path in output_paths.values():
+        click.echo(f"Quiz généré avec succès: {output_path}")
+
+    # Le quiz est exporté : le journal de reprise n'est plus nécessaire
+    checkpoint.discard()
 
     # Afficher un résumé
+    _print_summary(quiz, output_paths)
+
+
+@cli.command()
+@click.argument("quiz_path", type=click.Path(exists=True))
+@click.option("-o", "--output", type=click.Path(), default="./output", help="Dossier de sortie")
+@click.option("-f", "--format", "formats", type=FORMAT_CHOICES, multiple=True, default=["all"], help="Format de sortie (répétable, ou 'all')")
+def export(quiz_path, output, formats):
+    """
+    Réexporte un quiz JSON existant, sans appel au LLM.
+
+    QUIZ_PATH: Chemin vers un quiz exporté au format JSON
+    """
+    try:
+        quiz = json.loads(Path(quiz_path).read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        click.echo(f"Fichier JSON invalide: {e}")
+        sys.exit(1)
+
+    if not isinstance(quiz, dict) or "questions" not in quiz:
+        click.echo("Le fichier ne contient pas de quiz valide (champ 'questions' manquant).")
+        sys.exit(1)
+
+    output_paths = export_quiz_formats(quiz, formats, output)
+    for output_path in output_paths.values():
+        click.echo(f"Quiz exporté: {output_path}")
+
+    _print_summary(quiz, output_paths)
+
+
+def _print_summary(quiz, output_paths):
+    """Affiche un résumé du quiz exporté."""
     click.echo(f"\nRésumé du quiz:")
     click.echo(f"  - Titre: {quiz.get('title', 'N/A')}")
     click.echo(f"  - Questions: {len(quiz.get('questions', []))}")
-    click.echo(f"  - Format: {format}")
+    click.echo(f"  - Formats: {', '.join(output_paths)}")
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", help="Adresse d'écoute")
+@click.option("--port", type=int, default=8000, help="Port d'écoute")
+@click.option("-w", "--workers", type=int, default=4, help="Nombre de générations simultanées")
+@click.option("--max-pending", type=int, default=32, help="Nombre de jobs en attente acceptés")
+@click.option("-o", "--output", type=click.Path(), default="./output", help="Dossier de sortie")
+@click.option("--api-key", envvar="OPENAI_API_KEY", help="Clé API OpenAI")
+def serve(host, port, workers, max_pending, output, api_key):
+    """Lance le serveur HTTP local de génération (clients LLM gardés chauds)."""
+    from .server import create_server
+
+    # Un seul générateur (et donc un seul client LLM) pour toute la durée du serveur
+    generator = QuizGenerator(api_key=api_key, output_path=output)
+    server = create_server(
+        generator,
+        host=host,
+        port=port,
+        max_workers=workers,
+        max_pending=max_pending,
+        output_path=output,
+    )
+
+    click.echo(f"Serveur de quiz démarré sur http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("Arrêt du serveur...")
+    finally:
+        server.server_close()
+        server.job_queue.shutdown(wait=False)
 
 
 @cli.command()
@@ -92,6 +164,8 @@ def config():
     """Affiche la configuration actuelle."""
     click.echo("Configuration du Générateur de Quiz:")
     click.echo(f"  - Modèle: {settings.openai_model}")
+    if settings.routing_enabled:
+        click.echo(f"  - Modèle rapide (routage): {settings.fast_model}")
     click.echo(f"  - Langue: {settings.output_language}")
     click.echo(f"  - Difficulté par défaut: {settings.default_difficulty}")
     click.echo(f"  - Nombre min de questions: {settings.min_questions}")
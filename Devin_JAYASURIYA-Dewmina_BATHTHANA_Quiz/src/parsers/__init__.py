@@ -1,6 +1,8 @@
 # Parseurs de documents pour le Générateur de Quiz
 """Module de parsing de documents pour extraire le contenu."""
 
+from pathlib import Path
+
 from .base_parser import BaseParser
 from .docx_parser import DocxParser
 from .pdf_parser import PdfParser
@@ -13,4 +15,35 @@ __all__ = [
     "PdfParser",
     "PptxParser",
     "TextParser",
+    "PARSERS",
+    "get_parser",
 ]
+
+
+# Parseur à utiliser selon l'extension du fichier
+PARSERS = {
+    ".pdf": PdfParser,
+    ".docx": DocxParser,
+    ".pptx": PptxParser,
+    ".txt": TextParser,
+    ".md": TextParser,
+}
+
+
+def get_parser(file_path: str | Path) -> BaseParser:
+    """
+    Retourne le parseur adapté à l'extension du fichier.
+
+    Args:
+        file_path: Chemin vers le document
+
+    Returns:
+        Instance du parseur correspondant
+
+    Raises:
+        ValueError: Si l'extension n'est pas supportée
+    """
+    extension = Path(file_path).suffix.lower()
+    if extension not in PARSERS:
+        raise ValueError(f"Format de fichier non supporté: {extension}")
+    return PARSERS[extension](file_path)
@@ -63,6 +63,9 @@ class TextParser(BaseParser):
                             "content": line + "\n",
                             "text": line + "\n"
                         })
+            # Ne pas perdre la dernière section du document
+            if current_section:
+                sections.append(current_section)
         else:
             # Fichier texte simple
             sections.append({
@@ -0,0 +1,308 @@
+"""Serveur HTTP local pour la génération de quiz.
+
+Le serveur garde un seul QuizGenerator (et donc un seul client LLM et ses
+connexions) pour toute sa durée de vie, et traite les documents envoyés
+via une file de jobs servie par un pool de workers borné.
+
+Endpoints:
+    POST /jobs?filename=cours.pdf[&num_questions=10][&difficulty=2]
+               [&question_type=mixed][&format=json,markdown]
+        Corps de la requête: contenu brut du document.
+        Réponse 202: {"job_id": "...", "status": "queued"}
+    GET /jobs/<job_id>          Statut du job
+    GET /jobs/<job_id>/result   Quiz généré (409 tant que le job n'est pas terminé)
+    GET /health                 État de la file
+"""
+
+import json
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, parse_qs
+
+from .config import settings
+from .parsers import PARSERS, get_parser
+from .generators.exporters import export_quiz_formats, resolve_formats
+
+
+QUESTION_TYPES = {
+    "qcm": ["qcm"],
+    "ouvert": ["ouvert"],
+    "mixed": ["qcm", "ouvert"],
+}
+
+# Mêmes bornes que les options --difficulty et --num-questions de la CLI
+DIFFICULTY_LEVELS = range(1, 6)
+
+
+class QueueFullError(Exception):
+    """Levée quand la file de jobs a atteint sa capacité maximale."""
+
+
+class JobQueue:
+    """File de jobs de génération servie par un pool de workers borné."""
+
+    def __init__(
+        self,
+        generator,
+        max_workers: int = 4,
+        max_pending: int = 32,
+        output_path: str | Path = "./output",
+        max_finished_jobs: int = 1000
+    ):
+        """
+        Initialise la file de jobs.
+
+        Args:
+            generator: Générateur partagé par tous les workers (QuizGenerator)
+            max_workers: Nombre de jobs traités en parallèle
+            max_pending: Nombre de jobs acceptés en attente au-delà des workers
+            output_path: Dossier de sortie des exports
+            max_finished_jobs: Nombre de jobs terminés conservés en mémoire
+        """
+        self.generator = generator
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.output_path = Path(output_path)
+        self.max_finished_jobs = max_finished_jobs
+
+        self.upload_dir = Path(tempfile.mkdtemp(prefix="quiz-uploads-"))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quiz-worker")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def submit(self, filename: str, data: bytes, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Enregistre un document et planifie sa génération.
+
+        Args:
+            filename: Nom du fichier (l'extension détermine le parseur)
+            data: Contenu brut du document
+            options: Options de génération (num_questions, difficulty,
+                question_types, formats)
+
+        Returns:
+            Identifiant du job
+
+        Raises:
+            ValueError: Si le format de fichier n'est pas supporté
+            QueueFullError: Si la file est pleine
+        """
+        extension = Path(filename).suffix.lower()
+        if extension not in PARSERS:
+            raise ValueError(f"Format de fichier non supporté: {extension}")
+
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError("La file de génération est pleine, réessayez plus tard.")
+
+        job_id = uuid.uuid4().hex
+        file_path = self.upload_dir / f"{job_id}{extension}"
+        file_path.write_bytes(data)
+
+        job = {
+            "id": job_id,
+            "filename": Path(filename).name,
+            "status": "queued",
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "outputs": {},
+            "result": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+
+        self._executor.submit(self._run, job_id, file_path, options or {})
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne une copie du job, ou None s'il est inconnu."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne le nombre de jobs par statut."""
+        with self._lock:
+            counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job["status"]] += 1
+        counts["max_workers"] = self.max_workers
+        counts["max_pending"] = self.max_pending
+        return counts
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Arrête les workers et supprime les fichiers temporaires."""
+        self._executor.shutdown(wait=wait)
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def _run(self, job_id: str, file_path: Path, options: Dict[str, Any]) -> None:
+        """Parse le document et génère le quiz (exécuté par un worker)."""
+        self._update(job_id, status="running", started_at=datetime.now().isoformat())
+        fields = {"status": "failed", "error": "Job interrompu"}
+        try:
+            sections = get_parser(file_path).parse()
+            quiz = self.generator.generate_quiz_from_sections(
+                sections,
+                num_questions=options.get("num_questions"),
+                difficulty=options.get("difficulty"),
+                question_types=options.get("question_types"),
+            )
+
+            outputs = {}
+            if options.get("formats"):
+                outputs = export_quiz_formats(quiz, options["formats"], self.output_path / job_id)
+
+            fields = {"status": "done", "result": quiz, "outputs": outputs}
+        except Exception as e:
+            fields = {"status": "failed", "error": str(e)}
+        finally:
+            file_path.unlink(missing_ok=True)
+            self._update(job_id, finished_at=datetime.now().isoformat(), **fields)
+            self._slots.release()
+            self._prune()
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _prune(self) -> None:
+        """Oublie les jobs terminés les plus anciens au-delà de la limite."""
+        with self._lock:
+            finished = [
+                job_id for job_id, job in self._jobs.items()
+                if job["status"] in ("done", "failed")
+            ]
+            for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+                del self._jobs[job_id]
+
+
+class QuizRequestHandler(BaseHTTPRequestHandler):
+    """Gestionnaire des requêtes HTTP du serveur de quiz."""
+
+    server_version = "QuizGenerator/1.0"
+
+    def do_GET(self):
+        parts = [p for p in urlparse(self.path).path.split("/") if p]
+        queue = self.server.job_queue
+
+        if parts == ["health"]:
+            return self._send_json(200, {"status": "ok", "jobs": queue.stats()})
+
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = queue.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": "Job inconnu"})
+
+            if len(parts) == 2:
+                job.pop("result")
+                return self._send_json(200, job)
+
+            if parts[2] == "result":
+                if job["status"] == "failed":
+                    return self._send_json(500, {"error": job["error"]})
+                if job["status"] != "done":
+                    return self._send_json(409, {"error": "Job non terminé", "status": job["status"]})
+                return self._send_json(200, job["result"])
+
+        return self._send_json(404, {"error": "Ressource introuvable"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "Ressource introuvable"})
+
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        filename = params.get("filename") or self.headers.get("X-Filename")
+        if not filename:
+            return self._send_json(400, {"error": "Paramètre 'filename' requis"})
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            return self._send_json(400, {"error": "Document vide"})
+        if length > self.server.max_upload_bytes:
+            return self._send_json(413, {"error": "Document trop volumineux"})
+
+        try:
+            options = {
+                "num_questions": int(params["num_questions"]) if "num_questions" in params else None,
+                "difficulty": int(params["difficulty"]) if "difficulty" in params else None,
+                "question_types": QUESTION_TYPES[params.get("question_type", "mixed")],
+                "formats": resolve_formats(params["format"]) if "format" in params else None,
+            }
+        except (KeyError, ValueError):
+            return self._send_json(400, {"error": "Paramètres de génération invalides"})
+
+        # Refusé dès l'envoi plutôt qu'en échec plus tard dans un worker
+        if options["num_questions"] is not None and not 1 <= options["num_questions"] <= settings.max_questions:
+            return self._send_json(400, {"error": f"num_questions doit être compris entre 1 et {settings.max_questions}"})
+        if options["difficulty"] is not None and options["difficulty"] not in DIFFICULTY_LEVELS:
+            return self._send_json(400, {"error": "difficulty doit être compris entre 1 et 5"})
+
+        data = self.rfile.read(length)
+        try:
+            job_id = self.server.job_queue.submit(filename, data, options)
+        except QueueFullError as e:
+            return self._send_json(503, {"error": str(e)})
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+
+        return self._send_json(202, {"job_id": job_id, "status": "queued"})
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Journalisation silencieuse : le suivi passe par les statuts de jobs
+        pass
+
+
+class QuizServer(ThreadingHTTPServer):
+    """Serveur HTTP multi-thread portant la file de jobs."""
+
+    daemon_threads = True
+
+    def __init__(self, address, job_queue: JobQueue, max_upload_bytes: int = 50 * 1024 * 1024):
+        super().__init__(address, QuizRequestHandler)
+        self.job_queue = job_queue
+        self.max_upload_bytes = max_upload_bytes
+
+
+def create_server(
+    generator,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    max_workers: int = 4,
+    max_pending: int = 32,
+    output_path: str | Path = "./output"
+) -> QuizServer:
+    """
+    Crée le serveur HTTP et sa file de jobs.
+
+    Args:
+        generator: Générateur partagé (QuizGenerator déjà initialisé)
+        host: Adresse d'écoute
+        port: Port d'écoute (0 pour un port libre)
+        max_workers: Nombre de générations simultanées
+        max_pending: Nombre de jobs en attente acceptés
+        output_path: Dossier de sortie des exports
+
+    Returns:
+        Serveur prêt à être lancé avec serve_forever()
+    """
+    queue = JobQueue(generator, max_workers=max_workers, max_pending=max_pending, output_path=output_path)
+    return QuizServer((host, port), queue)
@@ -0,0 +1,172 @@
+"""Génération de documents synthétiques pour les tests et benchmarks des parseurs."""
+
+import random
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from docx import Document
+from pptx import Presentation
+
+
+# Nombre de sections (ou pages / slides) par taille de document
+SIZES = {
+    "small": 5,
+    "medium": 40,
+    "large": 200,
+}
+
+PARAGRAPHS_PER_SECTION = 3
+
+WORDS = (
+    "apprentissage modele donnees reseau neurone gradient fonction perte "
+    "optimisation couche entree sortie poids biais activation regularisation "
+    "validation entrainement test precision rappel erreur exemple classe "
+    "probabilite distribution vecteur matrice dimension espace methode"
+).split()
+
+
+def make_sections(num_sections: int, seed: int = 42) -> List[Dict[str, List[str]]]:
+    """
+    Génère un contenu déterministe découpé en sections.
+
+    Args:
+        num_sections: Nombre de sections
+        seed: Graine du générateur aléatoire
+
+    Returns:
+        Liste de sections {"title": str, "paragraphs": [str, ...]}
+    """
+    rng = random.Random(seed)
+    sections = []
+    for i in range(1, num_sections + 1):
+        paragraphs = []
+        for _ in range(PARAGRAPHS_PER_SECTION):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(40, 80))]
+            paragraphs.append(" ".join(words).capitalize() + ".")
+        sections.append({"title": f"Chapitre {i}", "paragraphs": paragraphs})
+    return sections
+
+
+def build_markdown(path: Path, sections: List[Dict[str, List[str]]]) -> Path:
+    """Écrit un fichier Markdown avec un titre de niveau 2 par section."""
+    lines = []
+    for section in sections:
+        lines.append(f"## {section['title']}")
+        lines.append("")
+        for paragraph in section["paragraphs"]:
+            lines.append(paragraph)
+            lines.append("")
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def build_docx(path: Path, sections: List[Dict[str, List[str]]]) -> Path:
+    """Écrit un document Word avec un titre 'Heading 1' par section."""
+    document = Document()
+    for section in sections:
+        document.add_heading(section["title"], level=1)
+        for paragraph in section["paragraphs"]:
+            document.add_paragraph(paragraph)
+    document.save(path)
+    return path
+
+
+def build_pptx(path: Path, sections: List[Dict[str, List[str]]]) -> Path:
+    """Écrit une présentation PowerPoint avec une slide par section."""
+    presentation = Presentation()
+    layout = presentation.slide_layouts[1]  # Titre et contenu
+    for section in sections:
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = section["title"]
+        slide.placeholders[1].text = "\n".join(section["paragraphs"])
+    presentation.save(path)
+    return path
+
+
+def build_pdf(path: Path, sections: List[Dict[str, List[str]]]) -> Path:
+    """
+    Écrit un PDF minimal avec une page par section.
+
+    PyPDF2 ne sait pas écrire de texte : le fichier est construit à la main
+    (police Helvetica standard, texte ASCII, une ligne par tranche de mots).
+    """
+    def escape(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = []  # Corps des objets, numérotés à partir de 1
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b"")  # rempli plus bas
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for section in sections:
+        lines = [section["title"]]
+        for paragraph in section["paragraphs"]:
+            words = paragraph.split()
+            lines.extend(" ".join(words[i:i + 12]) for i in range(0, len(words), 12))
+
+        text_ops = ["BT", "/F1 10 Tf", "14 TL", "50 800 Td"]
+        for line in lines:
+            text_ops.append(f"({escape(line)}) Tj T*")
+        text_ops.append("ET")
+        stream = "\n".join(text_ops).encode("latin-1")
+
+        content_id = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, font_id, content_id)
+        ))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_offset
+    )
+
+    path.write_bytes(bytes(output))
+    return path
+
+
+# Constructeur de fixture par extension
+BUILDERS: Dict[str, Callable[[Path, List[Dict[str, List[str]]]], Path]] = {
+    ".md": build_markdown,
+    ".docx": build_docx,
+    ".pptx": build_pptx,
+    ".pdf": build_pdf,
+}
+
+
+def build_fixture(directory: Path, extension: str, size: str) -> Path:
+    """
+    Construit un document synthétique.
+
+    Args:
+        directory: Dossier où écrire le document
+        extension: Extension du document (.md, .docx, .pptx, .pdf)
+        size: Taille du document (clé de SIZES)
+
+    Returns:
+        Chemin du document créé
+    """
+    path = Path(directory) / f"corpus_{size}{extension}"
+    if not path.exists():
+        BUILDERS[extension](path, make_sections(SIZES[size]))
+    return path
@@ -36,3 +36,175 @@ class TestQuizGenerator:
         # Test export JSON
         json_output = generator._export_markdown(quiz)
         assert "Test Quiz" in json_output
+
+
+class TestExporters:
+    """Tests pour l'export multi-format."""
+
+    QUIZ = {
+        "title": "Test Quiz",
+        "description": "Description",
+        "questions": [
+            {
+                "id": 1,
+                "type": "qcm",
+                "question": "Question test?",
+                "options": ["A", "B", "C", "D"],
+                "correct_answer": "A",
+                "explanation": "Explication",
+                "difficulty": 2
+            },
+            {
+                "id": 2,
+                "type": "ouvert",
+                "question": "Question ouverte?",
+                "correct_answer": "Réponse"
+            }
+        ]
+    }
+
+    def test_resolve_formats(self):
+        """Test la résolution des formats demandés."""
+        from src.generators.exporters import resolve_formats
+
+        assert resolve_formats("all") == ["json", "markdown", "anki", "quizlet"]
+        assert resolve_formats(["anki", "json,anki"]) == ["anki", "json"]
+        with pytest.raises(ValueError):
+            resolve_formats("pdf")
+
+    def test_export_all_formats_single_pass(self, tmp_path):
+        """Test l'export de tous les formats à partir d'un seul quiz."""
+        import json
+        from src.generators.exporters import export_quiz_formats
+
+        paths = export_quiz_formats(self.QUIZ, "all", tmp_path)
+
+        assert set(paths) == {"json", "markdown", "anki", "quizlet"}
+        assert json.loads(open(paths["json"], encoding="utf-8").read()) == self.QUIZ
+        assert "## Question 2" in open(paths["markdown"], encoding="utf-8").read()
+        assert len(open(paths["anki"], encoding="utf-8").read().splitlines()) == 3
+
+    def test_export_from_question_iterator(self, tmp_path):
+        """Test que l'export depuis un itérateur produit les mêmes fichiers."""
+        from src.generators.exporters import export_quiz_formats
+
+        header = {k: v for k, v in self.QUIZ.items() if k != "questions"}
+        streamed = export_quiz_formats(
+            header, "all", tmp_path / "stream", questions=iter(self.QUIZ["questions"])
+        )
+        in_memory = export_quiz_formats(self.QUIZ, "all", tmp_path / "memory")
+
+        for fmt in in_memory:
+            assert open(streamed[fmt], encoding="utf-8").read() == \
+                open(in_memory[fmt], encoding="utf-8").read()
+
+
+class TestModelRouting:
+    """Tests pour le repli vers un modèle plus fort."""
+
+    class FakeClient:
+        """Client simulé renvoyant une réponse par modèle."""
+
+        def __init__(self, responses):
+            self.responses = responses
+            self.calls = []
+
+        def generate(self, prompt, model=None, **kwargs):
+            self.calls.append(model)
+            return self.responses[model]
+
+    def test_fallback_on_invalid_quiz(self):
+        """Test que le modèle fort est utilisé quand la validation échoue."""
+        import json
+        from src.generators.quiz_generator import QuizGenerator
+        from src.llm.router import ModelRouter
+
+        valid = {
+            "title": "Quiz",
+            "questions": [{"question": "Q?", "correct_answer": "R"}]
+        }
+        router = ModelRouter(fast_model="fast", strong_model="strong")
+        generator = QuizGenerator(api_key="test-key", router=router)
+        generator.client = self.FakeClient({
+            "fast": json.dumps({"title": "Quiz", "questions": []}),
+            "strong": json.dumps(valid),
+        })
+
+        quiz = generator.generate_quiz_from_text("Contenu", num_questions=1, difficulty=1)
+
+        assert generator.client.calls == ["fast", "strong"]
+        assert quiz["metadata"]["model"] == "strong"
+        assert router.stats()["fast"]["success_rate"] == 0.0
+
+
+class TestCheckpointedGeneration:
+    """Tests pour la génération par morceaux avec reprise."""
+
+    class FlakyClient:
+        """Client simulé qui échoue après un nombre donné d'appels."""
+
+        def __init__(self, fail_after=None):
+            self.fail_after = fail_after
+            self.prompts = []
+
+        def generate(self, prompt, **kwargs):
+            import json
+            if self.fail_after is not None and len(self.prompts) >= self.fail_after:
+                raise ConnectionError("Panne du fournisseur")
+            self.prompts.append(prompt)
+            return json.dumps({
+                "title": "Quiz",
+                "questions": [{"question": f"Q{len(self.prompts)}?", "correct_answer": "R"}]
+            })
+
+    SECTIONS = [
+        {"title": f"Section {i}", "content": "x" * 5000} for i in range(4)
+    ]
+
+    def _generator(self, client):
+        from src.generators.quiz_generator import QuizGenerator
+        generator = QuizGenerator(model="test-model", api_key="test-key")
+        generator.client = client
+        return generator
+
+    def test_long_document_is_chunked(self):
+        """Test que les questions sont réparties sur les morceaux."""
+        generator = self._generator(self.FlakyClient())
+
+        quiz = generator.generate_quiz_from_sections(self.SECTIONS, num_questions=4)
+
+        assert len(generator.client.prompts) == 4
+        assert [q["id"] for q in quiz["questions"]] == [1, 2, 3, 4]
+        assert quiz["metadata"]["chunks"] == 4
+
+    def test_resume_skips_completed_chunks(self, tmp_path):
+        """Test qu'une reprise ne régénère que les morceaux manquants."""
+        from src.generators.checkpoint import CheckpointJournal
+
+        journal = CheckpointJournal(tmp_path / "doc.jsonl")
+        with pytest.raises(ConnectionError):
+            self._generator(self.FlakyClient(fail_after=3)).generate_quiz_from_sections(
+                self.SECTIONS, num_questions=4, checkpoint=journal
+            )
+        assert len(journal.load()) == 3
+
+        generator = self._generator(self.FlakyClient())
+        quiz = generator.generate_quiz_from_sections(
+            self.SECTIONS, num_questions=4, checkpoint=journal
+        )
+
+        assert len(generator.client.prompts) == 1
+        assert len(quiz["questions"]) == 4
+        assert quiz["metadata"]["resumed_chunks"] == 3
+
+    def test_truncated_journal_line_is_ignored(self, tmp_path):
+        """Test qu'une ligne tronquée par un arrêt brutal est ignorée."""
+        from src.generators.checkpoint import CheckpointJournal
+
+        journal = CheckpointJournal(tmp_path / "doc.jsonl")
+        journal.append("a", {"questions": []})
+        with journal.path.open("a", encoding="utf-8") as file:
+            file.write('{"chunk_key": "b", "qu')
+        journal.append("c", {"questions": []})
+
+        assert set(journal.load()) == {"a", "c"}
@@ -0,0 +1,75 @@
+"""Tests pour le routage des modèles LLM."""
+
+import pytest
+
+
+class TestModelRouter:
+    """Tests pour le routeur de modèles."""
+
+    def _router(self, **kwargs):
+        from src.llm.router import ModelRouter
+        return ModelRouter(fast_model="fast", strong_model="strong", **kwargs)
+
+    def test_simple_request_uses_fast_model_first(self):
+        """Test qu'une requête simple part vers le modèle rapide."""
+        router = self._router()
+        assert router.candidates(1, 1000, ["qcm"]) == ["fast", "strong"]
+
+    def test_demanding_request_uses_strong_model(self):
+        """Test que la difficulté, la taille ou le type imposent le modèle fort."""
+        router = self._router(fast_question_types=["qcm"])
+        assert router.candidates(4, 1000, ["qcm"]) == ["strong"]
+        assert router.candidates(1, 50000, ["qcm"]) == ["strong"]
+        assert router.candidates(1, 1000, ["qcm", "ouvert"]) == ["strong"]
+
+    def test_unreliable_fast_model_is_skipped(self):
+        """Test que le routage s'adapte au taux de réussite observé."""
+        router = self._router(min_samples=3)
+        for _ in range(3):
+            router.record("fast", 0.5, success=False)
+
+        assert router.stats()["fast"]["success_rate"] == 0.0
+        assert router.candidates(1, 1000, ["qcm"]) == ["strong"]
+
+    def test_stats_are_persisted(self, tmp_path):
+        """Test la persistance des statistiques entre deux instances."""
+        stats_path = tmp_path / "stats.json"
+        self._router(stats_path=stats_path).record("fast", 1.0, success=True)
+
+        stats = self._router(stats_path=stats_path).stats()
+        assert stats["fast"]["calls"] == 1
+        assert stats["fast"]["avg_latency"] == pytest.approx(1.0)
+
+    def test_skipped_fast_model_is_probed_and_recovers(self):
+        """Test qu'un modèle rapide écarté est resondé et peut redevenir le choix principal."""
+        router = self._router(min_samples=3, explore_every=4, decay=0.5)
+        for _ in range(3):
+            router.record("fast", 0.5, success=False)
+
+        routes = [router.candidates(1, 1000, ["qcm"]) for _ in range(4)]
+        assert routes.count(["fast", "strong"]) == 1
+
+        for _ in range(3):
+            router.record("fast", 0.5, success=True)
+        assert router.candidates(1, 1000, ["qcm"]) == ["fast", "strong"]
+
+    def test_latency_is_compared_within_complexity_class(self):
+        """Test que la latence du modèle fort sur des requêtes complexes n'écarte pas le modèle rapide."""
+        router = self._router(min_samples=2)
+        for _ in range(2):
+            router.record("fast", 2.0, success=True, complexity="simple")
+            router.record("strong", 1.0, success=True, complexity="complex")
+        assert router.candidates(1, 1000, ["qcm"]) == ["fast", "strong"]
+
+        for _ in range(2):
+            router.record("strong", 1.0, success=True, complexity="simple")
+        assert router.candidates(1, 1000, ["qcm"]) == ["strong"]
+
+    def test_legacy_cumulative_stats_are_ignored(self, tmp_path):
+        """Test que les anciens cumuls persistés (sans classe) ne bloquent pas le routage."""
+        stats_path = tmp_path / "stats.json"
+        stats_path.write_text('{"fast": {"calls": 50, "successes": 0, "total_latency": 10.0}}', encoding="utf-8")
+
+        router = self._router(stats_path=stats_path)
+        assert router.stats() == {}
+        assert router.candidates(1, 1000, ["qcm"]) == ["fast", "strong"]
@@ -0,0 +1,163 @@
+"""Benchmarks des parseurs sur un corpus synthétique.
+
+Les tests de fumée (parsing réel de chaque format) tournent toujours.
+Les mesures de temps et de mémoire sont activées avec QUIZ_BENCHMARK=1 et
+comparées aux références de tests/parser_baselines.json :
+
+    QUIZ_BENCHMARK=1 python -m pytest tests/test_parser_benchmarks.py -s
+
+Pour régénérer les références après une modification volontaire :
+
+    QUIZ_BENCHMARK=1 QUIZ_BENCHMARK_UPDATE=1 python -m pytest tests/test_parser_benchmarks.py
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from src.parsers import PARSERS
+from src.parsers.base_parser import BaseParser
+
+from .corpus import BUILDERS, SIZES, build_fixture
+
+
+BASELINES_PATH = Path(__file__).parent / "parser_baselines.json"
+BENCHMARK_ENABLED = os.getenv("QUIZ_BENCHMARK") == "1"
+UPDATE_BASELINES = os.getenv("QUIZ_BENCHMARK_UPDATE") == "1"
+REPEAT = 3
+
+# Extension du corpus utilisée pour chaque parseur
+PARSER_EXTENSIONS = {}
+for _extension, _parser_cls in PARSERS.items():
+    if _extension in BUILDERS:
+        PARSER_EXTENSIONS.setdefault(_parser_cls, _extension)
+
+CASES = [
+    (parser_cls, size, method)
+    for parser_cls in PARSER_EXTENSIONS
+    for size in SIZES
+    for method in ("parse", "extract_text")
+]
+
+_results = {}
+
+
+def all_subclasses(cls):
+    """Retourne récursivement toutes les sous-classes d'une classe."""
+    subclasses = set()
+    for subclass in cls.__subclasses__():
+        subclasses.add(subclass)
+        subclasses |= all_subclasses(subclass)
+    return subclasses
+
+
+def measure(func):
+    """Mesure le meilleur temps sur REPEAT exécutions et le pic mémoire."""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"time": min(timings), "peak_memory": peak}
+
+
+def load_baselines():
+    """Charge les références de performance."""
+    if not BASELINES_PATH.exists():
+        return {"tolerance": {"time": 2.0, "time_slack": 0.005, "peak_memory": 1.3}, "results": {}}
+    return json.loads(BASELINES_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="session")
+def corpus_dir(tmp_path_factory):
+    """Dossier contenant le corpus synthétique."""
+    return tmp_path_factory.mktemp("corpus")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def write_baselines():
+    """Écrit les nouvelles références en fin de module si demandé."""
+    yield
+    if BENCHMARK_ENABLED and UPDATE_BASELINES and _results:
+        baselines = load_baselines()
+        baselines["results"].update(_results)
+        baselines["results"] = dict(sorted(baselines["results"].items()))
+        BASELINES_PATH.write_text(json.dumps(baselines, indent=2) + "\n", encoding="utf-8")
+
+
+class TestParserCorpus:
+    """Tests de fumée : chaque parseur lit un vrai fichier."""
+
+    def test_every_parser_has_fixture(self):
+        """Test que chaque sous-classe de BaseParser est couverte par le corpus."""
+        import src.parsers  # noqa: F401  (enregistre toutes les sous-classes)
+
+        missing = {cls.__name__ for cls in all_subclasses(BaseParser)} - \
+            {cls.__name__ for cls in PARSER_EXTENSIONS}
+        assert not missing, f"Parseurs sans fixture de benchmark: {missing}"
+
+    @pytest.mark.parametrize("parser_cls", list(PARSER_EXTENSIONS), ids=lambda c: c.__name__)
+    def test_parse_real_file(self, parser_cls, corpus_dir):
+        """Test le parsing d'un document synthétique."""
+        path = build_fixture(corpus_dir, PARSER_EXTENSIONS[parser_cls], "small")
+        parser = parser_cls(path)
+
+        sections = parser.parse()
+        text = parser.extract_text()
+
+        assert len(sections) == SIZES["small"]
+        assert all(section["content"].strip() for section in sections)
+        assert "Chapitre 1" in text and f"Chapitre {SIZES['small']}" in text
+
+
+@pytest.mark.skipif(not BENCHMARK_ENABLED, reason="Benchmarks activés avec QUIZ_BENCHMARK=1")
+class TestParserBenchmarks:
+    """Mesures de temps et de mémoire comparées aux références."""
+
+    @pytest.mark.parametrize(
+        "parser_cls,size,method",
+        CASES,
+        ids=[f"{c.__name__}-{s}-{m}" for c, s, m in CASES]
+    )
+    def test_benchmark(self, parser_cls, size, method, corpus_dir):
+        """Mesure une méthode d'un parseur et la compare à la référence."""
+        path = build_fixture(corpus_dir, PARSER_EXTENSIONS[parser_cls], size)
+        parser = parser_cls(path)
+
+        result = measure(getattr(parser, method))
+        key = f"{parser_cls.__name__}.{method}.{size}"
+        _results[key] = {"time": round(result["time"], 5), "peak_memory": result["peak_memory"]}
+        print(f"\n{key}: {result['time'] * 1000:.1f} ms, {result['peak_memory'] / 1024:.0f} Ko")
+
+        if UPDATE_BASELINES:
+            return
+
+        baselines = load_baselines()
+        baseline = baselines["results"].get(key)
+        if baseline is None:
+            pytest.fail(f"Pas de référence pour {key}, relancer avec QUIZ_BENCHMARK_UPDATE=1")
+
+        tolerance = baselines["tolerance"]
+        time_factor = float(os.getenv("QUIZ_BENCHMARK_TOLERANCE", tolerance["time"]))
+        max_time = baseline["time"] * time_factor + tolerance["time_slack"]
+        max_memory = baseline["peak_memory"] * tolerance["peak_memory"]
+
+        assert result["time"] <= max_time, (
+            f"{key}: {result['time']:.4f}s > {max_time:.4f}s (référence {baseline['time']:.4f}s)"
+        )
+        assert result["peak_memory"] <= max_memory, (
+            f"{key}: {result['peak_memory']} octets > {max_memory:.0f} "
+            f"(référence {baseline['peak_memory']})"
+        )
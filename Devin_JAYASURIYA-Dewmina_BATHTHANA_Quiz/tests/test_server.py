@@ -0,0 +1,137 @@
+"""Tests pour le serveur de génération de quiz."""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+
+class FakeGenerator:
+    """Générateur simulé, sans appel au LLM."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def generate_quiz_from_sections(self, sections, **kwargs):
+        time.sleep(self.delay)
+        return {
+            "title": sections[0]["title"],
+            "questions": [{"question": "Q?", "correct_answer": "R"}],
+        }
+
+
+def wait_for(queue, job_id, timeout=5.0):
+    """Attend la fin d'un job."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("Le job ne s'est pas terminé à temps")
+
+
+class TestJobQueue:
+    """Tests pour la file de jobs."""
+
+    def test_job_runs_to_completion(self, tmp_path):
+        """Test qu'un document envoyé produit un quiz et ses exports."""
+        from src.server import JobQueue
+
+        queue = JobQueue(FakeGenerator(), max_workers=1, output_path=tmp_path)
+        try:
+            job_id = queue.submit("cours.md", b"Contenu du cours\n", {"formats": ["json"]})
+            job = wait_for(queue, job_id)
+        finally:
+            queue.shutdown()
+
+        assert job["status"] == "done"
+        assert job["result"]["title"] == "Texte"
+        assert set(job["outputs"]) == {"json"}
+
+    def test_queue_is_bounded(self, tmp_path):
+        """Test que la file refuse les jobs au-delà de sa capacité."""
+        from src.server import JobQueue, QueueFullError
+
+        queue = JobQueue(FakeGenerator(delay=0.2), max_workers=1, max_pending=1, output_path=tmp_path)
+        try:
+            queue.submit("a.md", b"A\n")
+            queue.submit("b.md", b"B\n")
+            with pytest.raises(QueueFullError):
+                queue.submit("c.md", b"C\n")
+        finally:
+            queue.shutdown()
+
+    def test_unsupported_extension(self, tmp_path):
+        """Test le rejet des formats non supportés."""
+        from src.server import JobQueue
+
+        queue = JobQueue(FakeGenerator(), output_path=tmp_path)
+        try:
+            with pytest.raises(ValueError):
+                queue.submit("image.png", b"...")
+        finally:
+            queue.shutdown()
+
+
+class TestHttpApi:
+    """Tests pour l'API HTTP."""
+
+    def test_upload_and_fetch_result(self, tmp_path):
+        """Test l'envoi d'un document puis la récupération du résultat."""
+        from src.server import create_server
+
+        server = create_server(FakeGenerator(), port=0, output_path=tmp_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        try:
+            request = urllib.request.Request(
+                f"{base_url}/jobs?filename=cours.md&num_questions=3",
+                data=b"Contenu du cours\n",
+                method="POST",
+            )
+            with urllib.request.urlopen(request) as response:
+                assert response.status == 202
+                job_id = json.loads(response.read())["job_id"]
+
+            wait_for(server.job_queue, job_id)
+            with urllib.request.urlopen(f"{base_url}/jobs/{job_id}/result") as response:
+                quiz = json.loads(response.read())
+            assert quiz["title"] == "Texte"
+
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(f"{base_url}/jobs/inconnu")
+            assert error.value.code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
+            server.job_queue.shutdown()
+
+    def test_invalid_generation_options_are_rejected(self, tmp_path):
+        """Test qu'un nombre de questions ou une difficulté hors bornes est refusé à l'envoi."""
+        from src.config import settings
+        from src.server import create_server
+
+        server = create_server(FakeGenerator(), port=0, output_path=tmp_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        try:
+            for query in ("num_questions=-3", f"num_questions={settings.max_questions + 1}",
+                          "difficulty=0", "difficulty=9", "num_questions=abc"):
+                request = urllib.request.Request(
+                    f"{base_url}/jobs?filename=cours.md&{query}", data=b"Contenu\n", method="POST"
+                )
+                with pytest.raises(urllib.error.HTTPError) as error:
+                    urllib.request.urlopen(request)
+                assert error.value.code == 400, query
+            stats = server.job_queue.stats()
+            assert sum(stats[status] for status in ("queued", "running", "done", "failed")) == 0
+        finally:
+            server.shutdown()
+            server.server_close()
+            server.job_queue.shutdown()
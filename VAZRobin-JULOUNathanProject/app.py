@@ -1,21 +1,49 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session, Response, stream_with_context, g
 from flask_sqlalchemy import SQLAlchemy
+import click
+from sqlalchemy import and_, or_, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 import json
+import secrets
+import time
 
-from src.git_parser import get_pr_diff
-from src.ai_reviewer import review_code, chat_with_ia 
+from src.git_parser import github_client, is_valid_name
+from src.ai_reviewer import review_code, chat_with_ia, stream_chat_with_ia, summarize_chat, llm_scheduler, model_router, MODEL, REVIEW_LEVELS
+from src.job_queue import JobQueue, QueueFullError
+from src.single_flight import SingleFlight
+from src.db_migrations import ensure_schema
+from src.diff_filter import filter_diff
+from src.pre_analysis import pre_analyze
+from src.diff_splitter import estimate_tokens
+from src.diff_index import index_diff, diff_stats
+from src.chat_context import context_messages, split_window, build_messages
+from src.webhooks import verify_signature, parse_pull_request_event
+from src.bulk_review import BulkReview, BulkRegistry
+from src.metrics import metrics, track_usage, start_trace, end_trace
+from src.compression import compress_text, decompress_text
+from src.review_search import ReviewSearch, snippet
+from src.config import (
+    ANALYSIS_WORKERS, ANALYSIS_MAX_PENDING, DIFF_FILTER_ENABLED, DIFF_SKIP_GLOBS, DIFF_MAX_FILE_TOKENS,
+    CHAT_CONTEXT_TOKENS, CHAT_DIFF_TOKENS, CHAT_KEEP_LAST,
+    GITHUB_WEBHOOK_SECRET, WEBHOOK_USERNAME, WEBHOOK_LEVELS, BULK_CONCURRENCY, BULK_MAX_PRS,
+    METRICS_TOKEN, DATABASE_URL, PRE_ANALYSIS_ENABLED, DIFF_HUNKS_PER_PAGE, LLM_MODELS
+)
 
 app = Flask(__name__)
 
-app.config['SQLALCHEMY_DATABASE_URI'] = 'mysql+pymysql://root:@localhost/code_reviewer_db'
+app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 app.secret_key = "robin_nathan_projet_iag_2026" 
 
 db = SQLAlchemy(app)
 
+# Index plein texte des revues (FTS5 sous SQLite, FULLTEXT sous MySQL)
+review_search = ReviewSearch(db)
+
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -27,15 +55,498 @@ class Review(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     repo_name = db.Column(db.String(100), nullable=False)
     pr_number = db.Column(db.Integer, nullable=False)
-    ai_result = db.Column(db.Text, nullable=False)
+    # Rapport compressé (zlib), lu et écrit via la propriété ai_result.
+    # L'ancienne colonne texte est vidée une fois le rapport compressé.
+    ai_result_text = db.Column('ai_result', db.Text, nullable=False, default='')
+    ai_result_z = db.Column(db.LargeBinary(length=2 ** 24))
     
+    # Ancien stockage du chat (tableau JSON), migré vers ChatMessage au démarrage
     chat_history = db.Column(db.Text, default='[]') 
+    # Résumé des anciens messages du chat et numéro (seq) du dernier message résumé
+    chat_summary = db.Column(db.Text)
+    chat_summary_count = db.Column(db.Integer, default=0)
     
+    # Clé de cache : une revue est réutilisable pour le même commit, niveau et modèle
+    head_sha = db.Column(db.String(40))
+    # Revue incrémentale : commit de départ du diff relu et revue précédente
+    base_sha = db.Column(db.String(40))
+    parent_review_id = db.Column(db.ForeignKey('review.id'))
+    level = db.Column(db.String(20))
+    model = db.Column(db.String(100))
+
+    # Coût de la revue : tokens facturés par OpenRouter (tous lots confondus) et durée de l'analyse IA
+    prompt_tokens = db.Column(db.Integer)
+    completion_tokens = db.Column(db.Integer)
+    latency_ms = db.Column(db.Integer)
+
+    # Fichiers et hunks retirés du diff relu (rapport JSON de prune_diff), renvoyé quand la revue est réutilisée
+    pruning_report = db.Column(db.Text)
+
     date_created = db.Column(db.DateTime, default=datetime.now)
     user_id = db.Column(db.ForeignKey('user.id'), nullable=False)
 
+    __table_args__ = (
+        db.Index('ix_review_cache_key', 'repo_name', 'pr_number', 'head_sha', 'level', 'model'),
+        db.Index('ix_review_user_date', 'user_id', 'date_created'),
+    )
+
+    @property
+    def ai_result(self):
+        if self.ai_result_z is not None:
+            return decompress_text(self.ai_result_z)
+        return self.ai_result_text
+
+    @ai_result.setter
+    def ai_result(self, value):
+        self.ai_result_z = compress_text(value)
+        self.ai_result_text = ''
+
+@event.listens_for(Review, "after_insert")
+def index_new_review(mapper, connection, review):
+    """Chaque nouvelle revue (analyse, copie du cache, webhook...) entre dans l'index de recherche."""
+    review_search.index(connection, review.id, review.repo_name, review.pr_number, review.ai_result)
+
+class ChatMessage(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    review_id = db.Column(db.ForeignKey('review.id'), nullable=False)
+    seq = db.Column(db.Integer, nullable=False)
+    role = db.Column(db.String(20), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    tokens = db.Column(db.Integer)
+    # Réponses de l'IA : tokens facturés du tour de chat (résumé compris) et durée de la réponse
+    prompt_tokens = db.Column(db.Integer)
+    completion_tokens = db.Column(db.Integer)
+    latency_ms = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    __table_args__ = (
+        db.Index('ix_chat_message_review_seq', 'review_id', 'seq', unique=True),
+    )
+
+    def to_dict(self):
+        return {"seq": self.seq, "role": self.role, "content": self.content}
+
+class PullDiff(db.Model):
+    """Diff d'une PR à un commit de tête donné, enregistré une seule fois (partagé par toutes ses revues)."""
+    id = db.Column(db.Integer, primary_key=True)
+    repo_name = db.Column(db.String(100), nullable=False)
+    head_sha = db.Column(db.String(40), nullable=False)
+    file_count = db.Column(db.Integer, nullable=False, default=0)
+    additions = db.Column(db.Integer, nullable=False, default=0)
+    deletions = db.Column(db.Integer, nullable=False, default=0)
+    date_created = db.Column(db.DateTime, default=datetime.now)
+    files = db.relationship('DiffFile', backref='pull_diff', lazy=True, order_by='DiffFile.position')
+
+    __table_args__ = (
+        db.Index('ix_pull_diff_key', 'repo_name', 'head_sha', unique=True),
+    )
+
+    def stats(self):
+        return {"files": self.file_count, "additions": self.additions, "deletions": self.deletions}
+
+class DiffFile(db.Model):
+    """Un fichier du diff : résumé (chemin, statut, lignes +/-) et hunks compressés, lus page par page."""
+    id = db.Column(db.Integer, primary_key=True)
+    pull_diff_id = db.Column(db.ForeignKey('pull_diff.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)
+    path = db.Column(db.String(500), nullable=False)
+    old_path = db.Column(db.String(500))
+    status = db.Column(db.String(20), nullable=False)
+    additions = db.Column(db.Integer, nullable=False, default=0)
+    deletions = db.Column(db.Integer, nullable=False, default=0)
+    hunk_count = db.Column(db.Integer, nullable=False, default=0)
+    header = db.Column(db.Text, nullable=False, default='')
+    # Liste JSON des hunks, compressée (zlib)
+    hunks_z = db.Column(db.LargeBinary(length=2 ** 24), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_diff_file_position', 'pull_diff_id', 'position', unique=True),
+    )
+
+    @property
+    def hunks(self):
+        return json.loads(decompress_text(self.hunks_z))
+
+    def to_dict(self):
+        return {
+            "index": self.position,
+            "path": self.path,
+            "old_path": self.old_path,
+            "status": self.status,
+            "additions": self.additions,
+            "deletions": self.deletions,
+            "hunk_count": self.hunk_count,
+        }
+
+
+def migrate_chat_history():
+    """
+    Recopie les anciens historiques JSON (Review.chat_history) dans la table ChatMessage.
+    Les 3 premiers messages (consigne, diff, rapport) sont reconstruits à chaque tour :
+    seuls les échanges sont recopiés, puis le tableau JSON est vidé.
+    """
+    reviews = Review.query.filter(Review.chat_history.isnot(None), Review.chat_history.notin_(['', '[]'])).all()
+    for review in reviews:
+        try:
+            turns = json.loads(review.chat_history)[3:]
+        except ValueError:
+            continue
+        for seq, message in enumerate(turns, 1):
+            db.session.add(ChatMessage(
+                review_id=review.id, seq=seq, role=message["role"], content=message["content"],
+                tokens=estimate_tokens(message["content"]), created_at=review.date_created
+            ))
+        review.chat_history = '[]'
+        db.session.commit()
+    if reviews:
+        print(f"🛠️ Migration : {len(reviews)} historique(s) de chat recopié(s) dans chat_message")
+
+def migrate_review_storage():
+    """
+    Compresse les rapports encore stockés en clair, puis ajoute à l'index de recherche
+    les revues qui n'y sont pas encore (par lots, pour ne pas tout charger en mémoire).
+    """
+    before = after = count = 0
+    while True:
+        batch = Review.query.filter(Review.ai_result_z.is_(None)).limit(200).all()
+        if not batch:
+            break
+        for review in batch:
+            before += len(review.ai_result_text.encode('utf-8'))
+            review.ai_result = review.ai_result_text
+            after += len(review.ai_result_z)
+        count += len(batch)
+        db.session.commit()
+    if count:
+        print(f"🛠️ Migration : {count} rapport(s) compressé(s) ({before // 1024} Ko -> {after // 1024} Ko)")
+
+    if not review_search.available:
+        return
+    with db.engine.connect() as conn:
+        indexed = review_search.indexed_ids(conn)
+    missing = [review_id for (review_id,) in db.session.query(Review.id) if review_id not in indexed]
+    for start in range(0, len(missing), 200):
+        with db.engine.begin() as conn:
+            for review in Review.query.filter(Review.id.in_(missing[start:start + 200])):
+                review_search.index(conn, review.id, review.repo_name, review.pr_number, review.ai_result)
+    if missing:
+        print(f"🛠️ Migration : {len(missing)} revue(s) ajoutée(s) à l'index de recherche")
+
 with app.app_context():
     db.create_all()
+    ensure_schema(db, Review)
+    ensure_schema(db, ChatMessage)
+    migrate_chat_history()
+    review_search.setup()
+    migrate_review_storage()
+
+# File d'analyses : les appels GitHub + IA tournent hors des workers HTTP
+analysis_queue = JobQueue(max_workers=ANALYSIS_WORKERS, max_pending=ANALYSIS_MAX_PENDING)
+
+# Revues groupées : file séparée pour ne pas bloquer les analyses interactives
+bulk_queue = JobQueue(max_workers=BULK_CONCURRENCY, max_pending=BULK_MAX_PRS)
+bulk_runs = BulkRegistry()
+
+
+# Deux demandes identiques simultanées ne déclenchent qu'un seul appel à l'IA
+review_flights = SingleFlight()
+
+# Tentatives d'enregistrement d'un tour de chat en cas de conflit sur le numéro de message
+CHAT_SAVE_RETRIES = 5
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.trace_token = start_trace()
+
+@app.after_request
+def record_request_timing(response):
+    """Durée de chaque requête (métriques par route) et détail des étapes dans l'en-tête Server-Timing."""
+    if 'request_started' not in g:
+        return response
+    spans = end_trace(g.trace_token)
+    elapsed = time.perf_counter() - g.request_started
+    # On regroupe par route déclarée (/api/jobs/<job_id>) et non par URL
+    route = request.url_rule.rule if request.url_rule else "<inconnue>"
+    metrics.inc("http_requests_total", method=request.method, route=route, status=response.status_code)
+    metrics.observe("http_request_duration_seconds", elapsed, method=request.method, route=route)
+
+    timings = [f"app;dur={elapsed * 1000:.1f}"] + [f"{name};dur={seconds * 1000:.1f}" for name, seconds in spans.items()]
+    response.headers["Server-Timing"] = ", ".join(timings)
+    return response
+
+
+def find_cached_review(repo_full_name, pr_number, head_sha, level, model, user_id=None, full_only=False):
+    """
+    Cherche une revue existante pour le même commit de tête et niveau.
+    Une revue rédigée par un modèle de repli (LLM_MODELS) est acceptée, celle du modèle demandé est préférée.
+    Avec full_only=True, les revues incrémentales (qui ne couvrent que les derniers commits) sont exclues.
+    """
+    models = [model] + [m for m in LLM_MODELS if m != model]
+    query = Review.query.filter(
+        Review.repo_name == repo_full_name,
+        Review.pr_number == pr_number,
+        Review.head_sha == head_sha,
+        Review.level == level,
+        Review.model.in_(models),
+    )
+    if user_id is not None:
+        query = query.filter_by(user_id=user_id)
+    if full_only:
+        query = query.filter(Review.base_sha.is_(None))
+    return query.order_by((Review.model == model).desc(), Review.date_created.desc()).first()
+
+
+def find_previous_review(user_id, repo_full_name, pr_number, level, head_sha):
+    """Dernière revue de cette PR par l'utilisateur, faite sur un commit plus ancien."""
+    return Review.query.filter(
+        Review.user_id == user_id,
+        Review.repo_name == repo_full_name,
+        Review.pr_number == pr_number,
+        Review.level == level,
+        Review.head_sha.isnot(None),
+        Review.head_sha != head_sha,
+    ).order_by(Review.date_created.desc()).first()
+
+
+def prune_diff(diff_text):
+    """
+    On retire du diff les lockfiles, fichiers générés, binaires... avant la revue,
+    puis la pré-analyse locale retire les hunks sans effet et relève les problèmes évidents.
+    """
+    pruning = {"skipped": [], "tokens_saved": 0}
+    if DIFF_FILTER_ENABLED:
+        diff_text, pruning = filter_diff(diff_text, DIFF_SKIP_GLOBS, DIFF_MAX_FILE_TOKENS)
+        if pruning["skipped"]:
+            print(f"🧹 {len(pruning['skipped'])} fichier(s) ignoré(s), ~{pruning['tokens_saved']} tokens économisés")
+
+    if PRE_ANALYSIS_ENABLED:
+        diff_text, report = pre_analyze(diff_text)
+        pruning["pre_analysis"] = report
+        print(f"🔎 Pré-analyse : {report['hunks']['code']}/{sum(report['hunks'].values())} hunk(s) de code, "
+              f"{len(report['findings'])} constat(s), ~{report['tokens_saved']} tokens économisés")
+    return diff_text, pruning
+
+
+def store_pull_diff(repo_full_name, head_sha, diff_text):
+    """
+    Enregistre le diff de la PR, découpé par fichier, une seule fois par commit de tête.
+    Retourne le PullDiff (existant ou nouvellement créé).
+    """
+    pull_diff = PullDiff.query.filter_by(repo_name=repo_full_name, head_sha=head_sha).first()
+    if pull_diff is not None:
+        return pull_diff
+
+    files = index_diff(diff_text)
+    stats = diff_stats(files)
+    pull_diff = PullDiff(
+        repo_name=repo_full_name, head_sha=head_sha, file_count=stats["files"],
+        additions=stats["additions"], deletions=stats["deletions"]
+    )
+    for position, diff_file in enumerate(files):
+        pull_diff.files.append(DiffFile(
+            position=position,
+            path=diff_file["path"][:500],
+            old_path=diff_file["old_path"][:500] if diff_file["old_path"] else None,
+            status=diff_file["status"],
+            additions=diff_file["additions"],
+            deletions=diff_file["deletions"],
+            hunk_count=len(diff_file["hunks"]),
+            header=diff_file["header"],
+            hunks_z=compress_text(json.dumps(diff_file["hunks"])),
+        ))
+    db.session.add(pull_diff)
+    try:
+        with metrics.span("db_commit"):
+            db.session.commit()
+    except IntegrityError:
+        # Le même diff vient d'être enregistré par une autre analyse
+        db.session.rollback()
+        pull_diff = PullDiff.query.filter_by(repo_name=repo_full_name, head_sha=head_sha).first()
+    return pull_diff
+
+def load_pull_diff(review):
+    """
+    Diff enregistré d'une revue. Pour une revue antérieure à l'enregistrement des diffs,
+    il est récupéré une dernière fois (cache disque ou GitHub) puis enregistré. None sans commit connu.
+    Si la PR a avancé depuis la revue, GitHub ne sert plus son diff à ce commit : on compare alors
+    la branche de base de la PR avec le commit relu (API compare, depuis leur ancêtre commun).
+    """
+    if not review.head_sha:
+        return None
+    pull_diff = PullDiff.query.filter_by(repo_name=review.repo_name, head_sha=review.head_sha).first()
+    if pull_diff is None:
+        repo_owner, repo_name = review.repo_name.split('/', 1)
+        with metrics.span("github_fetch"):
+            pull = github_client.get_pull(repo_owner, repo_name, review.pr_number)
+            if pull["head"]["sha"] == review.head_sha:
+                diff_text = github_client.get_pr_diff(repo_owner, repo_name, review.pr_number, head_sha=review.head_sha)
+            else:
+                print(f"🔁 PR #{review.pr_number} modifiée depuis la revue #{review.id} : diff reconstruit depuis la base")
+                diff_text = github_client.get_compare_diff(repo_owner, repo_name, pull["base"]["sha"], review.head_sha)
+        pull_diff = store_pull_diff(review.repo_name, review.head_sha, diff_text)
+    return pull_diff
+
+def pull_diff_text(pull_diff):
+    """Texte du diff unifié reconstruit à partir des fichiers enregistrés."""
+    return "".join(f.header + "".join(f.hunks) for f in pull_diff.files)
+
+
+def run_analysis(user_id, repo_owner, repo_name, pr_number, level, force=False, incremental=False,
+                 head_sha=None, lane="review", on_token=None):
+    """
+    Récupère le diff, lance la revue IA et sauvegarde le résultat.
+    Exécuté par un worker de la file d'analyses (on_token reçoit la réponse en streaming).
+    Une revue existante pour le même commit, niveau et modèle est réutilisée, sauf si force=True.
+    Avec incremental=True, seuls les commits ajoutés depuis la dernière revue de l'utilisateur sont relus.
+    head_sha peut être fourni (webhook) pour éviter de redemander la PR à GitHub.
+    lane est la file de l'ordonnanceur IA ("review" interactif, "bulk" pour les revues de fond).
+    """
+    repo_full_name = f"{repo_owner}/{repo_name}"
+    with metrics.span("github_fetch"):
+        if head_sha is None:
+            head_sha = github_client.get_pull(repo_owner, repo_name, pr_number)["head"]["sha"]
+        diff_text = github_client.get_pr_diff(repo_owner, repo_name, pr_number, head_sha=head_sha)
+    cache_key = (repo_full_name, pr_number, head_sha, level, MODEL)
+
+    with app.app_context():
+        pull_diff = store_pull_diff(repo_full_name, head_sha, diff_text)
+        source = None
+        if not force:
+            source = (
+                find_cached_review(*cache_key, user_id=user_id, full_only=not incremental)
+                or find_cached_review(*cache_key, full_only=True)
+            )
+        reused = source is not None
+        pruning = None
+
+        if source is None:
+            # Revue incrémentale : on ne relit que le diff entre le commit déjà relu et la nouvelle tête
+            previous = find_previous_review(user_id, *cache_key[:2], level, head_sha) if incremental else None
+            reviewed_diff = diff_text
+            if previous is not None:
+                try:
+                    with metrics.span("github_fetch"):
+                        reviewed_diff = github_client.get_compare_diff(repo_owner, repo_name, previous.head_sha, head_sha)
+                    print(f"🔁 Revue incrémentale depuis {previous.head_sha[:7]} (revue #{previous.id})")
+                except Exception as e:
+                    print(f"❌ Comparaison impossible, revue complète : {e}")
+                    previous = None
+
+            reviewed_diff, pruning = prune_diff(reviewed_diff)
+            parent_id = previous.id if previous else None
+            base_sha = previous.head_sha if previous else None
+            previous_result = previous.ai_result if previous else None
+            local_findings = pruning.get("pre_analysis", {}).get("findings")
+
+            def create_review():
+                started = time.perf_counter()
+                with llm_scheduler.acting_as(user_id, lane, level), track_usage() as usage:
+                    review_result, review_model = review_code(
+                        reviewed_diff, level, on_token=on_token,
+                        previous_review=previous_result, local_findings=local_findings
+                    )
+                latency = time.perf_counter() - started
+                print(f"📊 Revue générée en {latency:.1f} s : {usage.calls} appel(s), "
+                      f"{usage.prompt_tokens} + {usage.completion_tokens} tokens")
+
+                new_review = Review(
+                    repo_name=repo_full_name,
+                    pr_number=pr_number,
+                    ai_result=review_result,
+                    head_sha=head_sha,
+                    base_sha=base_sha,
+                    parent_review_id=parent_id,
+                    level=level,
+                    model=review_model,
+                    prompt_tokens=usage.prompt_tokens,
+                    completion_tokens=usage.completion_tokens,
+                    latency_ms=int(latency * 1000),
+                    pruning_report=json.dumps(pruning),
+                    user_id=user_id
+                )
+                db.session.add(new_review)
+                with metrics.span("db_commit"):
+                    db.session.commit()
+                return new_review.id
+
+            review_id, reused = review_flights.do(cache_key + (base_sha,), create_review)
+            source = db.session.get(Review, review_id)
+
+        # Revue faite pour un autre utilisateur : on lui en donne une copie (historique et chat séparés)
+        if source.user_id == user_id:
+            review = source
+        else:
+            review = Review(
+                repo_name=source.repo_name,
+                pr_number=source.pr_number,
+                ai_result=source.ai_result,
+                head_sha=source.head_sha,
+                level=source.level,
+                model=source.model,
+                pruning_report=source.pruning_report,
+                # Copie sans appel à l'IA : rien de facturé
+                prompt_tokens=0,
+                completion_tokens=0,
+                user_id=user_id
+            )
+            db.session.add(review)
+            with metrics.span("db_commit"):
+                db.session.commit()
+
+        metrics.inc("reviews_total", level=level, source="cache" if reused else "llm")
+        if reused:
+            print(f"♻️ Revue réutilisée pour {repo_full_name}#{pr_number} ({head_sha[:7]}, {level})")
+
+        return {
+            "result": review.ai_result,
+            # Le diff n'est plus renvoyé : l'interface charge les fichiers à la demande (/api/reviews/<id>/diff)
+            "diff_stats": pull_diff.stats(),
+            "review_id": review.id,
+            "parent_review_id": review.parent_review_id,
+            "base_sha": review.base_sha,
+            "cached": reused,
+            # Revue réutilisée : rapport enregistré avec elle (celui du diff réellement relu), sans refaire l'analyse
+            "pruning": pruning if pruning is not None else (
+                json.loads(review.pruning_report) if review.pruning_report else None
+            ),
+        }
+
+
+def start_bulk_review(user_id, repo_owner, repo_name, level, force=False):
+    """
+    Lance la revue de toutes les PR ouvertes d'un dépôt : une tâche par PR dans la file
+    des revues groupées (BULK_CONCURRENCY en parallèle). Retourne le suivi BulkReview.
+    Les brouillons sont ignorés, comme pour les webhooks. Tout ou rien : si la file n'a pas
+    de place pour toutes les PR, aucune n'est planifiée (QueueFullError).
+    """
+    open_pulls = github_client.list_open_pulls(repo_owner, repo_name)
+    pulls = [pull for pull in open_pulls if not pull["draft"]]
+    if len(pulls) > BULK_MAX_PRS:
+        raise QueueFullError(f"{len(pulls)} PR ouvertes : la limite est de {BULK_MAX_PRS} par revue groupée.")
+
+    run = BulkReview(repo_owner, repo_name, level, user_id)
+    run.drafts_skipped = len(open_pulls) - len(pulls)
+    job_ids = bulk_queue.submit_many([
+        (run.run_pull, (pull["number"], run_analysis, user_id, repo_owner, repo_name, pull["number"], level),
+         {"force": force, "head_sha": pull["head_sha"], "lane": "bulk"})
+        for pull in pulls
+    ], owner_id=user_id)
+    for pull, job_id in zip(pulls, job_ids):
+        run.add(pull, job_id)
+    bulk_runs.add(run)
+
+    print(f"📦 Revue groupée de {repo_owner}/{repo_name} : {len(pulls)} PR planifiées, "
+          f"{run.drafts_skipped} brouillon(s) ignoré(s)")
+    return run
+
+
+def sse_event(event, data):
+    """Formate un événement Server-Sent Events (données en JSON)."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
 
 @app.route('/')
@@ -50,8 +561,9 @@ def register():
         username = request.form.get('username')
         password = request.form.get('password')
 
+        # Le nom du compte technique des webhooks est réservé
         existing_user = User.query.filter_by(username=username).first()
-        if existing_user:
+        if existing_user or username == WEBHOOK_USERNAME:
             return "Ce nom d'utilisateur existe déjà ! Essayez-en un autre."
 
         hashed_password = generate_password_hash(password)
@@ -87,74 +599,609 @@ def logout():
     session.clear()
     return redirect(url_for('login'))
 
+HISTORY_PAGE_SIZE = 20
+
+def history_cursor(review):
+    """Curseur de pagination : position (date, id) de la dernière revue affichée."""
+    return f"{review.date_created.isoformat()}_{review.id}"
+
+def parse_history_cursor(cursor):
+    try:
+        date_text, review_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(date_text), int(review_id)
+    except (AttributeError, ValueError):
+        return None
+
+def search_reviews(user_id, query, page):
+    """
+    Recherche plein texte dans les revues de l'utilisateur, par ordre de pertinence.
+    Retourne (revues avec leur extrait et leur score, page suivante ou None).
+    """
+    hits = review_search.search(user_id, query, HISTORY_PAGE_SIZE + 1, (page - 1) * HISTORY_PAGE_SIZE)
+    scores = dict(hits[:HISTORY_PAGE_SIZE])
+    rank = {review_id: position for position, review_id in enumerate(scores)}
+    reviews = Review.query.filter(Review.id.in_(scores)).all() if scores else []
+    reviews.sort(key=lambda review: rank[review.id])
+    for review in reviews:
+        # Seuls les rapports de la page affichée sont décompressés
+        review.snippet = snippet(review.ai_result, query)
+        review.score = round(scores[review.id], 3)
+    return reviews, page + 1 if len(hits) > HISTORY_PAGE_SIZE else None
+
 @app.route('/historique')
 def historique():
     if 'user_id' not in session:
         return redirect(url_for('login'))
-    
-    user_reviews = Review.query.filter_by(user_id=session['user_id']).order_by(Review.date_created.desc()).all()
-    return render_template('historique.html', reviews=user_reviews, username=session.get('username'))
+
+    query_text = (request.args.get('q') or '').strip()
+    if query_text and review_search.available:
+        page = max(request.args.get('page', 1, type=int), 1)
+        results, next_page = search_reviews(session['user_id'], query_text, page)
+        return render_template(
+            'historique.html', reviews=results, username=session.get('username'),
+            query=query_text, page=page, next_page=next_page, first_page=page == 1
+        )
+
+    order = 'asc' if request.args.get('order') == 'asc' else 'desc'
+    cursor = parse_history_cursor(request.args.get('cursor'))
+
+    # La liste ne charge que les champs résumés (le rapport et le chat sont chargés à l'ouverture)
+    query = Review.query.options(
+        load_only(Review.id, Review.repo_name, Review.pr_number, Review.level, Review.date_created,
+                  Review.parent_review_id)
+    ).filter_by(user_id=session['user_id'])
+
+    # Pagination par curseur (index user_id, date_created) : pas d'OFFSET qui relit les pages précédentes
+    if cursor:
+        cursor_date, cursor_id = cursor
+        if order == 'desc':
+            query = query.filter(or_(
+                Review.date_created < cursor_date,
+                and_(Review.date_created == cursor_date, Review.id < cursor_id)
+            ))
+        else:
+            query = query.filter(or_(
+                Review.date_created > cursor_date,
+                and_(Review.date_created == cursor_date, Review.id > cursor_id)
+            ))
+
+    if order == 'desc':
+        query = query.order_by(Review.date_created.desc(), Review.id.desc())
+    else:
+        query = query.order_by(Review.date_created.asc(), Review.id.asc())
+
+    rows = query.limit(HISTORY_PAGE_SIZE + 1).all()
+    user_reviews = rows[:HISTORY_PAGE_SIZE]
+    next_cursor = history_cursor(user_reviews[-1]) if len(rows) > HISTORY_PAGE_SIZE else None
+
+    return render_template(
+        'historique.html', reviews=user_reviews, username=session.get('username'),
+        order=order, next_cursor=next_cursor, first_page=cursor is None
+    )
+
+@app.route('/api/search')
+def search_api():
+    """
+    Recherche plein texte dans les revues de l'utilisateur : ?q=<mots>&page=<n>.
+    Résultats classés par pertinence, 20 par page, avec un extrait du rapport.
+    """
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+    if not review_search.available:
+        return jsonify({"status": "error", "message": "Recherche indisponible pour cette base de données"}), 501
+
+    query_text = (request.args.get('q') or '').strip()
+    if not query_text:
+        return jsonify({"status": "error", "message": "Recherche vide"}), 400
+
+    page = max(request.args.get('page', 1, type=int), 1)
+    results, next_page = search_reviews(session['user_id'], query_text, page)
+    return jsonify({
+        "status": "success",
+        "query": query_text,
+        "page": page,
+        "next_page": next_page,
+        "results": [{
+            "id": review.id,
+            "repo_name": review.repo_name,
+            "pr_number": review.pr_number,
+            "level": review.level,
+            "date_created": review.date_created.isoformat(),
+            "score": review.score,
+            "snippet": review.snippet,
+        } for review in results],
+    })
+
+@app.route('/api/reviews/<int:review_id>')
+def review_detail(review_id):
+    """Rapport complet d'une revue (chargé à la demande par la page d'historique)."""
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    review = db.session.get(Review, review_id)
+    if not review or review.user_id != session['user_id']:
+        return jsonify({"status": "error", "message": "Revue introuvable"}), 404
+
+    return jsonify({
+        "status": "success",
+        "id": review.id,
+        "repo_name": review.repo_name,
+        "pr_number": review.pr_number,
+        "level": review.level,
+        "head_sha": review.head_sha,
+        "base_sha": review.base_sha,
+        "parent_review_id": review.parent_review_id,
+        "model": review.model,
+        "prompt_tokens": review.prompt_tokens,
+        "completion_tokens": review.completion_tokens,
+        "latency_ms": review.latency_ms,
+        "date_created": review.date_created.isoformat(),
+        "ai_result": review.ai_result,
+    })
+
+@app.route('/api/reviews/<int:review_id>/diff')
+def review_diff(review_id):
+    """Fichiers modifiés de la PR relue (chemin, statut, lignes +/-), sans leur contenu."""
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    review = db.session.get(Review, review_id)
+    if not review or review.user_id != session['user_id']:
+        return jsonify({"status": "error", "message": "Revue introuvable"}), 404
+
+    try:
+        pull_diff = load_pull_diff(review)
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 502
+    if pull_diff is None:
+        return jsonify({"status": "error", "message": "Diff indisponible pour cette revue"}), 404
+
+    # La liste ne lit pas les hunks compressés
+    files = DiffFile.query.filter_by(pull_diff_id=pull_diff.id).options(load_only(
+        DiffFile.position, DiffFile.path, DiffFile.old_path, DiffFile.status,
+        DiffFile.additions, DiffFile.deletions, DiffFile.hunk_count
+    )).order_by(DiffFile.position).all()
+    return jsonify({
+        "status": "success",
+        "head_sha": pull_diff.head_sha,
+        "stats": pull_diff.stats(),
+        "files": [f.to_dict() for f in files],
+    })
+
+@app.route('/api/reviews/<int:review_id>/diff/<int:file_index>')
+def review_diff_file(review_id, file_index):
+    """
+    Hunks d'un fichier du diff, par pages : ?page=<n> (à partir de 1),
+    DIFF_HUNKS_PER_PAGE hunks par page.
+    """
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    review = db.session.get(Review, review_id)
+    if not review or review.user_id != session['user_id'] or not review.head_sha:
+        return jsonify({"status": "error", "message": "Revue introuvable"}), 404
+
+    diff_file = DiffFile.query.join(PullDiff).filter(
+        PullDiff.repo_name == review.repo_name,
+        PullDiff.head_sha == review.head_sha,
+        DiffFile.position == file_index,
+    ).first()
+    if diff_file is None:
+        return jsonify({"status": "error", "message": "Fichier introuvable"}), 404
+
+    page = max(request.args.get('page', 1, type=int), 1)
+    start = (page - 1) * DIFF_HUNKS_PER_PAGE
+    hunks = diff_file.hunks[start:start + DIFF_HUNKS_PER_PAGE]
+    return jsonify({
+        "status": "success",
+        "file": diff_file.to_dict(),
+        "hunks": hunks,
+        "page": page,
+        "next_page": page + 1 if start + DIFF_HUNKS_PER_PAGE < diff_file.hunk_count else None,
+    })
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze_pr():
     if 'user_id' not in session:
         return jsonify({"status": "error", "message": "Non autorisé"}), 401
 
-    data = request.json
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"status": "error", "message": "Corps JSON attendu"}), 400
     repo_owner = data.get('owner')
     repo_name = data.get('repo')
     pr_number = data.get('pr')
-    level = data.get('level', 'senior') 
+    level = data.get('level', 'senior')
+    force = bool(data.get('force', False))
+    incremental = bool(data.get('incremental', False))
+
+    if not is_valid_name(repo_owner) or not is_valid_name(repo_name):
+        return jsonify({"status": "error", "message": "Propriétaire ou dépôt invalide"}), 400
+    if level not in REVIEW_LEVELS:
+        return jsonify({"status": "error", "message": f"Niveau invalide (attendu : {', '.join(REVIEW_LEVELS)})"}), 400
+    try:
+        pr_number = int(pr_number)
+    except (TypeError, ValueError):
+        return jsonify({"status": "error", "message": "Numéro de PR invalide"}), 400
     
+    # On rend la main tout de suite : le client suit l'avancement via /api/jobs/<job_id>
     try:
-        diff_text = get_pr_diff(repo_owner, repo_name, pr_number)
-        review_result = review_code(diff_text, level)
-        
-        new_review = Review(
-            repo_name=f"{repo_owner}/{repo_name}",
-            pr_number=pr_number,
-            ai_result=review_result,
-            user_id=session['user_id']
+        job_id = analysis_queue.submit(
+            run_analysis, session['user_id'], repo_owner, repo_name, pr_number, level,
+            force=force, incremental=incremental,
+            owner_id=session['user_id'], stream=True
         )
-        db.session.add(new_review)
-        db.session.commit()
-        
-        return jsonify({
-            "status": "success", 
-            "result": review_result,
-            "diff": diff_text,
-            "review_id": new_review.id,  
-        })
-        
+    except QueueFullError as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
+
+    return jsonify({"status": "accepted", "job_id": job_id}), 202
+
+@app.route('/api/bulk', methods=['POST'])
+def bulk_review_api():
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    data = request.json or {}
+    if not data.get('owner') or not data.get('repo'):
+        return jsonify({"status": "error", "message": "Dépôt manquant"}), 400
+    if not is_valid_name(data['owner']) or not is_valid_name(data['repo']):
+        return jsonify({"status": "error", "message": "Propriétaire ou dépôt invalide"}), 400
+    level = data.get('level', 'senior')
+    if level not in REVIEW_LEVELS:
+        return jsonify({"status": "error", "message": f"Niveau invalide (attendu : {', '.join(REVIEW_LEVELS)})"}), 400
+
+    try:
+        run = start_bulk_review(
+            session['user_id'], data['owner'], data['repo'], level,
+            force=bool(data.get('force', False))
+        )
+    except QueueFullError as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
     except Exception as e:
-        return jsonify({
-            "status": "error", 
-            "message": str(e)
-        }), 400
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    return jsonify({"status": "accepted", "bulk_id": run.id, "total": len(run.pulls)}), 202
+
+@app.route('/api/bulk/<bulk_id>')
+def bulk_review_status(bulk_id):
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    run = bulk_runs.get(bulk_id)
+    if not run or run.user_id != session['user_id']:
+        return jsonify({"status": "error", "message": "Revue groupée introuvable"}), 404
+
+    return jsonify({"status": "success", **run.progress(bulk_queue)})
+
+def webhook_user_id():
+    """
+    Compte technique propriétaire des revues lancées par webhook (créé au premier appel).
+    Personne ne peut s'y connecter : son mot de passe est aléatoire.
+    """
+    user = User.query.filter_by(username=WEBHOOK_USERNAME).first()
+    if user is None:
+        user = User(username=WEBHOOK_USERNAME, password=generate_password_hash(secrets.token_hex(32)))
+        db.session.add(user)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Créé au même moment par un autre webhook
+            db.session.rollback()
+            user = User.query.filter_by(username=WEBHOOK_USERNAME).one()
+    return user.id
+
+@app.route('/api/webhooks/github', methods=['POST'])
+def github_webhook():
+    """
+    Webhook GitHub 'pull_request' : la revue est calculée en arrière-plan dès l'ouverture
+    ou la mise à jour de la PR. Quand un utilisateur la demande, elle est déjà en base
+    et /api/analyze la lui copie immédiatement.
+    """
+    if not GITHUB_WEBHOOK_SECRET:
+        return jsonify({"status": "error", "message": "Webhook désactivé (GITHUB_WEBHOOK_SECRET absent)"}), 503
+
+    body = request.get_data()
+    if not verify_signature(GITHUB_WEBHOOK_SECRET, body, request.headers.get('X-Hub-Signature-256')):
+        return jsonify({"status": "error", "message": "Signature invalide"}), 401
+
+    event = request.headers.get('X-GitHub-Event')
+    if event == 'ping':
+        return jsonify({"status": "success", "message": "pong"})
+
+    try:
+        payload = json.loads(body or b'{}')
+    except ValueError:
+        return jsonify({"status": "error", "message": "Corps JSON invalide (type de contenu attendu : application/json)"}), 400
+    if not isinstance(payload, dict):
+        return jsonify({"status": "error", "message": "Corps JSON invalide"}), 400
+
+    target = parse_pull_request_event(event, payload)
+    if target is None:
+        return jsonify({"status": "ignored", "message": f"Événement {event} ignoré"})
+
+    user_id = webhook_user_id()
+    # File des revues de fond : une rafale de webhooks ne bloque pas les analyses interactives.
+    # Tout ou rien : une 503 signifie qu'aucun niveau n'a été planifié (GitHub peut renvoyer l'événement)
+    try:
+        job_ids = bulk_queue.submit_many([
+            (run_analysis, (user_id, target['owner'], target['repo'], target['pr'], level),
+             {"head_sha": target['head_sha'], "lane": "bulk"})
+            for level in WEBHOOK_LEVELS
+        ], owner_id=user_id)
+    except QueueFullError as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
+
+    print(f"🪝 Webhook : revue de {target['owner']}/{target['repo']}#{target['pr']} ({target['head_sha'][:7]}) planifiée")
+    return jsonify({"status": "accepted", "job_ids": job_ids}), 202
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    job = analysis_queue.get(job_id)
+    if not job or job['owner_id'] != session['user_id']:
+        return jsonify({"status": "error", "message": "Analyse introuvable"}), 404
+
+    if job['state'] == 'success':
+        return jsonify({"status": "success", "state": job['state'], **job['result']})
+    if job['state'] == 'error':
+        return jsonify({"status": "error", "state": job['state'], "message": job['error']})
+
+    return jsonify({"status": "pending", "state": job['state'], "partial": job['partial']})
+
+@app.route('/api/jobs/<job_id>/stream')
+def job_stream(job_id):
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    job = analysis_queue.get(job_id)
+    if not job or job['owner_id'] != session['user_id']:
+        return jsonify({"status": "error", "message": "Analyse introuvable"}), 404
+
+    # Le worker produit les tokens, on ne fait que les relayer au navigateur
+    def generate():
+        for event, payload in analysis_queue.follow(job_id):
+            if event == "token":
+                yield sse_event("token", {"text": payload})
+            elif event == "ping":
+                yield ": ping\n\n"
+            elif payload['state'] == 'success':
+                yield sse_event("done", payload['result'])
+            else:
+                yield sse_event("error", {"message": payload['error']})
+
+    return Response(generate(), mimetype="text/event-stream", headers=SSE_HEADERS)
+
+def chat_context(review):
+    """
+    Les messages de contexte d'une discussion (consigne, diff, rapport), reconstruits côté serveur.
+    """
+    pull_diff = load_pull_diff(review)
+    if pull_diff is not None:
+        diff_text = pull_diff_text(pull_diff)
+    else:
+        repo_owner, repo_name = review.repo_name.split('/', 1)
+        with metrics.span("github_fetch"):
+            diff_text = github_client.get_pr_diff(repo_owner, repo_name, review.pr_number)
+    if DIFF_FILTER_ENABLED:
+        diff_text, _ = filter_diff(diff_text, DIFF_SKIP_GLOBS, DIFF_MAX_FILE_TOKENS)
+    return context_messages(diff_text, review.ai_result, CHAT_DIFF_TOKENS)
+
+def prepare_chat(review, message):
+    """
+    Construit les messages à envoyer pour un tour de chat, dans le budget de tokens :
+    les échanges qui sortent de la fenêtre sont ajoutés au résumé de la discussion.
+    """
+    summary_seq = review.chat_summary_count or 0
+    # Seuls les messages pas encore résumés sont lus (index review_id, seq)
+    pending = ChatMessage.query.filter(
+        ChatMessage.review_id == review.id, ChatMessage.seq > summary_seq
+    ).order_by(ChatMessage.seq).all()
+    turns = [{"role": m.role, "content": m.content} for m in pending]
+
+    to_fold, window = split_window(turns, CHAT_KEEP_LAST, CHAT_CONTEXT_TOKENS)
+    if to_fold:
+        review.chat_summary = summarize_chat(review.chat_summary, to_fold)
+        review.chat_summary_count = pending[len(to_fold) - 1].seq
+        with metrics.span("db_commit"):
+            db.session.commit()
+
+    return build_messages(chat_context(review), review.chat_summary, window, message)
+
+def save_chat_turn(review, message, reply, usage, latency):
+    """
+    Ajoute la question et la réponse à la discussion (deux insertions, rien n'est réécrit).
+    La réponse garde les tokens facturés du tour (usage) et sa durée en secondes.
+    Deux tours simultanés sur la même revue peuvent prendre le même numéro (seq) :
+    l'index unique refuse le second, qui recommence avec les numéros suivants.
+    """
+    review_id = review.id
+    for attempt in range(CHAT_SAVE_RETRIES):
+        last_seq = db.session.query(db.func.max(ChatMessage.seq)).filter_by(review_id=review_id).scalar() or 0
+        db.session.add(ChatMessage(
+            review_id=review_id, seq=last_seq + 1, role="user", content=message, tokens=estimate_tokens(message)
+        ))
+        db.session.add(ChatMessage(
+            review_id=review_id, seq=last_seq + 2, role="assistant", content=reply, tokens=estimate_tokens(reply),
+            prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens,
+            latency_ms=int(latency * 1000)
+        ))
+        try:
+            with metrics.span("db_commit"):
+                db.session.commit()
+            return
+        except IntegrityError:
+            db.session.rollback()
+            if attempt == CHAT_SAVE_RETRIES - 1:
+                raise
+
+def get_chat_request():
+    """
+    Lit une requête de chat : le navigateur n'envoie que la revue concernée et le nouveau message.
+    Retourne (revue, message, réponse d'erreur).
+    """
+    data = request.json or {}
+    message = (data.get('message') or '').strip()
+    if not message:
+        return None, None, (jsonify({"status": "error", "message": "Message vide"}), 400)
+
+    review = db.session.get(Review, data.get('review_id')) if data.get('review_id') else None
+    if not review or review.user_id != session['user_id']:
+        return None, None, (jsonify({"status": "error", "message": "Revue introuvable"}), 404)
+
+    return review, message, None
+
+@app.route('/api/reviews/<int:review_id>/messages')
+def chat_messages(review_id):
+    """
+    Historique paginé d'une discussion, du plus récent au plus ancien :
+    ?before=<seq> donne la page précédente, ?limit=<n> sa taille (50 par défaut).
+    """
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    review = db.session.get(Review, review_id)
+    if not review or review.user_id != session['user_id']:
+        return jsonify({"status": "error", "message": "Revue introuvable"}), 404
+
+    limit = min(request.args.get('limit', 50, type=int), 200)
+    query = ChatMessage.query.filter_by(review_id=review_id)
+    before = request.args.get('before', type=int)
+    if before:
+        query = query.filter(ChatMessage.seq < before)
+    page = query.order_by(ChatMessage.seq.desc()).limit(limit).all()
+
+    messages = [m.to_dict() for m in reversed(page)]
+    return jsonify({
+        "status": "success",
+        "messages": messages,
+        "next_before": messages[0]["seq"] if len(page) == limit else None,
+    })
+
+@app.route('/api/status')
+def service_status():
+    """Charge du service : files d'analyses et ordonnanceur des appels à l'IA (attente p50 / p95)."""
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    return jsonify({
+        "status": "success",
+        "analysis_queue": analysis_queue.stats(),
+        "bulk_queue": bulk_queue.stats(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "models": model_router.stats(),
+    })
+
+# Adresses acceptées par /metrics quand METRICS_TOKEN n'est pas défini
+LOCAL_ADDRESSES = ("127.0.0.1", "::1")
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """
+    Métriques au format Prometheus : durée des requêtes par route, étapes (GitHub, IA, base),
+    appels et tokens par modèle. Protégé par METRICS_TOKEN (Authorization: Bearer) s'il est défini,
+    sinon réservé aux requêtes locales (127.0.0.1, ::1).
+    """
+    if not METRICS_TOKEN:
+        if request.remote_addr not in LOCAL_ADDRESSES:
+            return jsonify({"status": "error", "message": "Accès réservé à la machine locale (définir METRICS_TOKEN)"}), 403
+    elif not secrets.compare_digest(
+        request.headers.get('Authorization', ''), f"Bearer {METRICS_TOKEN}"
+    ):
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 @app.route('/api/chat', methods=['POST'])
 def chat_api():
     if 'user_id' not in session:
         return jsonify({"status": "error", "message": "Non autorisé"}), 401
     
-    data = request.json
-    messages = data.get('messages', [])
-    review_id = data.get('review_id')
+    review, message, error = get_chat_request()
+    if error:
+        return error
     
     try:
-        reply = chat_with_ia(messages)
-        
-        if review_id:
-            review = Review.query.get(review_id)
-            if review and review.user_id == session['user_id']:
-                messages_to_save = messages + [{"role": "assistant", "content": reply}]
-                review.chat_history = json.dumps(messages_to_save)
-                db.session.commit()
-        
+        # Le chat passe par la file prioritaire de l'ordonnanceur IA
+        started = time.perf_counter()
+        with llm_scheduler.acting_as(session['user_id'], "chat"), track_usage() as usage:
+            reply = chat_with_ia(prepare_chat(review, message))
+        save_chat_turn(review, message, reply, usage, time.perf_counter() - started)
         return jsonify({"status": "success", "reply": reply})
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 400
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream_api():
+    if 'user_id' not in session:
+        return jsonify({"status": "error", "message": "Non autorisé"}), 401
+
+    review, message, error = get_chat_request()
+    if error:
+        return error
+
+    user_id = session['user_id']
+
+    def generate():
+        parts = []
+        started = time.perf_counter()
+        try:
+            with llm_scheduler.acting_as(user_id, "chat"), track_usage() as usage:
+                for text in stream_chat_with_ia(prepare_chat(review, message)):
+                    parts.append(text)
+                    yield sse_event("token", {"text": text})
+        except Exception as e:
+            yield sse_event("error", {"message": str(e)})
+            return
+
+        # Réponse complète : on la sauvegarde comme pour /api/chat
+        reply = "".join(parts)
+        save_chat_turn(review, message, reply, usage, time.perf_counter() - started)
+
+        yield sse_event("done", {"reply": reply})
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream", headers=SSE_HEADERS)
+
+@app.cli.command('bulk-review')
+@click.argument('repository')
+@click.option('--level', default='senior', type=click.Choice(REVIEW_LEVELS))
+@click.option('--user', 'username', default=None, help="Compte propriétaire des revues (par défaut : compte technique)")
+@click.option('--force', is_flag=True, help="Relancer même les PR déjà relues à ce commit")
+def bulk_review_command(repository, level, username, force):
+    """Relit toutes les PR ouvertes de REPOSITORY (owner/repo), par exemple chaque matin."""
+    repo_owner, _, repo_name = repository.partition('/')
+    if not is_valid_name(repo_owner) or not is_valid_name(repo_name):
+        raise click.BadParameter("format attendu : owner/repo", param_hint="REPOSITORY")
+
+    if username:
+        user = User.query.filter_by(username=username).first()
+        if user is None:
+            raise click.ClickException(f"Utilisateur inconnu : {username}")
+        user_id = user.id
+    else:
+        user_id = webhook_user_id()
+
+    try:
+        run = start_bulk_review(user_id, repo_owner, repo_name, level, force=force)
+    except Exception as e:
+        raise click.ClickException(str(e))
+    while True:
+        progress = run.progress(bulk_queue)
+        counts = progress["counts"]
+        click.echo(f"⏳ {progress['done']}/{progress['total']} PR terminées "
+                   f"({counts['running']} en cours, {counts['error']} en erreur) - {progress['elapsed']} s")
+        if progress["done"] == progress["total"]:
+            break
+        time.sleep(5)
+
+    for item in progress["pulls"]:
+        if item["state"] == "success":
+            origin = "réutilisée" if item["cached"] else "nouvelle"
+            click.echo(f"✅ PR #{item['pr']} : revue #{item['review_id']} ({origin})")
+        else:
+            click.echo(f"❌ PR #{item['pr']} : {item['error']}")
+
 if __name__ == '__main__':
     print("Serveur en cours de démarrage sur http://127.0.0.1:5000")
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,264 @@
+"""
+Test de charge de l'application : débit et latences p50 / p95 / p99 de /api/analyze
+(jusqu'à la fin de l'analyse), /api/chat et /historique, à concurrence croissante.
+
+Tout en local (GitHub et OpenRouter simulés, base SQLite temporaire) :
+    python scripts/load_test.py --spawn --concurrency 1,4,16 --requests 40
+
+Contre un serveur déjà lancé (voir scripts/mock_services.py) :
+    python scripts/load_test.py --url http://127.0.0.1:5000 --scenarios chat,historique
+"""
+import argparse
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("analyze", "chat", "historique")
+
+
+class LoadUser:
+    """Un utilisateur de test : sa session HTTP et la revue sur laquelle il discute."""
+
+    def __init__(self, base_url, username, password="load-test"):
+        self.base_url = base_url
+        self.username = username
+        self.session = requests.Session()
+        self.review_id = None
+
+        self.session.post(f"{base_url}/register", data={"username": username, "password": password})
+        self.session.post(f"{base_url}/login", data={"username": username, "password": password})
+        if "session" not in self.session.cookies:
+            raise RuntimeError(f"Connexion impossible pour {username}")
+
+    def analyze(self, pr_number, poll_interval=0.05, timeout=600):
+        """Lance une analyse et attend la fin du job. Retourne l'id de la revue."""
+        response = self.session.post(f"{self.base_url}/api/analyze", json={
+            "owner": "load", "repo": "test", "pr": pr_number, "level": "senior",
+        })
+        if response.status_code != 202:
+            raise RuntimeError(f"/api/analyze : {response.status_code} {response.text[:200]}")
+
+        job_id = response.json()["job_id"]
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            response = self.session.get(f"{self.base_url}/api/jobs/{job_id}")
+            if response.status_code != 200:
+                raise RuntimeError(f"/api/jobs : {response.status_code} {response.text[:200]}")
+            job = response.json()
+            if job["state"] == "success":
+                return job["review_id"]
+            if job["state"] == "error":
+                raise RuntimeError(f"analyse en erreur : {job.get('message')}")
+            time.sleep(poll_interval)
+        raise RuntimeError("analyse trop longue")
+
+    def chat(self, message):
+        response = self.session.post(f"{self.base_url}/api/chat", json={
+            "review_id": self.review_id, "message": message,
+        })
+        if response.status_code != 200:
+            raise RuntimeError(f"/api/chat : {response.status_code} {response.text[:200]}")
+
+    def historique(self):
+        response = self.session.get(f"{self.base_url}/historique")
+        if response.status_code != 200:
+            raise RuntimeError(f"/historique : {response.status_code}")
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def run_level(users, scenario, concurrency, total, pr_numbers):
+    """Envoie 'total' requêtes avec 'concurrency' utilisateurs en parallèle."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    remaining = itertools.count()
+
+    def worker(user):
+        while next(remaining) < total:
+            started = time.perf_counter()
+            try:
+                if scenario == "analyze":
+                    user.analyze(next(pr_numbers))
+                elif scenario == "chat":
+                    user.chat("Peux-tu détailler le point de sécurité ?")
+                else:
+                    user.historique()
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, users[:concurrency]))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": len(latencies) + len(errors),
+        "errors": len(errors),
+        "throughput": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def print_table(results):
+    print()
+    print(f"{'scénario':<12}{'concurrence':>12}{'requêtes':>10}{'erreurs':>9}{'req/s':>9}"
+          f"{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}")
+    for r in results:
+        print(f"{r['scenario']:<12}{r['concurrency']:>12}{r['requests']:>10}{r['errors']:>9}{r['throughput']:>9}"
+              f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}")
+    for r in results:
+        if r["first_error"]:
+            print(f"❌ {r['scenario']} x{r['concurrency']} : {r['first_error']}")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} ne répond pas")
+
+
+def spawn_services(args, workdir):
+    """Lance les serveurs simulés et l'application (SQLite temporaire). Retourne (url, processus)."""
+    mock_port, app_port = free_port(), free_port()
+    mock_url = f"http://127.0.0.1:{mock_port}"
+    mock = subprocess.Popen([
+        sys.executable, os.path.join(PROJECT_DIR, "scripts", "mock_services.py"), "--quiet",
+        "--port", str(mock_port),
+        "--github-latency", str(args.github_latency),
+        "--llm-latency", str(args.llm_latency),
+        "--token-delay", str(args.token_delay),
+        "--tokens", str(args.tokens),
+    ])
+
+    env = dict(os.environ)
+    env.update({
+        "API_KEY": env.get("API_KEY") or "load-test",
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'load_test.db')}",
+        "GITHUB_API_URL": mock_url,
+        "OPENROUTER_BASE_URL": f"{mock_url}/v1",
+        "GITHUB_TOKEN": "",
+        "GITHUB_CACHE_DIR": os.path.join(workdir, "github-cache"),
+        "ANALYSIS_MAX_PENDING": str(max(1000, args.requests * 2)),
+        "LLM_MODELS": "mock/model",
+    })
+    app = subprocess.Popen(
+        [sys.executable, "-m", "flask", "--app", "app", "run", "--port", str(app_port), "--with-threads"],
+        cwd=PROJECT_DIR, env=env,
+        stdout=None if args.verbose else subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL,
+    )
+
+    url = f"http://127.0.0.1:{app_port}"
+    try:
+        wait_for(f"{mock_url}/repos/load/test/pulls/1")
+        wait_for(f"{url}/login")
+    except Exception:
+        for process in (app, mock):
+            process.terminate()
+        raise
+    return url, [app, mock]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge de l'application de revue de code.")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="Application déjà lancée (ignoré avec --spawn)")
+    parser.add_argument("--spawn", action="store_true", help="Lancer les serveurs simulés et l'application sur SQLite")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="analyze, chat, historique")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="Niveaux de concurrence, séparés par des virgules")
+    parser.add_argument("--requests", type=int, default=40, help="Requêtes par scénario et par niveau")
+    parser.add_argument("--json", help="Fichier où écrire les résultats")
+    parser.add_argument("--verbose", action="store_true", help="Afficher les logs de l'application lancée")
+    # Réglages des serveurs simulés (avec --spawn)
+    parser.add_argument("--github-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--tokens", type=int, default=200)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Scénario inconnu : {', '.join(sorted(unknown))}")
+    levels = sorted({int(c) for c in args.concurrency.split(",") if c.strip()})
+
+    processes = []
+    with tempfile.TemporaryDirectory(prefix="reviewer-load-") as workdir:
+        try:
+            url = args.url
+            if args.spawn:
+                url, processes = spawn_services(args, workdir)
+                print(f"🧪 Application lancée sur {url} (SQLite : {workdir})")
+
+            # Un compte par client simultané : les quotas de l'ordonnanceur IA sont par utilisateur
+            run_id = int(time.time())
+            users = [LoadUser(url, f"load-{run_id}-{i}") for i in range(max(levels))]
+            # Chaque analyse porte sur une nouvelle PR : pas de revue réutilisée depuis le cache
+            pr_numbers = itertools.count(run_id % 100000 * 1000)
+
+            if "chat" in scenarios or "historique" in scenarios:
+                print(f"⏳ Préparation : une revue par utilisateur ({len(users)})")
+                with ThreadPoolExecutor(max_workers=min(8, len(users))) as pool:
+                    review_ids = list(pool.map(lambda u: u.analyze(next(pr_numbers)), users))
+                for user, review_id in zip(users, review_ids):
+                    user.review_id = review_id
+
+            results = []
+            for scenario in scenarios:
+                for concurrency in levels:
+                    result = run_level(users, scenario, concurrency, args.requests, pr_numbers)
+                    print(f"📊 {scenario} x{concurrency} : {result['throughput']} req/s, "
+                          f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms")
+                    results.append(result)
+
+            print_table(results)
+            if args.json:
+                with open(args.json, "w", encoding="utf-8") as f:
+                    json.dump(results, f, indent=2, ensure_ascii=False)
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Serveurs simulés pour les tests de charge : l'API GitHub (PR, diffs, comparaisons)
+et une API de chat compatible OpenAI / OpenRouter (réponses complètes ou streamées).
+Aucun appel réseau sortant : la latence et la longueur des réponses sont réglables.
+
+Exemple :
+    python scripts/mock_services.py --port 8001 --llm-latency 0.5 --token-delay 0.01
+puis lancer l'application avec :
+    GITHUB_API_URL=http://127.0.0.1:8001 OPENROUTER_BASE_URL=http://127.0.0.1:8001/v1
+"""
+import argparse
+import hashlib
+import json
+import re
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PULL_PATH = re.compile(r"^/repos/([^/]+)/([^/]+)/pulls/(\d+)$")
+PULLS_PATH = re.compile(r"^/repos/([^/]+)/([^/]+)/pulls$")
+COMPARE_PATH = re.compile(r"^/repos/([^/]+)/([^/]+)/compare/([0-9a-f]+)\.\.\.([0-9a-f]+)$")
+CHAT_PATHS = ("/v1/chat/completions", "/chat/completions", "/api/v1/chat/completions")
+
+# Contenu d'une réponse d'IA simulée, répété jusqu'au nombre de tokens demandé
+REPORT_WORDS = (
+    "### Rapport de revue\n\n- **Lisibilité** : la fonction modifiée pourrait être découpée. "
+    "- **Sécurité** : aucune entrée utilisateur n'est validée avant usage. "
+    "- **Performance** : la boucle refait le même calcul à chaque tour. "
+).split(" ")
+
+
+def head_sha(owner, repo, number):
+    """SHA de tête stable pour une PR donnée (une nouvelle PR = un nouveau diff)."""
+    return hashlib.sha1(f"{owner}/{repo}#{number}".encode("utf-8")).hexdigest()
+
+
+def build_diff(seed, files, lines):
+    """Diff unifié de 'files' fichiers Python, 'lines' lignes ajoutées par fichier."""
+    parts = []
+    for i in range(files):
+        path = f"src/module_{i}.py"
+        body = "".join(f"+    value_{n} = compute('{seed}', {n})  # ligne {n}\n" for n in range(lines))
+        parts.append(
+            f"diff --git a/{path} b/{path}\n"
+            f"index 0000000..1111111 100644\n"
+            f"--- a/{path}\n"
+            f"+++ b/{path}\n"
+            f"@@ -1,1 +1,{lines + 1} @@\n"
+            f" def handler():\n{body}"
+        )
+    return "".join(parts)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    options = None
+
+    def do_GET(self):
+        time.sleep(self.options.github_latency)
+        path, _, _ = self.path.partition("?")
+        wants_diff = "diff" in self.headers.get("Accept", "")
+
+        match = PULL_PATH.match(path)
+        if match:
+            owner, repo, number = match.group(1), match.group(2), int(match.group(3))
+            if wants_diff:
+                return self._send_text(build_diff(f"{owner}/{repo}#{number}", self.options.diff_files, self.options.diff_lines))
+            return self._send_json(self._pull(owner, repo, number))
+
+        match = PULLS_PATH.match(path)
+        if match:
+            owner, repo = match.groups()
+            return self._send_json([self._pull(owner, repo, n) for n in range(1, self.options.open_pulls + 1)])
+
+        match = COMPARE_PATH.match(path)
+        if match:
+            return self._send_text(build_diff(match.group(4), max(1, self.options.diff_files // 2), self.options.diff_lines))
+
+        self._send_json({"message": "Not Found"}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path not in CHAT_PATHS:
+            return self._send_json({"error": {"message": "Not Found"}}, status=404)
+
+        # Latence avant le premier token (file d'attente du fournisseur, lecture du prompt)
+        time.sleep(self.options.llm_latency)
+        tokens = min(self.options.tokens, body.get("max_tokens") or self.options.tokens)
+        words = [REPORT_WORDS[i % len(REPORT_WORDS)] + " " for i in range(tokens)]
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": tokens, "total_tokens": prompt_tokens + tokens}
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        model = body.get("model", "mock")
+
+        if not body.get("stream"):
+            time.sleep(self.options.token_delay * tokens)
+            return self._send_json({
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(words)}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        # Streaming SSE : un morceau par token, puis l'usage si demandé, puis [DONE]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+        try:
+            for word in words:
+                time.sleep(self.options.token_delay)
+                self._send_event({**chunk, "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]})
+            self._send_event({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            if (body.get("stream_options") or {}).get("include_usage"):
+                self._send_event({**chunk, "choices": [], "usage": usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _pull(self, owner, repo, number):
+        return {
+            "number": number,
+            "title": f"PR simulée #{number}",
+            "state": "open",
+            "draft": False,
+            "head": {"sha": head_sha(owner, repo, number)},
+            "base": {"sha": head_sha(owner, repo, 0)},
+        }
+
+    def _send_json(self, data, status=200):
+        self._send(json.dumps(data).encode("utf-8"), "application/json", status)
+
+    def _send_text(self, text):
+        self._send(text.encode("utf-8"), "text/plain; charset=utf-8", 200)
+
+    def _send(self, payload, content_type, status):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        # En-têtes de quota GitHub : le client ne doit jamais se mettre en pause
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", "5000")
+        self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_event(self, data):
+        self.wfile.write(f"data: {json.dumps(data)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        if not self.options.quiet:
+            super().log_message(format, *args)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="API GitHub et OpenRouter simulées pour les tests de charge.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--github-latency", type=float, default=0.05, help="Latence de chaque appel GitHub (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Latence avant le premier token (s)")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Délai entre deux tokens (s)")
+    parser.add_argument("--tokens", type=int, default=200, help="Tokens par réponse (borné par max_tokens)")
+    parser.add_argument("--diff-files", type=int, default=5, help="Fichiers par diff de PR")
+    parser.add_argument("--diff-lines", type=int, default=40, help="Lignes ajoutées par fichier")
+    parser.add_argument("--open-pulls", type=int, default=20, help="PR ouvertes listées par dépôt")
+    parser.add_argument("--quiet", action="store_true", help="Ne pas afficher chaque requête")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    MockHandler.options = options
+    server = ThreadingHTTPServer((options.host, options.port), MockHandler)
+    server.daemon_threads = True
+    print(f"🧪 GitHub et OpenRouter simulés sur http://{options.host}:{options.port} "
+          f"(IA : {options.llm_latency}s + {options.tokens} x {options.token_delay}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Simule GitHub en local : envoie un webhook 'pull_request' signé au serveur Flask.
+
+Exemples (serveur lancé avec GITHUB_WEBHOOK_SECRET=secret) :
+    python scripts/send_webhook.py --secret secret --owner pallets --repo flask --pr 5000
+    python scripts/send_webhook.py --secret secret --event ping
+    python scripts/send_webhook.py --secret secret --action synchronize --sha <nouveau_sha> ...
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import uuid
+
+import requests
+
+
+def build_payload(action, owner, repo, pr, sha):
+    """Payload minimal d'un événement 'pull_request' (mêmes champs que GitHub)."""
+    return {
+        "action": action,
+        "number": pr,
+        "pull_request": {
+            "number": pr,
+            "draft": False,
+            "state": "open",
+            "head": {"sha": sha},
+        },
+        "repository": {
+            "name": repo,
+            "full_name": f"{owner}/{repo}",
+            "owner": {"login": owner},
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Envoie un webhook GitHub signé au serveur local.")
+    parser.add_argument("--url", default="http://127.0.0.1:5000/api/webhooks/github")
+    parser.add_argument("--secret", default=os.getenv("GITHUB_WEBHOOK_SECRET"), help="Secret partagé du webhook")
+    parser.add_argument("--event", default="pull_request", help="pull_request ou ping")
+    parser.add_argument("--action", default="opened", help="opened, synchronize, reopened, closed...")
+    parser.add_argument("--owner", default="pallets")
+    parser.add_argument("--repo", default="flask")
+    parser.add_argument("--pr", type=int, default=5000)
+    parser.add_argument("--sha", help="SHA du commit de tête (par défaut : celui renvoyé par l'API GitHub)")
+    args = parser.parse_args()
+
+    if not args.secret:
+        parser.error("secret manquant (--secret ou GITHUB_WEBHOOK_SECRET)")
+
+    sha = args.sha
+    if args.event == "pull_request" and not sha:
+        url = f"https://api.github.com/repos/{args.owner}/{args.repo}/pulls/{args.pr}"
+        sha = requests.get(url, timeout=30).json()["head"]["sha"]
+
+    payload = {"zen": "Keep it logically awesome."} if args.event == "ping" else \
+        build_payload(args.action, args.owner, args.repo, args.pr, sha)
+    body = json.dumps(payload).encode("utf-8")
+    signature = "sha256=" + hmac.new(args.secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+    response = requests.post(args.url, data=body, timeout=30, headers={
+        "Content-Type": "application/json",
+        "X-GitHub-Event": args.event,
+        "X-GitHub-Delivery": str(uuid.uuid4()),
+        "X-Hub-Signature-256": signature,
+    })
+    print(f"{response.status_code} {response.text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,104 @@
-from openai import OpenAI
-from src.config import API_KEY
+import contextvars
+import queue
+import random
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-# On garde le base_url d'OpenRouter
+from openai import OpenAI, APIConnectionError, RateLimitError, InternalServerError
+from src.config import (
+    API_KEY, OPENROUTER_BASE_URL, REVIEW_BATCH_TOKENS, REVIEW_CONCURRENCY,
+    LLM_MAX_CONCURRENCY, LLM_USER_MAX_CONCURRENCY, LLM_BULK_MAX_CONCURRENCY,
+    LLM_MODELS, LLM_TIMEOUT, LLM_RETRIES, LLM_RETRY_BACKOFF, LLM_HEDGE
+)
+from src.diff_splitter import parse_diff, pack_batches, estimate_tokens
+from src.chat_context import truncate_to_tokens
+from src.pre_analysis import format_findings
+from src.llm_scheduler import FairScheduler
+from src.model_router import ModelRouter
+from src.metrics import metrics, record_llm_call
+
+# On garde le base_url d'OpenRouter (les nouvelles tentatives sont gérées ici, modèle par modèle)
 client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=API_KEY
+    base_url=OPENROUTER_BASE_URL,
+    api_key=API_KEY,
+    max_retries=0
+)
+
+# Modèle principal (préféré par le cache). Une revue enregistre le modèle qui l'a réellement produite
+MODEL = LLM_MODELS[0]
+
+# Latence et erreurs de chaque modèle configuré, pour choisir le plus rapide en bonne santé
+model_router = ModelRouter(LLM_MODELS)
+
+# Threads des appels doublés par une requête de secours (LLM_HEDGE) et des flux lus en arrière-plan
+# (les threads en trop attendent une place de l'ordonnanceur, qui borne les appels simultanés)
+_hedge_pool = ThreadPoolExecutor(max_workers=4 * LLM_MAX_CONCURRENCY)
+
+# Admission des appels à OpenRouter pour toute l'application : quotas par utilisateur,
+# partage équitable, chat prioritaire sur les analyses et les revues groupées
+llm_scheduler = FairScheduler(
+    max_concurrency=LLM_MAX_CONCURRENCY,
+    per_user_limit=LLM_USER_MAX_CONCURRENCY,
+    bulk_limit=LLM_BULK_MAX_CONCURRENCY
 )
 
-def review_code(diff_text, level="senior"):
+# Niveaux de revue proposés (ton et longueur du rapport, voir _level_instructions)
+REVIEW_LEVELS = ("junior", "senior")
+
+# Taille max (en tokens estimés) de la revue précédente donnée en contexte d'une revue incrémentale
+PREVIOUS_REVIEW_TOKENS = 2000
+
+def review_code(diff_text, level="senior", on_token=None, previous_review=None, local_findings=None):
     """
     Envoie le diff de code à l'IA avec un ton adapté au niveau choisi.
+    Si on_token est fourni, la réponse est streamée et chaque morceau de texte lui est transmis.
+    Un gros diff est découpé en lots (par fichier / hunk) analysés en parallèle,
+    puis une dernière passe fusionne les retours en un seul rapport.
+    Avec previous_review (revue incrémentale), le diff ne contient que les nouveaux commits
+    et la revue précédente est donnée en contexte.
+    local_findings contient les constats de la pré-analyse locale, à confirmer ou écarter par l'IA.
+    Retourne (texte, modèle) : le modèle est celui qui a rédigé le rapport final (repli éventuel compris).
     """
     print(f"🧠 Analyse du code en cours (Niveau: {level.upper()})...")
 
-    # On personnalise la consigne selon le niveau choisi par l'utilisateur
+    files = parse_diff(diff_text)
+    diff_tokens = estimate_tokens(diff_text)
+    print(f"📊 Diff : {len(files)} fichier(s), {sum(len(f['hunks']) for f in files)} hunk(s), ~{diff_tokens} tokens")
+
+    try:
+        if diff_tokens <= REVIEW_BATCH_TOKENS:
+            prompt = _review_prompt(level, diff_text, previous_review, local_findings)
+            print(f"📡 Appel à l'API via OpenRouter avec le modèle {MODEL}...")
+            print(f"📊 Taille du prompt: {len(prompt)} caractères")
+            return _complete(_review_messages(prompt), max_tokens=4096, on_token=on_token)
+
+        batches = pack_batches(files, REVIEW_BATCH_TOKENS)
+        print(f"✂️ Diff trop long : {len(batches)} lots analysés en parallèle ({REVIEW_CONCURRENCY} max)")
+
+        # La durée totale dépend du lot le plus lent, pas de la taille du diff.
+        # Chaque lot reprend le contexte de la demande : utilisateur pour l'ordonnanceur, compteur de tokens
+        with ThreadPoolExecutor(max_workers=REVIEW_CONCURRENCY, thread_name_prefix="review-batch") as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, _review_batch, level, i, len(batches), batch)
+                for i, batch in enumerate(batches, 1)
+            ]
+            partial_reviews = [future.result()[0] for future in futures]
+
+        print(f"🧩 Fusion de {len(partial_reviews)} analyses partielles...")
+        prompt = _merge_prompt(level, partial_reviews, previous_review, local_findings)
+        return _complete(_review_messages(prompt), max_tokens=4096, on_token=on_token)
+    except Exception as e:
+        error_msg = str(e)
+        print(f"❌ Erreur API: {error_msg}")
+        raise Exception(f"❌ Erreur lors de la communication avec l'IA : {error_msg}")
+
+def _level_instructions(level):
+    """
+    Consignes de ton selon le niveau choisi par l'utilisateur.
+    """
     if level == "junior":
-        consignes_niveau = """
+        return """
         Le développeur qui a écrit ce code est un profil Junior / Débutant.
         Ton ton doit être extrêmement pédagogique, bienveillant et encourageant.
         
@@ -27,19 +110,50 @@ def review_code(diff_text, level="senior"):
         - DÉCOMPOSE : Explique ton raisonnement étape par étape de manière très explicite.
         N'hésite pas à être prolixe et à faire une réponse très longue pour t'assurer que le débutant comprenne chaque notion de A à Z.
         """
-    else:
-        consignes_niveau = """
+    return """
         Le développeur qui a écrit ce code est un profil Senior / Expert.
         Ton ton doit être direct, concis et purement technique.
         Va droit au but. Ne fais aucune pédagogie sur les concepts de base. Concentre-toi uniquement sur l'architecture, l'optimisation algorithmique avancée, les failles de sécurité critiques et les subtilités du langage.
         """
 
-    # On intègre ces consignes dans le Prompt principal
-    prompt = f"""
+def _previous_review_context(previous_review):
+    """
+    Contexte d'une revue incrémentale : la revue précédente (tronquée) et la consigne
+    de ne commenter que les nouveaux commits.
+    """
+    if not previous_review:
+        return ""
+    return f"""
+    IMPORTANT : cette Pull Request a déjà été relue. Le diff ci-dessous ne contient QUE les commits
+    ajoutés depuis. Concentre-toi sur ces nouveaux changements, indique si les problèmes signalés
+    dans la revue précédente sont corrigés, et ne répète pas les remarques encore valables.
+
+    Revue précédente :
+    {truncate_to_tokens(previous_review, PREVIOUS_REVIEW_TOKENS)}
+    """
+
+def _local_findings_context(local_findings):
+    """
+    Constats de la pré-analyse locale (expressions régulières, AST) : l'IA les vérifie
+    au lieu de chercher elle-même ces problèmes évidents.
+    """
+    if not local_findings:
+        return ""
+    return f"""
+    Une pré-analyse automatique (sans IA) a relevé ces points sur les lignes ajoutées.
+    Vérifie-les : reprends ceux qui sont réels dans ton rapport avec une correction, ignore les faux positifs.
+    {format_findings(local_findings)}
+    """
+
+def _review_prompt(level, diff_text, previous_review=None, local_findings=None):
+    # On intègre les consignes du niveau dans le Prompt principal
+    return f"""
     Tu es un expert en revue de code (Code Review).
     Ton objectif est d'analyser le diff git suivant et de fournir des retours.
 
-    {consignes_niveau}
+    {_level_instructions(level)}
+    {_previous_review_context(previous_review)}
+    {_local_findings_context(local_findings)}
 
     Voici tes missions générales :
     1. Résumer brièvement ce que fait cette modification.
@@ -54,27 +168,176 @@ def review_code(diff_text, level="senior"):
     ```
     """
 
-    try:
-        print(f"📡 Appel à l'API via OpenRouter avec le modèle anthropic/claude-3.5-sonnet...")
-        print(f"📊 Taille du prompt: {len(prompt)} caractères")
-
-        response = client.chat.completions.create(
-            model="anthropic/claude-3.5-sonnet",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "Tu es un expert en revue de code. Tu dois IMPÉRATIVEMENT structurer toute ta réponse avec du Markdown valide (utilise des ### pour chaque catégorie de tes suggestions)."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=4096
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        error_msg = str(e)
-        print(f"❌ Erreur API: {error_msg}")
-        raise Exception(f"❌ Erreur lors de la communication avec l'IA : {error_msg}")
+def _merge_prompt(level, partial_reviews, previous_review=None, local_findings=None):
+    parts = "\n\n".join(
+        f"--- Analyse de la partie {i}/{len(partial_reviews)} ---\n{review}"
+        for i, review in enumerate(partial_reviews, 1)
+    )
+    return f"""
+    Tu es un expert en revue de code (Code Review).
+    Une Pull Request trop longue a été découpée en plusieurs parties analysées séparément.
+    Fusionne ces analyses partielles en UN SEUL rapport cohérent.
+
+    {_level_instructions(level)}
+    {_previous_review_context(previous_review)}
+    {_local_findings_context(local_findings)}
+
+    Voici tes missions :
+    1. Résumer brièvement ce que fait l'ensemble de la modification.
+    2. Regrouper les bugs potentiels et failles de sécurité (en supprimant les doublons et en citant les fichiers).
+    3. Regrouper les suggestions d'améliorations avec du code.
+
+    Utilise le format Markdown pour ta réponse.
+
+    Voici les analyses partielles :
+    {parts}
+    """
+
+def _review_batch(level, index, total, batch):
+    """
+    Analyse une partie du diff (appelé en parallèle pour chaque lot).
+    """
+    print(f"📡 Lot {index}/{total} : ~{estimate_tokens(batch)} tokens")
+    prompt = f"""
+    Tu es un expert en revue de code (Code Review).
+    Tu analyses la partie {index}/{total} d'une Pull Request plus grande : les autres parties sont analysées séparément.
+    Liste uniquement, de façon concise, les bugs potentiels, failles de sécurité et améliorations trouvés dans cette partie,
+    en citant le fichier concerné et avec du code si nécessaire. Pas d'introduction ni de conclusion.
+    Niveau du développeur : {"Junior" if level == "junior" else "Senior"}.
+
+    Voici le diff à analyser :
+    ```diff
+    {batch}
+    ```
+    """
+    return _complete(_review_messages(prompt), max_tokens=1500)
+
+def _review_messages(prompt):
+    return [
+        {
+            "role": "system", 
+            "content": "Tu es un expert en revue de code. Tu dois IMPÉRATIVEMENT structurer toute ta réponse avec du Markdown valide (utilise des ### pour chaque catégorie de tes suggestions)."
+        },
+        {"role": "user", "content": prompt}
+    ]
+
+def _complete(messages, max_tokens, on_token=None):
+    """
+    Appelle l'API et retourne (texte complet, modèle qui a répondu). Le texte est streamé vers on_token si fourni.
+    """
+    if on_token:
+        call = _open_stream(messages, max_tokens)
+        parts = []
+        for text in call.texts():
+            parts.append(text)
+            on_token(text)
+        return "".join(parts), call.model
+
+    return _call_with_fallback(messages, max_tokens)
+
+def _call_with_fallback(messages, max_tokens):
+    """
+    Essaie les modèles dans l'ordre du routeur (le plus rapide en bonne santé d'abord).
+    Si tous échouent sur une erreur passagère (réseau, délai, quota, erreur serveur),
+    on recommence après une attente croissante avec une part d'aléatoire.
+    """
+    last_error = None
+    for attempt in range(LLM_RETRIES + 1):
+        if attempt:
+            delay = LLM_RETRY_BACKOFF * 2 ** (attempt - 1)
+            time.sleep(random.uniform(delay / 2, delay * 1.5))
+            print(f"🔁 Nouvelle tentative {attempt}/{LLM_RETRIES} auprès de l'IA")
+
+        transient = False
+        tried = set()
+        models = model_router.order()
+        for index, model in enumerate(models):
+            if model in tried:
+                continue
+            tried.add(model)
+            backup = next((m for m in models[index + 1:] if m not in tried), None)
+            try:
+                return _hedged_call(model, backup, messages, max_tokens, tried)
+            except Exception as e:
+                print(f"❌ Échec du modèle {model} : {e}")
+                last_error = e
+                transient = transient or _is_transient(e)
+        if not transient:
+            break
+    raise last_error
+
+def _hedged_call(model, backup, messages, max_tokens, tried):
+    """
+    Appelle un modèle. Avec LLM_HEDGE, si la réponse tarde au-delà de sa latence p90 habituelle,
+    on lance la même requête sur le modèle suivant et on garde la première réponse réussie.
+    """
+    delay = model_router.hedge_delay(model) if LLM_HEDGE and backup else None
+    if delay is None:
+        return _timed_call(model, messages, max_tokens)
+
+    answered = threading.Event()
+    primary = _submit(_timed_call, model, messages, max_tokens, answered)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    print(f"⏳ {model} dépasse sa latence p90 ({delay:.1f}s) : requête de secours sur {backup}")
+    tried.add(backup)
+    pending = {primary, _submit(_timed_call, backup, messages, max_tokens, answered)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+    return primary.result()
+
+def _timed_call(model, messages, max_tokens, answered=None):
+    """
+    Un appel à un modèle. Sa durée (hors attente d'une place) alimente le routeur et les métriques,
+    les tokens facturés (usage) sont ajoutés à la revue ou au tour de chat en cours.
+    answered est partagé par les appels d'une requête doublée : le premier qui réussit le pose
+    avant de rendre sa place, et l'autre, s'il n'est pas encore parti, lève CancelledError sans rien envoyer.
+    Retourne (texte, modèle).
+    """
+    lane = llm_scheduler.current()[1]
+    if answered is not None and answered.is_set():
+        raise CancelledError()
+    with llm_scheduler.slot(max_tokens):
+        if answered is not None and answered.is_set():
+            raise CancelledError()
+        result = _send(model, messages, max_tokens, lane)
+        if answered is not None:
+            answered.set()
+        return result
+
+def _send(model, messages, max_tokens, lane):
+    # Appelé avec une place de l'ordonnanceur
+    with metrics.span("llm_call"):
+        started = time.monotonic()
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=max_tokens,
+                timeout=LLM_TIMEOUT
+            )
+        except Exception:
+            elapsed = time.monotonic() - started
+            model_router.record(model, elapsed, False)
+            record_llm_call(model, lane, elapsed, False)
+            raise
+        elapsed = time.monotonic() - started
+        model_router.record(model, elapsed, True)
+        record_llm_call(model, lane, elapsed, True, getattr(response, "usage", None))
+    return response.choices[0].message.content, model
+
+def _submit(func, *args):
+    # Chaque thread reprend l'appelant courant (utilisateur, file) pour l'ordonnanceur
+    return _hedge_pool.submit(contextvars.copy_context().run, func, *args)
+
+def _is_transient(error):
+    return isinstance(error, (APIConnectionError, RateLimitError, InternalServerError))
 
 def chat_with_ia(messages_history):
     """
@@ -83,14 +346,218 @@ def chat_with_ia(messages_history):
     print(f"💬 Relance de l'IA pour le chat (Historique: {len(messages_history)} messages)")
     
     try:
-        response = client.chat.completions.create(
-            model="anthropic/claude-3.5-sonnet",
-            messages=messages_history,
-            temperature=0.7,
-            max_tokens=2048
-        )
-        return response.choices[0].message.content
+        return _complete(messages_history, max_tokens=2048)[0]
+    except Exception as e:
+        error_msg = str(e)
+        print(f"❌ Erreur API Chat: {error_msg}")
+        raise Exception(f"Erreur lors du chat avec l'IA : {error_msg}")
+
+def summarize_chat(previous_summary, messages):
+    """
+    Met à jour le résumé d'une discussion avec les messages qui sortent de la fenêtre de contexte.
+    """
+    print(f"📝 Résumé de {len(messages)} ancien(s) message(s) du chat")
+    conversation = "\n\n".join(f"{m['role']} : {m['content']}" for m in messages)
+    prompt = f"""
+    Voici le résumé actuel d'une discussion sur une revue de code :
+    {previous_summary or "(aucun)"}
+
+    Voici la suite de la discussion :
+    {conversation}
+
+    Rédige un nouveau résumé court (10 lignes maximum) qui conserve les questions posées,
+    les décisions prises et les points de code importants. Réponds uniquement avec le résumé.
+    """
+    try:
+        return _complete([{"role": "user", "content": prompt}], max_tokens=512)[0]
     except Exception as e:
         error_msg = str(e)
         print(f"❌ Erreur API Chat: {error_msg}")
-        raise Exception(f"Erreur lors du chat avec l'IA : {error_msg}")
\ No newline at end of file
+        raise Exception(f"Erreur lors du chat avec l'IA : {error_msg}")
+
+def stream_chat_with_ia(messages_history):
+    """
+    Version streaming de chat_with_ia : produit la réponse morceau par morceau.
+    """
+    print(f"💬 Relance de l'IA pour le chat en streaming (Historique: {len(messages_history)} messages)")
+
+    try:
+        yield from _stream_completion(messages_history, max_tokens=2048)
+    except Exception as e:
+        error_msg = str(e)
+        print(f"❌ Erreur API Chat: {error_msg}")
+        raise Exception(f"Erreur lors du chat avec l'IA : {error_msg}")
+
+def _stream_completion(messages, max_tokens):
+    """
+    Appelle l'API en mode stream et produit les morceaux de texte dès qu'ils arrivent.
+    Tant que rien n'a été envoyé, on passe au modèle suivant, on double la requête si elle tarde
+    (LLM_HEDGE) et on recommence sur erreur passagère, comme pour les appels complets.
+    Après le premier morceau, l'erreur remonte.
+    """
+    yield from _open_stream(messages, max_tokens).texts()
+
+def _open_stream(messages, max_tokens):
+    """
+    Ouvre un flux avec les mêmes replis que _call_with_fallback (ordre du routeur,
+    nouvelles tentatives avec attente croissante). Retourne le flux dont le premier morceau est arrivé.
+    """
+    last_error = None
+    for attempt in range(LLM_RETRIES + 1):
+        if attempt:
+            delay = LLM_RETRY_BACKOFF * 2 ** (attempt - 1)
+            time.sleep(random.uniform(delay / 2, delay * 1.5))
+            print(f"🔁 Nouvelle tentative {attempt}/{LLM_RETRIES} auprès de l'IA (streaming)")
+
+        transient = False
+        tried = set()
+        models = model_router.order()
+        for index, model in enumerate(models):
+            if model in tried:
+                continue
+            tried.add(model)
+            backup = next((m for m in models[index + 1:] if m not in tried), None)
+            try:
+                return _hedged_stream(model, backup, messages, max_tokens, tried)
+            except Exception as e:
+                print(f"❌ Échec du modèle {model} : {e}")
+                last_error = e
+                transient = transient or _is_transient(e)
+        if not transient:
+            break
+    raise last_error
+
+def _hedged_stream(model, backup, messages, max_tokens, tried):
+    """
+    Lance un flux. Avec LLM_HEDGE, si le premier morceau tarde au-delà de la latence p90 du modèle,
+    on lance le même flux sur le modèle suivant : le premier qui répond est gardé, l'autre est annulé.
+    """
+    delay = model_router.hedge_delay(model) if LLM_HEDGE and backup else None
+    ready = threading.Event()
+    answered = threading.Event()
+    primary = _StreamCall(model, messages, max_tokens, ready, answered)
+    # Sans délai de secours (delay None), on attend simplement le premier morceau
+    if primary.first.wait(delay):
+        return primary.check()
+
+    print(f"⏳ {model} ne répond pas après sa latence p90 ({delay:.1f}s) : flux de secours sur {backup}")
+    tried.add(backup)
+    pending = [primary, _StreamCall(backup, messages, max_tokens, ready, answered)]
+    errors = []
+    while pending:
+        ready.wait()
+        ready.clear()
+        for call in [c for c in pending if c.first.is_set()]:
+            pending.remove(call)
+            if call.error is None:
+                for other in pending:
+                    other.cancel()
+                return call
+            errors.append(call.error)
+    raise errors[0]
+
+class _StreamCall:
+    """
+    Un appel en streaming lu par un thread du pool : les morceaux passent par une file.
+    first est posé au premier morceau, à la fin du flux ou à l'erreur (error si rien n'a été reçu).
+    La place d'appel simultané est gardée jusqu'à la fin du flux. answered est partagé par les flux
+    d'une requête doublée : posé au premier morceau reçu, il évite de lancer l'autre s'il attend encore sa place.
+    """
+
+    def __init__(self, model, messages, max_tokens, ready=None, answered=None):
+        self.model = model
+        self.error = None
+        self.first = threading.Event()
+        self._ready = ready
+        self._answered = answered
+        self._chunks = queue.Queue()
+        self._cancelled = threading.Event()
+        _submit(self._run, messages, max_tokens)
+
+    def check(self):
+        """Retourne l'appel s'il a démarré, ou lève l'erreur reçue avant le premier morceau."""
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def texts(self):
+        """Morceaux de texte du flux ; une erreur en cours de flux remonte. Abandonné = annulé."""
+        try:
+            while True:
+                kind, value = self._chunks.get()
+                if kind == "token":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            self.cancel()
+
+    def _signal(self):
+        self.first.set()
+        if self._ready is not None:
+            self._ready.set()
+
+    def _run(self, messages, max_tokens):
+        lane = llm_scheduler.current()[1]
+        if self._is_unwanted():
+            return
+        with llm_scheduler.slot(max_tokens):
+            # Flux de secours perdant ou lecteur parti pendant l'attente d'une place : rien n'est envoyé
+            if self._is_unwanted():
+                return
+            self._stream(messages, max_tokens, lane)
+
+    def _is_unwanted(self):
+        return self._cancelled.is_set() or (self._answered is not None and self._answered.is_set())
+
+    def _stream(self, messages, max_tokens, lane):
+        # Appelé avec une place de l'ordonnanceur, gardée jusqu'à la fin du flux
+        sent = False
+        usage = None
+        with metrics.span("llm_call"):
+            started = time.monotonic()
+            try:
+                stream = client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    # Le dernier morceau du flux porte les tokens facturés
+                    stream_options={"include_usage": True},
+                    timeout=LLM_TIMEOUT
+                )
+                for chunk in stream:
+                    if self._cancelled.is_set():
+                        # Requête de secours perdante ou lecteur parti : on coupe la connexion
+                        getattr(stream, "close", lambda: None)()
+                        return
+                    usage = getattr(chunk, "usage", None) or usage
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content
+                    if text:
+                        sent = True
+                        if self._answered is not None:
+                            self._answered.set()
+                        self._chunks.put(("token", text))
+                        self._signal()
+            except Exception as e:
+                elapsed = time.monotonic() - started
+                model_router.record(self.model, elapsed, False)
+                record_llm_call(self.model, lane, elapsed, False)
+                if not sent:
+                    self.error = e
+                self._chunks.put(("error", e))
+                self._signal()
+                return
+            elapsed = time.monotonic() - started
+            model_router.record(self.model, elapsed, True)
+            record_llm_call(self.model, lane, elapsed, True, usage)
+            self._chunks.put(("done", None))
+            self._signal()
@@ -0,0 +1,90 @@
+import threading
+import time
+import uuid
+
+
+class BulkReview:
+    """
+    Revue groupée de toutes les PR ouvertes d'un dépôt : une tâche de la file par PR.
+    Garde la correspondance PR -> tâche pour suivre l'avancement, et le résultat final
+    de chaque PR : la file oublie les tâches terminées bien avant que la revue groupée expire.
+    """
+
+    def __init__(self, repo_owner, repo_name, level, user_id):
+        self.id = uuid.uuid4().hex
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.level = level
+        self.user_id = user_id
+        self.created_at = time.time()
+        self.pulls = []
+        self.drafts_skipped = 0
+        self._lock = threading.Lock()
+        self._results = {}
+
+    def add(self, pull, job_id):
+        self.pulls.append({"number": pull["number"], "title": pull["title"], "job_id": job_id})
+
+    def run_pull(self, pr_number, func, *args, **kwargs):
+        """Exécute la revue d'une PR (dans un worker de la file) et en garde l'issue."""
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                self._results[pr_number] = {"state": "error", "error": str(e)}
+            raise
+        with self._lock:
+            self._results[pr_number] = {"state": "success", "result": result}
+        return result
+
+    def progress(self, queue):
+        """Avancement : nombre de PR par état et détail de chaque PR."""
+        counts = {"pending": 0, "running": 0, "success": 0, "error": 0}
+        items = []
+        for pull in self.pulls:
+            with self._lock:
+                job = self._results.get(pull["number"])
+            if job is None:
+                job = queue.get(pull["job_id"]) or {"state": "error", "error": "Tâche introuvable"}
+            state = job["state"]
+            counts[state] += 1
+
+            item = {"pr": pull["number"], "title": pull["title"], "state": state}
+            if state == "success":
+                item["review_id"] = job["result"]["review_id"]
+                item["cached"] = job["result"]["cached"]
+            elif state == "error":
+                item["error"] = job["error"]
+            items.append(item)
+
+        return {
+            "id": self.id,
+            "repo": f"{self.repo_owner}/{self.repo_name}",
+            "level": self.level,
+            "total": len(self.pulls),
+            "drafts_skipped": self.drafts_skipped,
+            "done": counts["success"] + counts["error"],
+            "counts": counts,
+            "elapsed": round(time.time() - self.created_at, 1),
+            "pulls": items,
+        }
+
+
+class BulkRegistry:
+    """Revues groupées en cours ou récentes (en mémoire, comme la file d'analyses)."""
+
+    def __init__(self, keep_seconds=24 * 3600):
+        self.keep_seconds = keep_seconds
+        self._lock = threading.Lock()
+        self._runs = {}
+
+    def add(self, run):
+        with self._lock:
+            limit = time.time() - self.keep_seconds
+            for run_id in [r.id for r in self._runs.values() if r.created_at < limit]:
+                del self._runs[run_id]
+            self._runs[run.id] = run
+
+    def get(self, run_id):
+        with self._lock:
+            return self._runs.get(run_id)
@@ -0,0 +1,55 @@
+from src.diff_splitter import estimate_tokens, CHARS_PER_TOKEN
+
+CHAT_SYSTEM_PROMPT = "Tu es un expert en revue de code. Utilise le Markdown pour répondre."
+
+
+def truncate_to_tokens(text, max_tokens):
+    """Coupe un texte trop long à environ max_tokens (en le signalant à l'IA)."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[:max_tokens * CHARS_PER_TOKEN] + "\n[... tronqué pour tenir dans le contexte ...]\n"
+
+
+def context_messages(diff_text, review_result, diff_tokens):
+    """
+    Les 3 messages de contexte d'une discussion : consigne, diff analysé et rapport de revue.
+    """
+    return [
+        {"role": "system", "content": CHAT_SYSTEM_PROMPT},
+        {"role": "user", "content": "Voici le code à analyser :\n```diff\n" + truncate_to_tokens(diff_text, diff_tokens) + "\n```"},
+        {"role": "assistant", "content": review_result},
+    ]
+
+
+def split_window(turns, keep_last, budget_tokens, fold_batch=4):
+    """
+    Sépare les échanges pas encore résumés en (à résumer, fenêtre envoyée à l'IA).
+    Tant qu'il y a peu de messages en trop, on les garde tous (pas d'appel de résumé
+    à chaque tour) ; sinon la fenêtre garde les keep_last derniers messages qui tiennent
+    dans budget_tokens et le reste part dans le résumé.
+    """
+    total = sum(estimate_tokens(m["content"]) for m in turns)
+    if len(turns) <= keep_last + fold_batch and total <= budget_tokens:
+        return [], turns
+
+    window = []
+    used = 0
+    for message in reversed(turns[-keep_last:]):
+        used += estimate_tokens(message["content"])
+        if window and used > budget_tokens:
+            break
+        window.insert(0, message)
+    return turns[:len(turns) - len(window)], window
+
+
+def build_messages(context, summary, window, new_message):
+    """
+    Construit les messages envoyés à l'IA pour un tour de chat :
+    contexte de la revue, résumé des anciens échanges, derniers messages et nouvelle question.
+    """
+    messages = list(context)
+    if summary:
+        messages.append({"role": "system", "content": f"Résumé de la discussion précédente :\n{summary}"})
+    messages.extend(window)
+    messages.append({"role": "user", "content": new_message})
+    return messages
@@ -0,0 +1,14 @@
+import zlib
+
+# Niveau max : les rapports sont écrits une fois et relus souvent, la décompression reste rapide
+COMPRESSION_LEVEL = 9
+
+
+def compress_text(text):
+    """Texte -> octets compressés (zlib) pour une colonne binaire."""
+    return zlib.compress((text or "").encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress_text(data):
+    """Octets compressés par compress_text -> texte."""
+    return zlib.decompress(data).decode("utf-8")
@@ -6,4 +6,73 @@ load_dotenv()
 API_KEY = os.getenv("API_KEY")
 
 if not API_KEY:
-    raise ValueError("Clé introuvable")
\ No newline at end of file
+    raise ValueError("Clé introuvable")
+
+# Base de données (URL SQLAlchemy) : MySQL par défaut, SQLite possible (ex. sqlite:////tmp/reviewer.db)
+DATABASE_URL = os.getenv("DATABASE_URL", "mysql+pymysql://root:@localhost/code_reviewer_db")
+
+# URL des API GitHub et OpenRouter (remplaçables par les serveurs simulés de scripts/mock_services.py)
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+
+# Analyses en arrière-plan : nombre de workers et taille max de la file d'attente
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", 4))
+ANALYSIS_MAX_PENDING = int(os.getenv("ANALYSIS_MAX_PENDING", 50))
+
+# GitHub : token optionnel (5000 requêtes/heure au lieu de 60) et cache local des diffs
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_CACHE_DIR = os.getenv("GITHUB_CACHE_DIR", ".cache/github")
+# Taille max de ce cache (Mo) : au-delà, les fichiers les moins récemment utilisés sont supprimés
+GITHUB_CACHE_MAX_MB = int(os.getenv("GITHUB_CACHE_MAX_MB", 200))
+
+# Gros diffs : taille max d'un lot (en tokens estimés) et nombre de lots analysés en parallèle
+REVIEW_BATCH_TOKENS = int(os.getenv("REVIEW_BATCH_TOKENS", 12000))
+REVIEW_CONCURRENCY = int(os.getenv("REVIEW_CONCURRENCY", 4))
+
+# Filtre du diff avant revue : motifs de fichiers ignorés (séparés par des virgules,
+# vide = liste par défaut) et taille max d'un fichier relu (0 = pas de limite)
+DIFF_FILTER_ENABLED = os.getenv("DIFF_FILTER_ENABLED", "true").lower() in ("1", "true", "yes")
+DIFF_SKIP_GLOBS = [g.strip() for g in os.getenv("DIFF_SKIP_GLOBS", "").split(",") if g.strip()] or None
+DIFF_MAX_FILE_TOKENS = int(os.getenv("DIFF_MAX_FILE_TOKENS", 20000))
+
+# Pré-analyse locale : hunks sans effet (espaces, commentaires, imports réordonnés) retirés du diff
+# et vérifications rapides dont les constats sont donnés à l'IA
+PRE_ANALYSIS_ENABLED = os.getenv("PRE_ANALYSIS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Diff affiché dans l'interface : nombre de hunks renvoyés par page pour un fichier
+DIFF_HUNKS_PER_PAGE = int(os.getenv("DIFF_HUNKS_PER_PAGE", 20))
+
+# Chat : budget (en tokens estimés) des derniers messages, du diff envoyé en contexte,
+# et nombre max de messages récents gardés tels quels (les plus anciens sont résumés)
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", 6000))
+CHAT_DIFF_TOKENS = int(os.getenv("CHAT_DIFF_TOKENS", 12000))
+CHAT_KEEP_LAST = int(os.getenv("CHAT_KEEP_LAST", 8))
+
+# Webhook GitHub 'pull_request' : secret partagé (webhook désactivé s'il est vide),
+# compte technique propriétaire des revues précalculées et niveaux précalculés
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
+WEBHOOK_USERNAME = os.getenv("WEBHOOK_USERNAME", "github-webhook")
+WEBHOOK_LEVELS = [l.strip() for l in os.getenv("WEBHOOK_LEVELS", "senior").split(",") if l.strip()]
+
+# Revues groupées (toutes les PR ouvertes d'un dépôt) : PR relues en parallèle et nombre max de PR
+# par lancement
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", 8))
+BULK_MAX_PRS = int(os.getenv("BULK_MAX_PRS", 200))
+
+# Ordonnanceur des appels à OpenRouter : appels simultanés au total, par utilisateur,
+# et pour les revues groupées (le chat et les analyses interactives passent avant)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 16))
+LLM_USER_MAX_CONCURRENCY = int(os.getenv("LLM_USER_MAX_CONCURRENCY", 4))
+LLM_BULK_MAX_CONCURRENCY = int(os.getenv("LLM_BULK_MAX_CONCURRENCY", 8))
+
+# Modèles OpenRouter, dans l'ordre de préférence (le premier sert de clé au cache des revues),
+# délai max d'un appel en secondes, nouvelles tentatives avec attente croissante,
+# et requête de secours sur un autre modèle quand un appel dépasse la latence p90 habituelle
+LLM_MODELS = [m.strip() for m in os.getenv("LLM_MODELS", "anthropic/claude-3.5-sonnet,openai/gpt-4o").split(",") if m.strip()]
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 120))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", 2))
+LLM_RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", 1.0))
+LLM_HEDGE = os.getenv("LLM_HEDGE", "false").lower() in ("1", "true", "yes")
+
+# Jeton de l'endpoint /metrics (en-tête "Authorization: Bearer <jeton>"), endpoint limité à la machine locale s'il est vide
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
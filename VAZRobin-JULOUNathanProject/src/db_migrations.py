@@ -0,0 +1,26 @@
+from sqlalchemy import inspect, text
+
+
+def ensure_schema(db, model):
+    """
+    Met à niveau la table d'un modèle déjà créée en base :
+    db.create_all() crée les tables manquantes mais n'ajoute ni colonnes ni index
+    aux tables existantes. Les colonnes ajoutées ici sont nullables.
+    """
+    table = model.__table__
+    inspector = inspect(db.engine)
+    existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+    existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+
+    with db.engine.begin() as conn:
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            print(f"🛠️ Migration : ajout de la colonne {table.name}.{column.name}")
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type} NULL"))
+
+    for index in table.indexes:
+        if index.name not in existing_indexes:
+            print(f"🛠️ Migration : création de l'index {index.name}")
+            index.create(db.engine)
@@ -0,0 +1,87 @@
+from fnmatch import fnmatch
+
+from src.diff_splitter import parse_diff, estimate_tokens, count_changes
+
+# Fichiers générés, verrouillés ou vendorisés : inutiles (et coûteux) à faire relire par l'IA
+DEFAULT_SKIP_GLOBS = [
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "npm-shrinkwrap.json",
+    "poetry.lock", "Pipfile.lock", "composer.lock", "Cargo.lock", "Gemfile.lock", "go.sum", "*.lock",
+    "*.min.js", "*.min.css", "*.map", "*.bundle.js",
+    "*.snap", "__snapshots__/*",
+    "vendor/*", "node_modules/*", "third_party/*", "dist/*", "build/*",
+    "*.pb.go", "*_pb2.py", "*.generated.*",
+]
+
+# Marqueurs laissés en tête des fichiers générés par les outils
+GENERATED_MARKERS = ("@generated", "do not edit", "auto-generated", "autogenerated", "code generated by")
+
+# Au-delà, une ligne ajoutée ressemble à du code minifié
+MINIFIED_LINE_LENGTH = 500
+
+
+def filter_diff(diff_text, skip_globs=None, max_file_tokens=0):
+    """
+    Retire du diff les fichiers qui n'ont pas besoin de revue (binaires, lockfiles,
+    fichiers générés, minifiés ou vendorisés, fichiers trop gros).
+    Chaque fichier retiré est remplacé par une ligne de résumé pour que l'IA sache qu'il a changé.
+    Retourne (diff filtré, rapport) où le rapport liste les fichiers ignorés et les tokens économisés.
+    """
+    skip_globs = DEFAULT_SKIP_GLOBS if skip_globs is None else skip_globs
+
+    kept = []
+    skipped = []
+    tokens_saved = 0
+
+    for diff_file in parse_diff(diff_text):
+        text = diff_file["header"] + "".join(diff_file["hunks"])
+        reason = _skip_reason(diff_file, text, skip_globs, max_file_tokens)
+        if reason is None:
+            kept.append(text)
+            continue
+
+        added, removed = count_changes(diff_file["hunks"])
+        summary = f"{_first_line(diff_file['header'])}# Fichier non relu ({reason}) : +{added} / -{removed} lignes\n"
+        kept.append(summary)
+
+        tokens = estimate_tokens(text)
+        tokens_saved += tokens - estimate_tokens(summary)
+        skipped.append({"path": diff_file["path"], "reason": reason, "tokens": tokens})
+
+    filtered = "".join(kept)
+    report = {
+        "skipped": skipped,
+        "tokens_saved": max(tokens_saved, 0),
+        "tokens_kept": estimate_tokens(filtered),
+    }
+    return filtered, report
+
+
+def _skip_reason(diff_file, text, skip_globs, max_file_tokens):
+    path = diff_file["path"]
+    header = diff_file["header"]
+
+    if "Binary files " in header or "GIT binary patch" in text:
+        return "binaire"
+
+    for pattern in skip_globs:
+        if fnmatch(path, pattern) or fnmatch(path, f"*/{pattern}"):
+            return f"motif {pattern}"
+
+    added_lines = [
+        line[1:] for hunk in diff_file["hunks"] for line in hunk.splitlines()
+        if line.startswith("+")
+    ]
+    head = "\n".join(added_lines[:5]).lower()
+    if any(marker in head for marker in GENERATED_MARKERS):
+        return "fichier généré"
+    if any(len(line) > MINIFIED_LINE_LENGTH for line in added_lines):
+        return "code minifié"
+
+    if max_file_tokens and estimate_tokens(text) > max_file_tokens:
+        return f"plus de {max_file_tokens} tokens"
+    return None
+
+
+def _first_line(header):
+    # On ne garde que la ligne 'diff --git a/... b/...' du fichier retiré
+    return header.splitlines(keepends=True)[0] if header else ""
@@ -0,0 +1,52 @@
+from src.diff_splitter import parse_diff, count_changes
+
+
+def index_diff(diff_text):
+    """
+    Index du diff d'une PR, fichier par fichier, pour l'afficher à la demande.
+    Retourne une liste de {"path", "old_path", "status", "header", "hunks", "additions", "deletions"}
+    où status vaut 'added', 'deleted', 'renamed', 'binary' ou 'modified'.
+    """
+    files = []
+    for diff_file in parse_diff(diff_text):
+        additions, deletions = count_changes(diff_file["hunks"])
+        files.append({
+            "path": diff_file["path"],
+            "old_path": _old_path(diff_file["header"]),
+            "status": file_status(diff_file["header"]),
+            "header": diff_file["header"],
+            "hunks": diff_file["hunks"],
+            "additions": additions,
+            "deletions": deletions,
+        })
+    return files
+
+
+def diff_stats(files):
+    """Totaux d'un diff indexé : nombre de fichiers, lignes ajoutées et supprimées."""
+    return {
+        "files": len(files),
+        "additions": sum(f["additions"] for f in files),
+        "deletions": sum(f["deletions"] for f in files),
+    }
+
+
+def file_status(header):
+    """Nature du changement d'un fichier, d'après son en-tête git."""
+    if "Binary files " in header or "GIT binary patch" in header:
+        return "binary"
+    if "\nnew file mode" in header:
+        return "added"
+    if "\ndeleted file mode" in header:
+        return "deleted"
+    if "\nrename from " in header:
+        return "renamed"
+    return "modified"
+
+
+def _old_path(header):
+    # Ancien chemin d'un fichier renommé (None sinon)
+    for line in header.splitlines():
+        if line.startswith("rename from "):
+            return line[len("rename from "):].strip()
+    return None
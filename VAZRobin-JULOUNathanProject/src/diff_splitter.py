@@ -0,0 +1,110 @@
+import re
+
+# Approximation courante : environ 4 caractères par token pour du code
+CHARS_PER_TOKEN = 4
+
+HUNK_HEADER = re.compile(r"^@@ .* @@")
+
+
+def estimate_tokens(text):
+    """Estimation rapide du nombre de tokens d'un texte (sans tokenizer)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def parse_diff(diff_text):
+    """
+    Découpe un diff unifié en fichiers, puis chaque fichier en hunks.
+    Retourne une liste de {"path", "header", "hunks"} où header contient les
+    lignes 'diff --git', 'index', '---', '+++' et chaque hunk commence par '@@'.
+    """
+    files = []
+    current = None
+    hunk = None
+
+    for line in diff_text.splitlines(keepends=True):
+        if line.startswith("diff --git "):
+            current = {"path": _path_from_header(line), "header": line, "hunks": []}
+            files.append(current)
+            hunk = None
+        elif current is None:
+            # Texte avant le premier fichier (diff sans en-tête git)
+            current = {"path": "(diff)", "header": "", "hunks": []}
+            files.append(current)
+            hunk = [line]
+            current["hunks"].append(hunk)
+        elif HUNK_HEADER.match(line):
+            hunk = [line]
+            current["hunks"].append(hunk)
+        elif hunk is None:
+            current["header"] += line
+            if line.startswith("+++ b/"):
+                current["path"] = line[6:].strip()
+        else:
+            hunk.append(line)
+
+    for diff_file in files:
+        diff_file["hunks"] = ["".join(h) for h in diff_file["hunks"]]
+    return files
+
+
+def count_changes(hunks):
+    """Lignes ajoutées et supprimées d'une liste de hunks."""
+    additions = deletions = 0
+    for hunk in hunks:
+        for line in hunk.splitlines()[1:]:
+            if line.startswith("+"):
+                additions += 1
+            elif line.startswith("-"):
+                deletions += 1
+    return additions, deletions
+
+
+def pack_batches(files, max_tokens):
+    """
+    Regroupe les fichiers du diff en lots d'au plus max_tokens (estimés).
+    Un fichier trop gros est découpé par hunks (en répétant son en-tête),
+    et un hunk trop gros est découpé par lignes. Chaque lot est un texte de diff.
+    """
+    units = []
+    for diff_file in files:
+        whole = diff_file["header"] + "".join(diff_file["hunks"])
+        if estimate_tokens(whole) <= max_tokens:
+            units.append(whole)
+            continue
+        for hunk in diff_file["hunks"]:
+            for part in _split_lines(hunk, max_tokens - estimate_tokens(diff_file["header"])):
+                units.append(diff_file["header"] + part)
+
+    batches = []
+    current = ""
+    for unit in units:
+        if current and estimate_tokens(current + unit) > max_tokens:
+            batches.append(current)
+            current = ""
+        current += unit
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _split_lines(text, max_tokens):
+    # Découpe un hunk trop long en morceaux de lignes entières
+    max_chars = max(max_tokens, 1) * CHARS_PER_TOKEN
+    parts = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        if current and len(current) + len(line) > max_chars:
+            parts.append(current)
+            current = ""
+        current += line
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _path_from_header(line):
+    # 'diff --git a/chemin b/chemin' -> 'chemin'
+    parts = line.strip().split(" b/", 1)
+    if len(parts) == 2:
+        return parts[1]
+    return line.strip()[len("diff --git "):]
@@ -1,21 +1,277 @@
+import json
+import os
+import re
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 
-def get_pr_diff(repo_owner, repo_name, pr_number):
+from src.config import GITHUB_TOKEN, GITHUB_CACHE_DIR, GITHUB_CACHE_MAX_MB, GITHUB_API_URL
+
+# Noms de propriétaire / dépôt acceptés par GitHub (ils servent aussi de chemins dans le cache)
+GITHUB_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def is_valid_name(value):
+    """Vrai si value est un nom de propriétaire ou de dépôt GitHub sûr ('.' et '..' refusés)."""
+    return isinstance(value, str) and bool(GITHUB_NAME.match(value)) and value not in (".", "..")
+
+
+class GitHubClient:
     """
-    Récupère le texte 'diff' d'une Pull Request via l'API officielle de GitHub.
+    Client de l'API REST de GitHub :
+    - une session HTTP persistante (connexions réutilisées) et un token optionnel,
+    - un cache disque des diffs indexé par le SHA du commit de tête de la PR, borné à max_cache_bytes
+      (les fichiers les moins récemment utilisés sont supprimés en premier),
+    - des requêtes conditionnelles (ETag / If-None-Match) : un 304 ne coûte rien,
+    - un suivi des en-têtes X-RateLimit-* pour ralentir avant d'atteindre la limite.
     """
-    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/pulls/{pr_number}"
-    print(f"📡 Récupération via l'API : {url}")
-    
-    headers = {
-        "Accept": "application/vnd.github.v3.diff",
-        "User-Agent": "Projet-Revieweur-IA-Etudiant" 
-    }
-    
-    response = requests.get(url, headers=headers)
-    
-    if response.status_code == 200:
+
+    def __init__(self, token=None, cache_dir=".cache/github", base_url="https://api.github.com",
+                 timeout=30, min_remaining=5, max_wait=60, max_cache_bytes=200 * 1024 * 1024):
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        self.timeout = timeout
+        self.min_remaining = min_remaining
+        self.max_wait = max_wait
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": "Projet-Revieweur-IA-Etudiant",
+            "X-GitHub-Api-Version": "2022-11-28",
+        })
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+        self._lock = threading.Lock()
+        self.rate_limit = {"limit": None, "remaining": None, "reset": None}
+        # Taille du cache sur disque, calculée au premier ajout puis tenue à jour
+        self._cache_bytes = None
+
+    def get_pull(self, repo_owner, repo_name, pr_number):
+        """
+        Récupère les métadonnées d'une PR (dont le SHA de tête), revalidées par ETag.
+        """
+        url = f"{self.base_url}/repos/{repo_owner}/{repo_name}/pulls/{pr_number}"
+        cache_path = self._cache_path("pulls", repo_owner, repo_name, f"{pr_number}.json")
+        cached = self._read_json(cache_path)
+
+        headers = {"Accept": "application/vnd.github+json"}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        response = self._get(url, headers)
+
+        if response.status_code == 304 and cached:
+            print("♻️ PR inchangée depuis le dernier appel (304)")
+            return cached["data"]
+        if response.status_code != 200:
+            raise Exception(f"Impossible de récupérer la PR. Code d'erreur : {response.status_code}\nDétails : {response.text}")
+
+        data = response.json()
+        self._write_json(cache_path, {"etag": response.headers.get("ETag"), "data": data})
+        return data
+
+    def get_pr_diff(self, repo_owner, repo_name, pr_number, head_sha=None):
+        """
+        Récupère le texte 'diff' d'une PR. Un diff déjà téléchargé pour le même
+        commit de tête est relu depuis le cache sans appel réseau.
+        GitHub ne sert que le diff de la tête actuelle : si la PR a avancé depuis head_sha,
+        une exception est levée au lieu d'enregistrer ce diff sous un commit qui n'est pas le sien.
+        """
+        if head_sha is None:
+            head_sha = self.get_pull(repo_owner, repo_name, pr_number)["head"]["sha"]
+
+        cache_path = self._cache_path("diffs", repo_owner, repo_name, f"{head_sha}.diff")
+        cached = self._read_text(cache_path)
+        if cached is not None:
+            print(f"♻️ Diff lu depuis le cache ({head_sha[:7]})")
+            return cached
+
+        url = f"{self.base_url}/repos/{repo_owner}/{repo_name}/pulls/{pr_number}"
+        print(f"📡 Récupération via l'API : {url}")
+        response = self._get(url, {"Accept": "application/vnd.github.v3.diff"})
+
+        if response.status_code != 200:
+            raise Exception(f"Impossible de récupérer la PR. Code d'erreur : {response.status_code}\nDétails : {response.text}")
+
+        # Vérifié après le téléchargement : la PR a pu avancer entre-temps (métadonnées revalidées par ETag)
+        current_sha = self.get_pull(repo_owner, repo_name, pr_number)["head"]["sha"]
+        if current_sha != head_sha:
+            raise Exception(f"La PR #{pr_number} a avancé ({head_sha[:7]} → {current_sha[:7]}) : diff de {head_sha[:7]} indisponible")
+
         print("Diff récupéré avec succès !")
+        self._write_text(cache_path, response.text)
+        return response.text
+
+    def list_open_pulls(self, repo_owner, repo_name):
+        """
+        Liste les PR ouvertes d'un dépôt (toutes les pages de l'API, 100 par page).
+        Retourne des {"number", "title", "head_sha", "draft"}.
+        """
+        url = f"{self.base_url}/repos/{repo_owner}/{repo_name}/pulls?state=open&per_page=100"
+        pulls = []
+        while url:
+            response = self._get(url, {"Accept": "application/vnd.github+json"})
+            if response.status_code != 200:
+                raise Exception(f"Impossible de lister les PR. Code d'erreur : {response.status_code}\nDétails : {response.text}")
+            for pull in response.json():
+                pulls.append({
+                    "number": pull["number"],
+                    "title": pull.get("title", ""),
+                    "head_sha": pull["head"]["sha"],
+                    "draft": pull.get("draft", False),
+                })
+            # Pagination GitHub : en-tête Link rel="next"
+            url = response.links.get("next", {}).get("url")
+        return pulls
+
+    def get_compare_diff(self, repo_owner, repo_name, base_sha, head_sha):
+        """
+        Récupère le diff entre deux commits (API compare), par exemple les nouveaux
+        commits d'une PR depuis la dernière revue. Mis en cache comme les diffs de PR.
+        """
+        cache_path = self._cache_path("compare", repo_owner, repo_name, f"{base_sha}...{head_sha}.diff")
+        cached = self._read_text(cache_path)
+        if cached is not None:
+            print(f"♻️ Comparaison lue depuis le cache ({base_sha[:7]}...{head_sha[:7]})")
+            return cached
+
+        url = f"{self.base_url}/repos/{repo_owner}/{repo_name}/compare/{base_sha}...{head_sha}"
+        print(f"📡 Récupération via l'API : {url}")
+        response = self._get(url, {"Accept": "application/vnd.github.v3.diff"})
+
+        if response.status_code != 200:
+            raise Exception(f"Impossible de comparer les commits. Code d'erreur : {response.status_code}\nDétails : {response.text}")
+
+        self._write_text(cache_path, response.text)
         return response.text
-    else:
-        raise Exception(f"Impossible de récupérer la PR. Code d'erreur : {response.status_code}\nDétails : {response.text}")
\ No newline at end of file
+
+    def _get(self, url, headers):
+        self._wait_for_rate_limit()
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        self._update_rate_limit(response.headers)
+        return response
+
+    def _update_rate_limit(self, headers):
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        with self._lock:
+            self.rate_limit = {
+                "limit": int(headers.get("X-RateLimit-Limit", 0)),
+                "remaining": int(headers["X-RateLimit-Remaining"]),
+                "reset": int(headers.get("X-RateLimit-Reset", 0)),
+            }
+
+    def _wait_for_rate_limit(self):
+        # Presque plus d'appels disponibles : on attend la remise à zéro (si elle est proche)
+        with self._lock:
+            remaining = self.rate_limit["remaining"]
+            reset = self.rate_limit["reset"]
+        if remaining is None or remaining > self.min_remaining:
+            return
+
+        wait = reset - time.time()
+        if wait <= 0:
+            return
+        if wait > self.max_wait:
+            reset_at = time.strftime("%H:%M", time.localtime(reset))
+            raise Exception(f"Limite de l'API GitHub presque atteinte ({remaining} appels restants). Réessayez après {reset_at}.")
+
+        print(f"⏳ Limite GitHub proche, pause de {int(wait)} s")
+        time.sleep(wait)
+
+    def _cache_path(self, kind, repo_owner, repo_name, filename):
+        # Les noms viennent des requêtes (analyse, webhook, revue groupée) : jamais de chemin hors du cache
+        for part in (repo_owner, repo_name, filename):
+            if not is_valid_name(part):
+                raise Exception(f"Nom de dépôt invalide : {part!r}")
+        return os.path.join(self.cache_dir, kind, repo_owner, repo_name, filename)
+
+    def _read_json(self, path):
+        try:
+            return json.loads(self._read_text(path) or "")
+        except ValueError:
+            return None
+
+    def _read_text(self, path):
+        # Une lecture rajeunit le fichier : l'éviction supprime les moins récemment utilisés
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)
+            return text
+        except OSError:
+            return None
+
+    def _write_json(self, path, data):
+        self._write_text(path, json.dumps(data))
+
+    def _write_text(self, path, text):
+        # Écriture atomique : un lecteur concurrent ne voit jamais un fichier à moitié écrit
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        self._account(os.path.getsize(path))
+
+    def _account(self, size):
+        # Ajoute un fichier au total du cache et fait de la place si le budget est dépassé
+        with self._lock:
+            if self._cache_bytes is None:
+                self._cache_bytes = sum(size for _, size, _ in self._cache_files())
+            else:
+                self._cache_bytes += size
+            if self._cache_bytes > self.max_cache_bytes:
+                self._evict()
+
+    def _cache_files(self):
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _evict(self):
+        # Appelé sous verrou : on recompte (autres processus, fichiers réécrits) puis on supprime
+        # les fichiers les plus anciennement lus jusqu'à revenir à 90 % du budget
+        files = sorted(self._cache_files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        target = self.max_cache_bytes * 0.9
+        evicted = 0
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        self._cache_bytes = total
+        if evicted:
+            print(f"🧹 Cache GitHub : {evicted} fichier(s) supprimé(s), {total // 1024} Ko conservés")
+
+
+# Client partagé par toute l'application (connexions et cache réutilisés)
+github_client = GitHubClient(
+    token=GITHUB_TOKEN, cache_dir=GITHUB_CACHE_DIR, base_url=GITHUB_API_URL,
+    max_cache_bytes=GITHUB_CACHE_MAX_MB * 1024 * 1024
+)
+
+def get_pr_diff(repo_owner, repo_name, pr_number):
+    """
+    Récupère le texte 'diff' d'une Pull Request via l'API officielle de GitHub.
+    """
+    return github_client.get_pr_diff(repo_owner, repo_name, pr_number)
@@ -0,0 +1,152 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """Levée quand trop d'analyses sont déjà en attente."""
+
+
+class JobQueue:
+    """
+    File de tâches en arrière-plan servie par un pool de workers borné.
+    Les requêtes HTTP ne font qu'enregistrer la tâche et rendent la main tout de suite.
+    """
+
+    def __init__(self, max_workers=4, max_pending=50, keep_finished_seconds=3600):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.keep_finished_seconds = keep_finished_seconds
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="review-worker")
+        # Une place par tâche en cours ou en attente : au-delà, on refuse
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        # La condition protège les tâches et réveille les clients qui suivent un stream
+        self._cond = threading.Condition()
+        self._jobs = {}
+
+    def submit(self, func, *args, owner_id=None, stream=False, **kwargs):
+        """
+        Planifie func(*args, **kwargs) et retourne l'identifiant de la tâche.
+        Avec stream=True, func reçoit un callback on_token dont les morceaux de texte
+        sont conservés dans la tâche et relayés par follow().
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError("Trop d'analyses en attente, réessayez dans quelques instants.")
+        return self._start(func, args, kwargs, owner_id, stream)
+
+    def submit_many(self, calls, owner_id=None):
+        """
+        Planifie plusieurs tâches d'un coup : calls est une liste de (func, args, kwargs).
+        Tout ou rien : s'il n'y a pas de place pour toutes, aucune n'est planifiée (QueueFullError).
+        Retourne les identifiants des tâches, dans l'ordre.
+        """
+        acquired = 0
+        for _ in calls:
+            if not self._slots.acquire(blocking=False):
+                for _ in range(acquired):
+                    self._slots.release()
+                raise QueueFullError(f"Pas assez de place dans la file pour {len(calls)} tâches, réessayez plus tard.")
+            acquired += 1
+        return [self._start(func, args, kwargs, owner_id, False) for func, args, kwargs in calls]
+
+    def _start(self, func, args, kwargs, owner_id, stream):
+        # Appelé avec une place déjà réservée dans la file
+        job_id = uuid.uuid4().hex
+        with self._cond:
+            self._prune()
+            self._jobs[job_id] = {
+                "id": job_id,
+                "owner_id": owner_id,
+                "state": "pending",
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "chunks": [],
+                "result": None,
+                "error": None,
+            }
+
+        if stream:
+            kwargs["on_token"] = lambda text: self._push(job_id, text)
+
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def get(self, job_id):
+        """Retourne une copie de la tâche, ou None si elle est inconnue."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            job = dict(job)
+            job["partial"] = "".join(job.pop("chunks"))
+            return job
+
+    def follow(self, job_id, heartbeat=15):
+        """
+        Générateur qui suit une tâche : produit ("token", texte) pour chaque morceau
+        (y compris ceux déjà reçus), ("ping", None) toutes les `heartbeat` secondes
+        sans nouveauté, puis ("done", tâche) quand elle est terminée.
+        """
+        index = 0
+        while True:
+            with self._cond:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                if len(job["chunks"]) == index and not job["finished_at"]:
+                    self._cond.wait(heartbeat)
+                new_chunks = job["chunks"][index:]
+                index += len(new_chunks)
+                finished = job["finished_at"] is not None
+
+            for text in new_chunks:
+                yield "token", text
+            if finished:
+                yield "done", self.get(job_id)
+                return
+            if not new_chunks:
+                yield "ping", None
+
+    def stats(self):
+        """Nombre de tâches par état (utile pour surveiller la charge)."""
+        with self._cond:
+            counts = {"pending": 0, "running": 0, "success": 0, "error": 0}
+            for job in self._jobs.values():
+                counts[job["state"]] += 1
+        return counts
+
+    def _run(self, job_id, func, args, kwargs):
+        self._update(job_id, state="running", started_at=time.time())
+        fields = {"state": "error", "error": "Tâche interrompue"}
+        try:
+            fields = {"state": "success", "result": func(*args, **kwargs)}
+        except Exception as e:
+            fields = {"state": "error", "error": str(e)}
+        finally:
+            self._update(job_id, finished_at=time.time(), **fields)
+            self._slots.release()
+
+    def _push(self, job_id, text):
+        with self._cond:
+            if job_id in self._jobs:
+                self._jobs[job_id]["chunks"].append(text)
+                self._cond.notify_all()
+
+    def _update(self, job_id, **fields):
+        with self._cond:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+                self._cond.notify_all()
+
+    def _prune(self):
+        # On oublie les tâches terminées depuis longtemps (appelé sous verrou)
+        limit = time.time() - self.keep_finished_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] and job["finished_at"] < limit
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,155 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Ordre de priorité des files : le chat passe avant les analyses, les revues groupées en dernier
+LANES = ("chat", "review", "bulk")
+
+# Une réponse "junior" est bien plus longue : elle compte double dans le partage équitable
+LEVEL_COST = {"junior": 2.0}
+
+# Appelant courant (utilisateur, file, niveau), posé par l'application autour des appels à l'IA
+_caller = contextvars.ContextVar("llm_caller", default=(None, "review", None))
+
+
+class FairScheduler:
+    """
+    Contrôle d'admission des appels à l'IA :
+    - au plus max_concurrency appels simultanés, et per_user_limit par utilisateur (toutes files confondues),
+    - file prioritaire pour le chat, puis les analyses, puis les revues groupées (plafonnées à bulk_limit),
+    - partage équitable pondéré entre utilisateurs d'une même file (Start-time Fair Queuing) :
+      chaque demande reçoit une étiquette de temps virtuel qui avance avec le coût déjà
+      consommé par son utilisateur, et la plus petite étiquette passe en premier.
+    """
+
+    def __init__(self, max_concurrency=16, per_user_limit=4, bulk_limit=8, history=1000):
+        self.max_concurrency = max_concurrency
+        self.per_user_limit = per_user_limit
+        self.bulk_limit = bulk_limit
+
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._running = {lane: 0 for lane in LANES}
+        self._running_by_user = {}
+        self._finish_tags = {}
+        self._virtual_time = 0.0
+        self._seq = 0
+        self._waits = {lane: deque(maxlen=history) for lane in LANES}
+
+    @staticmethod
+    @contextmanager
+    def acting_as(user_id, lane="review", level=None):
+        """Déclare l'utilisateur et la file des appels à l'IA faits dans ce bloc."""
+        token = _caller.set((user_id, lane, level))
+        try:
+            yield
+        finally:
+            _caller.reset(token)
+
+    @staticmethod
+    def current():
+        """Appelant courant (à reposer avec acting_as dans les threads secondaires)."""
+        return _caller.get()
+
+    @contextmanager
+    def slot(self, max_tokens):
+        """Attend une place pour un appel à l'IA (coût : tokens de réponse demandés)."""
+        user_id, lane, level = _caller.get()
+        cost = max_tokens * LEVEL_COST.get(level, 1.0)
+        request = self._enqueue(user_id, lane, cost)
+        try:
+            yield
+        finally:
+            self._release(request)
+
+    def stats(self):
+        """Profondeur des files, appels en cours et temps d'attente (p50 / p95 / max) par file."""
+        with self._cond:
+            lanes = {}
+            for lane in LANES:
+                waits = sorted(self._waits[lane])
+                lanes[lane] = {
+                    "waiting": sum(1 for r in self._waiting if r["lane"] == lane),
+                    "running": self._running[lane],
+                    "wait_p50": _percentile(waits, 0.50),
+                    "wait_p95": _percentile(waits, 0.95),
+                    "wait_max": round(waits[-1], 3) if waits else 0.0,
+                }
+            return {
+                "max_concurrency": self.max_concurrency,
+                "running": sum(self._running.values()),
+                "waiting": len(self._waiting),
+                "lanes": lanes,
+            }
+
+    def _enqueue(self, user_id, lane, cost):
+        with self._cond:
+            # Étiquette de départ : le temps virtuel courant, ou plus tard si l'utilisateur a déjà consommé
+            start = max(self._virtual_time, self._finish_tags.get(user_id, 0.0))
+            self._finish_tags[user_id] = start + cost
+            self._seq += 1
+            request = {
+                "user_id": user_id, "lane": lane, "start": start, "seq": self._seq,
+                "queued_at": time.monotonic(), "admitted": False,
+            }
+            self._waiting.append(request)
+            self._dispatch()
+            while not request["admitted"]:
+                self._cond.wait()
+            return request
+
+    def _release(self, request):
+        with self._cond:
+            self._running[request["lane"]] -= 1
+            user_id = request["user_id"]
+            self._running_by_user[user_id] -= 1
+            if not self._running_by_user[user_id]:
+                del self._running_by_user[user_id]
+            self._dispatch()
+            self._prune_finish_tags()
+
+    def _dispatch(self):
+        # Appelé sous verrou : admet les demandes éligibles tant qu'il reste de la place
+        admitted = False
+        while self._waiting and sum(self._running.values()) < self.max_concurrency:
+            eligible = [r for r in self._waiting if self._can_run(r)]
+            if not eligible:
+                break
+            request = min(eligible, key=lambda r: (LANES.index(r["lane"]), r["start"], r["seq"]))
+            self._waiting.remove(request)
+
+            self._virtual_time = max(self._virtual_time, request["start"])
+            self._running[request["lane"]] += 1
+            self._running_by_user[request["user_id"]] = self._running_by_user.get(request["user_id"], 0) + 1
+            self._waits[request["lane"]].append(time.monotonic() - request["queued_at"])
+            request["admitted"] = True
+            admitted = True
+
+        if admitted:
+            self._cond.notify_all()
+
+    def _can_run(self, request):
+        # La limite par utilisateur vaut aussi pour les revues groupées : une seule ne prend pas toutes les places
+        if request["lane"] == "bulk" and self._running["bulk"] >= self.bulk_limit:
+            return False
+        return self._running_by_user.get(request["user_id"], 0) < self.per_user_limit
+
+    def _prune_finish_tags(self):
+        # Appelé sous verrou : oublie les utilisateurs inactifs dont l'étiquette n'a plus d'effet
+        if not self._waiting and not self._running_by_user:
+            # Plus rien en cours : le temps virtuel rattrape toutes les étiquettes
+            self._virtual_time = max([self._virtual_time, *self._finish_tags.values()])
+            self._finish_tags.clear()
+            return
+        active = set(self._running_by_user) | {r["user_id"] for r in self._waiting}
+        for user_id in [u for u, tag in self._finish_tags.items() if u not in active and tag <= self._virtual_time]:
+            del self._finish_tags[user_id]
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return round(sorted_values[index], 3)
@@ -0,0 +1,172 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Bornes des histogrammes de durée (secondes) : des requêtes HTTP rapides aux longues revues "junior"
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+HELP = {
+    "http_requests_total": "Requêtes HTTP traitées, par route, méthode et code de retour.",
+    "http_request_duration_seconds": "Durée de traitement des requêtes HTTP (hors streaming de la réponse).",
+    "span_duration_seconds": "Durée des étapes d'une requête ou d'une analyse (github_fetch, llm_call, db_commit).",
+    "llm_requests_total": "Appels à l'IA, par modèle, file de l'ordonnanceur et résultat.",
+    "llm_request_duration_seconds": "Durée des appels à l'IA (après admission par l'ordonnanceur).",
+    "llm_tokens_total": "Tokens facturés par OpenRouter, par modèle et type (prompt / completion).",
+    "reviews_total": "Revues servies, par niveau et origine (llm : nouvel appel, cache : revue réutilisée).",
+}
+
+# Étapes de la requête HTTP en cours (en-tête Server-Timing), None hors requête
+_trace = contextvars.ContextVar("metrics_trace", default=None)
+
+# Consommation de l'IA de la revue ou du tour de chat en cours, None si personne ne la suit
+_usage = contextvars.ContextVar("llm_usage", default=None)
+
+
+class Metrics:
+    """
+    Compteurs et histogrammes en mémoire, exposés au format texte de Prometheus.
+    Les valeurs sont remises à zéro au redémarrage du serveur.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    @contextmanager
+    def span(self, name):
+        """Mesure une étape (histogramme span_duration_seconds et en-tête Server-Timing de la requête)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe("span_duration_seconds", elapsed, span=name)
+            trace = _trace.get()
+            if trace is not None:
+                trace.append((name, elapsed))
+
+    def render(self):
+        """Toutes les séries au format d'exposition texte de Prometheus."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+
+        lines = []
+        described = set()
+        for (name, labels), value in counters:
+            _describe(lines, described, name, "counter")
+            lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        for (name, labels), histogram in histograms:
+            _describe(lines, described, name, "histogram")
+            for bound, count in zip(self.buckets, histogram["buckets"]):
+                lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {count}")
+            lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(histogram['sum'])}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+
+class Usage:
+    """Tokens et temps d'IA consommés par une revue ou un tour de chat, tous appels confondus."""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+        self.llm_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, prompt_tokens, completion_tokens, seconds):
+        # Les lots d'une grosse revue s'additionnent depuis plusieurs threads
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.calls += 1
+            self.llm_seconds += seconds
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def track_usage():
+    """Additionne les tokens des appels à l'IA faits dans ce bloc (et dans les threads qui en copient le contexte)."""
+    usage = Usage()
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+def record_llm_call(model, lane, seconds, ok, usage=None):
+    """Enregistre un appel à l'IA : durée, résultat et tokens renvoyés par OpenRouter (usage)."""
+    metrics.inc("llm_requests_total", model=model, lane=lane, status="success" if ok else "error")
+    metrics.observe("llm_request_duration_seconds", seconds, model=model)
+
+    prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+    completion_tokens = getattr(usage, "completion_tokens", None) or 0
+    if prompt_tokens or completion_tokens:
+        metrics.inc("llm_tokens_total", prompt_tokens, model=model, type="prompt")
+        metrics.inc("llm_tokens_total", completion_tokens, model=model, type="completion")
+
+    current = _usage.get()
+    if current is not None and ok:
+        current.add(prompt_tokens, completion_tokens, seconds)
+
+
+def start_trace():
+    """Commence à noter les étapes de la requête courante (voir end_trace)."""
+    return _trace.set([])
+
+
+def end_trace(token):
+    """Étapes notées depuis start_trace, cumulées par nom : {nom: secondes}."""
+    spans = {}
+    for name, elapsed in _trace.get() or []:
+        spans[name] = spans.get(name, 0.0) + elapsed
+    _trace.reset(token)
+    return spans
+
+
+def _describe(lines, described, name, kind):
+    if name in described:
+        return
+    described.add(name)
+    if name in HELP:
+        lines.append(f"# HELP {name} {HELP[name]}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
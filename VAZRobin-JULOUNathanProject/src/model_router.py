@@ -0,0 +1,77 @@
+import threading
+from collections import deque
+
+
+class ModelRouter:
+    """
+    Statistiques glissantes (latence, erreurs) par modèle et choix de l'ordre d'essai :
+    les modèles en bonne santé passent en premier, du plus rapide au plus lent
+    (ceux qui n'ont pas encore de mesures gardent l'ordre configuré), les autres en dernier recours.
+    """
+
+    def __init__(self, models, window=100, min_samples=5, min_success_rate=0.5):
+        self.models = list(models)
+        self.window = window
+        self.min_samples = min_samples
+        self.min_success_rate = min_success_rate
+
+        self._lock = threading.Lock()
+        self._calls = {model: deque(maxlen=window) for model in self.models}
+
+    def record(self, model, latency, ok):
+        """Enregistre la durée et le succès d'un appel."""
+        with self._lock:
+            self._calls.setdefault(model, deque(maxlen=self.window)).append((latency, ok))
+
+    def order(self):
+        """Modèles dans l'ordre où les essayer."""
+        with self._lock:
+            healthy, unhealthy = [], []
+            for index, model in enumerate(self.models):
+                latencies = self._latencies(model)
+                if not self._is_healthy(model):
+                    unhealthy.append(model)
+                elif len(latencies) >= self.min_samples:
+                    healthy.append((0, _percentile(latencies, 0.5), index, model))
+                else:
+                    healthy.append((1, 0.0, index, model))
+            return [entry[-1] for entry in sorted(healthy)] + unhealthy
+
+    def hedge_delay(self, model):
+        """Latence p90 d'un modèle : au-delà, on lance une requête de secours (None sans mesures)."""
+        with self._lock:
+            latencies = self._latencies(model)
+            if len(latencies) < self.min_samples:
+                return None
+            return _percentile(latencies, 0.9)
+
+    def stats(self):
+        """Statistiques par modèle : appels, taux de succès, latences p50 / p90."""
+        with self._lock:
+            result = {}
+            for model in self.models:
+                calls = self._calls[model]
+                latencies = self._latencies(model)
+                result[model] = {
+                    "calls": len(calls),
+                    "success_rate": round(sum(ok for _, ok in calls) / len(calls), 3) if calls else None,
+                    "latency_p50": round(_percentile(latencies, 0.5), 3) if latencies else None,
+                    "latency_p90": round(_percentile(latencies, 0.9), 3) if latencies else None,
+                    "healthy": self._is_healthy(model),
+                }
+            return result
+
+    def _latencies(self, model):
+        # Seuls les appels réussis comptent pour la latence (appelé sous verrou)
+        return sorted(latency for latency, ok in self._calls[model] if ok)
+
+    def _is_healthy(self, model):
+        calls = self._calls[model]
+        if len(calls) < self.min_samples:
+            return True
+        return sum(ok for _, ok in calls) / len(calls) >= self.min_success_rate
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
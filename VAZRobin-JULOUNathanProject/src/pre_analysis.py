@@ -0,0 +1,259 @@
+import ast
+import os
+import re
+import textwrap
+from collections import Counter
+
+from src.diff_splitter import parse_diff, estimate_tokens
+
+# Catégories de hunks : seuls les "code" sont envoyés à l'IA
+HUNK_KINDS = ("code", "whitespace", "comment", "imports")
+HUNK_LABELS = {"whitespace": "espaces / mise en forme", "comment": "commentaires", "imports": "imports réordonnés"}
+
+# Débuts de commentaire par extension de fichier. "/*" ouvre un bloc : ses lignes suivantes (" * ...")
+# ne sont des commentaires que si le bloc s'ouvre dans le même hunk ("*" seul commence aussi du code)
+COMMENT_PREFIXES = {
+    ".py": ("#",), ".sh": ("#",), ".rb": ("#",), ".yml": ("#",), ".yaml": ("#",), ".toml": ("#",),
+    ".cfg": ("#", ";"), ".ini": ("#", ";"), ".r": ("#",), ".pl": ("#",),
+    ".js": ("//", "/*"), ".jsx": ("//", "/*"), ".ts": ("//", "/*"), ".tsx": ("//", "/*"),
+    ".java": ("//", "/*"), ".kt": ("//", "/*"), ".go": ("//", "/*"), ".rs": ("//", "/*"),
+    ".c": ("//", "/*"), ".h": ("//", "/*"), ".cpp": ("//", "/*"), ".hpp": ("//", "/*"),
+    ".cs": ("//", "/*"), ".swift": ("//", "/*"), ".php": ("//", "/*", "#"),
+    ".scss": ("//", "/*"), ".css": ("/*",), ".sql": ("--",), ".lua": ("--",),
+    ".html": ("<!--",), ".xml": ("<!--",), ".vue": ("//", "/*", "<!--"),
+}
+
+# Langages où l'indentation a un sens : un changement d'indentation n'est pas de la mise en forme
+INDENT_SENSITIVE = (".py", ".yml", ".yaml", ".pyx", ".coffee", ".haml", ".pug")
+
+# Commentaires qui changent le comportement des outils : à relire comme du code
+PRAGMA_MARKERS = ("noqa", "type:", "pylint:", "pragma", "eslint", "@ts-", "nolint", "nosec", "-*- coding", "#!")
+
+IMPORT_LINE = re.compile(
+    r"^\s*(import\s+[\w.]+(\s+as\s+\w+)?\s*;?|from\s+[\w.]+\s+import\s+.+|import\s+.+\s+from\s+['\"].+['\"];?"
+    r"|(const|let|var)\s+.+=\s*require\(['\"].+['\"]\);?|using\s+[\w.]+;|#include\s+[<\"].+[>\"])\s*$"
+)
+
+# Vérifications rapides sur les lignes ajoutées : (règle, motif, message, extensions ou None pour toutes)
+REGEX_CHECKS = [
+    ("secret", re.compile(r"(?i)\b(password|passwd|secret|api_?key|token|private_?key)\w*\s*[:=]\s*['\"][^'\"\s]{8,}['\"]"),
+     "Secret écrit en dur dans le code", None),
+    ("secret", re.compile(r"AKIA[0-9A-Z]{16}|-----BEGIN (RSA |EC |OPENSSH |DSA )?PRIVATE KEY-----|ghp_[A-Za-z0-9]{36}"),
+     "Clé d'accès ou clé privée dans le diff", None),
+    ("sql-injection", re.compile(r"(?i)\.execute\(\s*(f['\"]|['\"].*['\"]\s*(%|\+|\.format\())"),
+     "Requête SQL construite par concaténation / formatage (risque d'injection)", None),
+    ("eval", re.compile(r"(?<![\w.])(eval|exec)\("), "Appel à eval/exec", (".py", ".js", ".ts", ".php", ".rb")),
+    ("shell", re.compile(r"shell\s*=\s*True|os\.system\("), "Commande shell (risque d'injection)", (".py",)),
+    ("tls", re.compile(r"verify\s*=\s*False|rejectUnauthorized\s*:\s*false"), "Vérification TLS désactivée", None),
+    ("deserialization", re.compile(r"pickle\.loads?\(|yaml\.load\((?![^)]*Loader)"), "Désérialisation non sûre", (".py",)),
+    ("xss", re.compile(r"\.innerHTML\s*=|dangerouslySetInnerHTML|\|\s*safe\b"), "HTML injecté sans échappement",
+     (".js", ".jsx", ".ts", ".tsx", ".html", ".vue")),
+    ("debug", re.compile(r"\b(pdb\.set_trace|breakpoint)\(\)|console\.log\(|\bdebugger;"), "Code de débogage oublié", None),
+    ("debug", re.compile(r"debug\s*=\s*True"), "Mode debug activé", (".py",)),
+]
+
+# Opérateurs de plusieurs caractères, gardés entiers : "i++ + j" et "i + ++j" ne se découpent pas pareil
+OPERATORS = (
+    ">>>=", "<<=", ">>=", "**=", "//=", "...", "===", "!==", ">>>", "<=>", "??=", "&&=", "||=",
+    "->", "=>", "::", "++", "--", "<<", ">>", "==", "!=", "<=", ">=", "&&", "||", "+=", "-=", "*=", "/=",
+    "%=", "&=", "|=", "^=", "**", "//", "??", "?.", ":=",
+)
+
+# Découpage d'une ligne en mots : chaînes entre guillemets (gardées telles quelles), identifiants / nombres,
+# opérateurs, symboles. Les espaces entre deux mots ne comptent pas ; ceux d'une chaîne, ou entre deux
+# identifiants, si (tout comme un espace qui sépare les symboles d'un opérateur : "a = = b" n'est pas "a == b")
+TOKEN = re.compile(
+    r"""("(?:\\.|[^"\\])*"?|'(?:\\.|[^'\\])*'?|`(?:\\.|[^`\\])*`?|\w+|"""
+    + "|".join(re.escape(op) for op in OPERATORS) + r"|\S)"
+)
+
+# Nombre max de constats transmis à l'IA
+MAX_FINDINGS = 30
+
+
+def pre_analyze(diff_text):
+    """
+    Pré-analyse locale du diff, sans appel à l'IA :
+    - classe chaque hunk (code, espaces, commentaires, imports réordonnés) ;
+      seuls les hunks de code restent dans le diff, les autres sont résumés en une ligne par fichier,
+    - lance des vérifications rapides (expressions régulières, AST Python) sur les lignes ajoutées.
+    Retourne (diff à relire, rapport) avec le nombre de hunks par catégorie, les tokens économisés
+    et les constats {"path", "line", "rule", "message"}.
+    """
+    kept = []
+    counts = Counter({kind: 0 for kind in HUNK_KINDS})
+    findings = []
+    tokens_saved = 0
+
+    for diff_file in parse_diff(diff_text):
+        extension = os.path.splitext(diff_file["path"])[1].lower()
+        code_hunks = []
+        omitted = Counter()
+
+        for hunk in diff_file["hunks"]:
+            kind = classify_hunk(hunk, extension)
+            counts[kind] += 1
+            if kind == "code":
+                code_hunks.append(hunk)
+                findings.extend(_check_hunk(diff_file["path"], extension, hunk))
+            else:
+                omitted[kind] += 1
+
+        original = diff_file["header"] + "".join(diff_file["hunks"])
+        if not omitted:
+            kept.append(original)
+            continue
+
+        summary = ", ".join(f"{n} {HUNK_LABELS[kind]}" for kind, n in omitted.items())
+        note = f"# Hunks non relus (changements sans effet : {summary})\n"
+        text = diff_file["header"] + note + "".join(code_hunks)
+        kept.append(text)
+        tokens_saved += estimate_tokens(original) - estimate_tokens(text)
+
+    report = {
+        "hunks": dict(counts),
+        "tokens_saved": max(tokens_saved, 0),
+        "findings": findings[:MAX_FINDINGS],
+    }
+    return "".join(kept), report
+
+
+def classify_hunk(hunk, extension=""):
+    """Catégorie d'un hunk : 'whitespace', 'comment', 'imports' ou 'code'."""
+    removed, added = _changed_lines(hunk)
+
+    # Seuls les espaces ou les lignes vides changent (mêmes lignes, dans le même ordre)
+    keep_indent = extension in INDENT_SENSITIVE
+    if [_squash(l, keep_indent) for l in removed if l.strip()] == [_squash(l, keep_indent) for l in added if l.strip()]:
+        return "whitespace"
+
+    changed = [l for l in removed + added if l.strip()]
+    prefixes = COMMENT_PREFIXES.get(extension)
+    if prefixes and all(comment for l, comment in zip(removed + added, _comment_flags(hunk, prefixes)) if l.strip()):
+        return "comment"
+
+    if all(IMPORT_LINE.match(l) for l in changed) and \
+            Counter(l.strip() for l in removed if l.strip()) == Counter(l.strip() for l in added if l.strip()):
+        return "imports"
+
+    return "code"
+
+
+def format_findings(findings):
+    """Constats de la pré-analyse en liste Markdown (vide s'il n'y en a pas)."""
+    return "\n".join(f"- `{f['path']}:{f['line']}` [{f['rule']}] {f['message']}" for f in findings)
+
+
+def _changed_lines(hunk):
+    removed, added = [], []
+    for line in hunk.splitlines()[1:]:
+        if line.startswith("-"):
+            removed.append(line[1:])
+        elif line.startswith("+"):
+            added.append(line[1:])
+    return removed, added
+
+
+def _squash(line, keep_indent=False):
+    # Forme d'une ligne sans sa mise en forme : ses mots, et son indentation si elle a un sens
+    indent = line[:len(line) - len(line.lstrip())] if keep_indent else ""
+    return indent, TOKEN.findall(line)
+
+
+def _comment_flags(hunk, prefixes):
+    """
+    Pour chaque ligne retirée puis ajoutée (dans l'ordre de _changed_lines) : vrai si c'est un commentaire.
+    Les deux versions du hunk (contexte compris) sont lues séparément pour suivre les blocs /* ... */.
+    """
+    flags = {"-": [], "+": []}
+    in_block = {"-": False, "+": False}
+    for line in hunk.splitlines()[1:]:
+        sign = line[:1]
+        for side in ("-", "+") if sign == " " else (sign,) if sign in flags else ():
+            comment, in_block[side] = _comment_state(line[1:], prefixes, in_block[side])
+            if sign != " ":
+                flags[side].append(comment)
+    return flags["-"] + flags["+"]
+
+
+def _comment_state(line, prefixes, in_block):
+    # (la ligne est-elle un commentaire, le bloc /* ... */ continue-t-il après elle)
+    stripped = line.strip()
+    if in_block or ("/*" in prefixes and stripped.startswith("/*")):
+        # Du code après la fin du bloc fait de la ligne du code
+        end = stripped.find("*/", 0 if in_block else 2)
+        comment, in_block = end == -1 or not stripped[end + 2:].strip(), end == -1
+    else:
+        comment = stripped.startswith(prefixes)
+    return comment and not any(marker in stripped for marker in PRAGMA_MARKERS), in_block
+
+
+def _check_hunk(path, extension, hunk):
+    """Vérifications rapides sur les lignes ajoutées d'un hunk (numéros de ligne du nouveau fichier)."""
+    findings = []
+    new_side = []
+    line_number = _new_start(hunk)
+
+    for line in hunk.splitlines()[1:]:
+        if line.startswith("-"):
+            continue
+        content = line[1:]
+        if line.startswith("+"):
+            for rule, pattern, message, extensions in REGEX_CHECKS:
+                if (extensions is None or extension in extensions) and pattern.search(content):
+                    findings.append({"path": path, "line": line_number, "rule": rule, "message": message})
+        if not line.startswith("\\"):
+            new_side.append((line_number, content, line.startswith("+")))
+            line_number += 1
+
+    if extension == ".py":
+        findings.extend(_check_python(path, new_side))
+    return findings
+
+
+def _check_python(path, new_side):
+    """
+    Vérifications AST sur le code Python du hunk (contexte + lignes ajoutées).
+    Un hunk qui commence au milieu d'un bloc ne se compile pas toujours : il est alors ignoré.
+    """
+    if not new_side:
+        return []
+    source = textwrap.dedent("\n".join(content for _, content, _ in new_side))
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    added_lines = {index + 1 for index, (_, _, added) in enumerate(new_side) if added}
+    first_line = new_side[0][0]
+    findings = []
+
+    def report(node, rule, message):
+        # On ne signale que ce qui est ajouté par la PR, pas le contexte
+        if node.lineno in added_lines:
+            findings.append({"path": path, "line": first_line + node.lineno - 1, "rule": rule, "message": message})
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ExceptHandler) and node.type is None:
+            report(node, "bare-except", "except sans type : attrape aussi KeyboardInterrupt et SystemExit")
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for default in node.args.defaults + node.args.kw_defaults:
+                if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                    report(node, "mutable-default", f"Valeur par défaut mutable dans {node.name}()")
+                    break
+        elif isinstance(node, ast.Compare):
+            for op, right in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.Eq, ast.NotEq)) and isinstance(right, ast.Constant) and right.value is None:
+                    report(node, "none-compare", "Comparaison à None avec == / != au lieu de is")
+                elif isinstance(op, (ast.Is, ast.IsNot)) and isinstance(right, ast.Constant) \
+                        and isinstance(right.value, (str, int, float)) and not isinstance(right.value, bool):
+                    report(node, "is-literal", "Comparaison à une valeur littérale avec is")
+        elif isinstance(node, ast.Assert) and isinstance(node.test, ast.Tuple):
+            report(node, "assert-tuple", "assert sur un tuple : toujours vrai")
+    return findings
+
+
+def _new_start(hunk):
+    # '@@ -a,b +c,d @@' -> c (première ligne du hunk dans le nouveau fichier)
+    match = re.match(r"^@@ -\d+(?:,\d+)? \+(\d+)", hunk)
+    return int(match.group(1)) if match else 1
@@ -0,0 +1,113 @@
+import re
+
+from sqlalchemy import text
+
+WORD = re.compile(r"\w+", re.UNICODE)
+
+# Longueur max du texte d'un extrait autour du premier terme trouvé
+SNIPPET_CHARS = 160
+
+
+class ReviewSearch:
+    """
+    Index plein texte des revues (nom du dépôt, numéro de PR et rapport), à côté des rapports compressés :
+    - SQLite : table FTS5 sans contenu (seul l'index est stocké, classement BM25),
+    - MySQL : table review_search avec un index FULLTEXT sur le dépôt et les mots distincts du rapport.
+    Les autres bases n'ont pas de recherche (available = False).
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.dialect = None
+
+    @property
+    def available(self):
+        return self.dialect in ("sqlite", "mysql")
+
+    def setup(self):
+        """Crée l'index s'il n'existe pas (à appeler au démarrage, dans le contexte de l'application)."""
+        self.dialect = self.db.engine.dialect.name
+        with self.db.engine.begin() as conn:
+            if self.dialect == "sqlite":
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS review_fts USING fts5("
+                    "repo, body, content='', tokenize='unicode61 remove_diacritics 2')"
+                ))
+            elif self.dialect == "mysql":
+                conn.execute(text(
+                    "CREATE TABLE IF NOT EXISTS review_search ("
+                    "review_id INT NOT NULL PRIMARY KEY, repo VARCHAR(120) NOT NULL, terms MEDIUMTEXT NOT NULL, "
+                    "FULLTEXT KEY ft_review_search (repo, terms)) ENGINE=InnoDB"
+                ))
+            else:
+                print(f"❌ Recherche plein texte indisponible pour la base {self.dialect}")
+
+    def index(self, conn, review_id, repo_name, pr_number, body):
+        """Ajoute une revue à l'index (dans la transaction qui l'insère)."""
+        repo = f"{repo_name} {pr_number}"
+        if self.dialect == "sqlite":
+            conn.execute(text("INSERT INTO review_fts (rowid, repo, body) VALUES (:id, :repo, :body)"),
+                         {"id": review_id, "repo": repo, "body": body})
+        elif self.dialect == "mysql":
+            # On n'indexe que les mots distincts : le rapport complet reste compressé dans review
+            conn.execute(text("REPLACE INTO review_search (review_id, repo, terms) VALUES (:id, :repo, :terms)"),
+                         {"id": review_id, "repo": repo, "terms": " ".join(dict.fromkeys(_words(body)))})
+
+    def indexed_ids(self, conn):
+        """Identifiants des revues déjà indexées."""
+        if self.dialect == "sqlite":
+            return {row[0] for row in conn.execute(text("SELECT rowid FROM review_fts"))}
+        if self.dialect == "mysql":
+            return {row[0] for row in conn.execute(text("SELECT review_id FROM review_search"))}
+        return set()
+
+    def search(self, user_id, query, limit, offset=0):
+        """
+        Revues de l'utilisateur qui contiennent tous les mots de la requête (préfixes acceptés),
+        de la plus pertinente à la moins pertinente. Retourne [(review_id, score)].
+        """
+        terms = _words(query)
+        if not terms or not self.available:
+            return []
+
+        if self.dialect == "sqlite":
+            # bm25 : plus petit = plus pertinent ; le dépôt pèse plus lourd que le corps du rapport
+            sql = text(
+                "SELECT review.id, bm25(review_fts, 5.0, 1.0) AS score FROM review_fts "
+                "JOIN review ON review.id = review_fts.rowid "
+                "WHERE review_fts MATCH :match AND review.user_id = :user_id "
+                "ORDER BY score, review.id DESC LIMIT :limit OFFSET :offset"
+            )
+            match = " ".join(f'"{term}"*' for term in terms)
+        else:
+            sql = text(
+                "SELECT review.id, MATCH(s.repo, s.terms) AGAINST (:match IN BOOLEAN MODE) AS score "
+                "FROM review_search s JOIN review ON review.id = s.review_id "
+                "WHERE MATCH(s.repo, s.terms) AGAINST (:match IN BOOLEAN MODE) AND review.user_id = :user_id "
+                "ORDER BY score DESC, review.id DESC LIMIT :limit OFFSET :offset"
+            )
+            match = " ".join(f"+{term}*" for term in terms)
+
+        with self.db.engine.connect() as conn:
+            rows = conn.execute(sql, {"match": match, "user_id": user_id, "limit": limit, "offset": offset})
+            return [(row[0], abs(float(row[1]))) for row in rows]
+
+
+def snippet(body, query, length=SNIPPET_CHARS):
+    """Extrait du rapport autour du premier mot de la requête trouvé (sans la mise en forme Markdown)."""
+    plain = re.sub(r"[#*`>_|]+", "", body)
+    plain = re.sub(r"\s+", " ", plain).strip()
+    lowered = plain.lower()
+
+    positions = [lowered.find(term) for term in _words(query)]
+    positions = [p for p in positions if p >= 0]
+    start = max(min(positions) - length // 3, 0) if positions else 0
+    if start:
+        # On commence l'extrait au début d'un mot
+        start = plain.rfind(" ", 0, start) + 1
+    excerpt = plain[start:start + length]
+    return ("…" if start else "") + excerpt + ("…" if start + length < len(plain) else "")
+
+
+def _words(value):
+    return [word.lower() for word in WORD.findall(value or "")]
@@ -0,0 +1,44 @@
+import hashlib
+import hmac
+
+# Actions d'une PR qui changent le code à relire
+PULL_REQUEST_ACTIONS = ("opened", "synchronize", "reopened")
+
+
+def sign_payload(secret, body):
+    """Signature GitHub (en-tête X-Hub-Signature-256) d'un corps de requête."""
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret, body, signature_header):
+    """
+    Vérifie que le webhook vient bien de GitHub : HMAC SHA-256 du corps brut avec le secret partagé.
+    La comparaison se fait en temps constant.
+    """
+    if not secret or not signature_header:
+        return False
+    return hmac.compare_digest(sign_payload(secret, body), signature_header)
+
+
+def parse_pull_request_event(event, payload):
+    """
+    Extrait la PR à relire d'un événement 'pull_request' (ouverte, nouveaux commits, réouverte).
+    Retourne {"owner", "repo", "pr", "head_sha"} ou None si l'événement ne demande pas de revue.
+    """
+    if event != "pull_request" or payload.get("action") not in PULL_REQUEST_ACTIONS:
+        return None
+
+    pull_request = payload.get("pull_request") or {}
+    repository = payload.get("repository") or {}
+    if pull_request.get("draft"):
+        return None
+
+    try:
+        return {
+            "owner": repository["owner"]["login"],
+            "repo": repository["name"],
+            "pr": int(pull_request["number"]),
+            "head_sha": pull_request["head"]["sha"],
+        }
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,134 @@
+"""
+Configuration commune des tests : src/config.py exige une clé d'API (jamais utilisée ici),
+et l'application tourne sur une base SQLite temporaire, sans GitHub ni IA réels.
+"""
+
+import os
+import tempfile
+import time
+import types
+import uuid
+
+import pytest
+
+_TMP_DIR = tempfile.mkdtemp(prefix="reviewer-tests-")
+
+os.environ.setdefault("API_KEY", "test")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP_DIR, 'reviews.db')}"
+os.environ["GITHUB_CACHE_DIR"] = os.path.join(_TMP_DIR, "github")
+
+DIFF = (
+    "diff --git a/app.py b/app.py\n--- a/app.py\n+++ b/app.py\n"
+    "@@ -1,1 +1,2 @@\n-a = 1\n+a = 2\n+b = a * 2\n"
+)
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """Module app.py importé une seule fois (la base est créée à l'import)."""
+    import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    """Client HTTP connecté avec un nouveau compte."""
+    client = app_module.app.test_client()
+    username = f"user-{uuid.uuid4().hex[:8]}"
+    client.post("/register", data={"username": username, "password": "secret"})
+    client.post("/login", data={"username": username, "password": "secret"})
+    return client
+
+
+@pytest.fixture
+def fake_github(monkeypatch, app_module):
+    """GitHub simulé : chaque PR a un commit de tête réglable et le même diff."""
+    heads = {}
+    calls = []
+
+    def get_pull(owner, repo, number):
+        calls.append(("pull", number))
+        return {"head": {"sha": heads.get(number, "a" * 40)}, "base": {"sha": "b" * 40}}
+
+    def get_pr_diff(owner, repo, number, head_sha=None):
+        calls.append(("diff", number))
+        return DIFF
+
+    def get_compare_diff(owner, repo, base_sha, head_sha):
+        calls.append(("compare", base_sha, head_sha))
+        return DIFF
+
+    monkeypatch.setattr(app_module.github_client, "get_pull", get_pull)
+    monkeypatch.setattr(app_module.github_client, "get_pr_diff", get_pr_diff)
+    monkeypatch.setattr(app_module.github_client, "get_compare_diff", get_compare_diff)
+    return type("FakeGitHub", (), {"heads": heads, "calls": calls})
+
+
+@pytest.fixture
+def fake_ai(monkeypatch, app_module):
+    """IA simulée : chaque revue renvoie un court rapport et note le diff reçu."""
+    diffs = []
+
+    def review_code(diff_text, level="senior", on_token=None, previous_review=None, local_findings=None):
+        diffs.append(diff_text)
+        if on_token:
+            on_token("### Rapport\n")
+        return "### Rapport\nRAS", app_module.MODEL
+
+    monkeypatch.setattr(app_module, "review_code", review_code)
+    return diffs
+
+
+@pytest.fixture
+def wait_job(client):
+    """Attend la fin d'une tâche via GET /api/jobs/<id> et retourne sa réponse JSON."""
+    def wait(job_id, timeout=5.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = client.get(f"/api/jobs/{job_id}").get_json()
+            if job["state"] in ("success", "error"):
+                return job
+            time.sleep(0.01)
+        raise AssertionError("La tâche ne s'est pas terminée à temps")
+    return wait
+
+
+@pytest.fixture
+def review_id(client, fake_github, fake_ai, wait_job):
+    """Identifiant d'une revue déjà générée pour l'utilisateur connecté."""
+    job_id = client.post("/api/analyze", json={"owner": "octo", "repo": "app", "pr": 1, "force": True}).get_json()["job_id"]
+    return wait_job(job_id)["review_id"]
+
+
+class FakeCompletions:
+    """API chat.completions simulée : répond "réponse de <modèle>" et note chaque appel."""
+
+    def __init__(self):
+        self.calls = []
+        self.behaviour = {}
+
+    def create(self, model, messages, stream=False, **kwargs):
+        self.calls.append({"model": model, "messages": messages, "stream": stream})
+        action = self.behaviour.get(model)
+        if action is not None:
+            action()
+        text = f"réponse de {model}"
+        if stream:
+            return iter([
+                types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=word))], usage=None)
+                for word in text.split(" ")
+            ])
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=text))],
+            usage=types.SimpleNamespace(prompt_tokens=10, completion_tokens=5),
+        )
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Client OpenRouter simulé pour src.ai_reviewer ; behaviour[modèle] peut lever une erreur."""
+    import src.ai_reviewer as ai_reviewer
+    completions = FakeCompletions()
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    monkeypatch.setattr(ai_reviewer, "client", client)
+    return completions
@@ -0,0 +1,30 @@
+"""Tests pour l'analyse d'une PR en arrière-plan (/api/analyze puis /api/jobs)."""
+
+
+class TestAnalyzeApi:
+    """Tests pour le lancement et le suivi d'une analyse."""
+
+    def test_analysis_runs_in_background(self, client, fake_github, fake_ai, wait_job):
+        """Test que /api/analyze rend la main tout de suite et que la tâche produit la revue."""
+        response = client.post("/api/analyze", json={"owner": "octo", "repo": "app", "pr": 1})
+        assert response.status_code == 202
+
+        job = wait_job(response.get_json()["job_id"])
+        assert job["state"] == "success"
+        assert job["review_id"]
+
+    def test_jobs_are_private(self, app_module, client, fake_github, fake_ai, wait_job):
+        """Test qu'une tâche n'est visible que par l'utilisateur qui l'a lancée."""
+        job_id = client.post("/api/analyze", json={"owner": "octo", "repo": "app", "pr": 2}).get_json()["job_id"]
+        wait_job(job_id)
+
+        other = app_module.app.test_client()
+        assert other.get(f"/api/jobs/{job_id}").status_code == 401
+        other.post("/register", data={"username": "intrus", "password": "x"})
+        other.post("/login", data={"username": "intrus", "password": "x"})
+        assert other.get(f"/api/jobs/{job_id}").status_code == 404
+
+    def test_login_required(self, app_module):
+        """Test qu'une analyse sans session est refusée."""
+        response = app_module.app.test_client().post("/api/analyze", json={"owner": "o", "repo": "r", "pr": 1})
+        assert response.status_code == 401
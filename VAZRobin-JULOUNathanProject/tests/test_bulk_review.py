@@ -0,0 +1,128 @@
+"""Tests pour les revues groupées (toutes les PR ouvertes d'un dépôt)."""
+
+import time
+import types
+import uuid
+
+import pytest
+
+from src.bulk_review import BulkReview
+
+PULLS = [
+    {"number": 1, "title": "Première", "head_sha": "a" * 40, "draft": False},
+    {"number": 2, "title": "Deuxième", "head_sha": "c" * 40, "draft": False},
+    {"number": 3, "title": "Brouillon", "head_sha": "d" * 40, "draft": True},
+]
+
+
+@pytest.fixture
+def open_pulls(monkeypatch, app_module, fake_github, fake_ai):
+    """Dépôt simulé avec deux PR ouvertes et un brouillon."""
+    def list_open_pulls(owner, repo):
+        if owner == "absent":
+            raise Exception("Impossible de lister les PR. Code d'erreur : 404")
+        return PULLS
+
+    monkeypatch.setattr(app_module.github_client, "list_open_pulls", list_open_pulls)
+    return PULLS
+
+
+class TestBulkReview:
+    """Tests pour le suivi d'une revue groupée."""
+
+    def test_results_outlive_the_queue(self):
+        """Test que l'issue de chaque PR reste connue quand la file a oublié ses tâches."""
+        run = BulkReview("octo", "app", "senior", 1)
+        run.add({"number": 1, "title": "ok"}, "job-1")
+        run.add({"number": 2, "title": "ko"}, "job-2")
+
+        def fail():
+            raise Exception("Erreur GitHub")
+
+        run.run_pull(1, lambda: {"review_id": 7, "cached": True})
+        with pytest.raises(Exception):
+            run.run_pull(2, fail)
+
+        progress = run.progress(types.SimpleNamespace(get=lambda job_id: None))
+        assert progress["done"] == progress["total"] == 2
+        assert progress["counts"]["success"] == progress["counts"]["error"] == 1
+        assert progress["pulls"][0]["review_id"] == 7
+        assert progress["pulls"][1]["error"] == "Erreur GitHub"
+
+    def test_unknown_jobs_are_errors(self):
+        """Test qu'une tâche inconnue de la file (et sans résultat) compte comme une erreur."""
+        run = BulkReview("octo", "app", "senior", 1)
+        run.add({"number": 1, "title": "perdue"}, "job-1")
+
+        progress = run.progress(types.SimpleNamespace(get=lambda job_id: None))
+        assert progress["pulls"][0] == {"pr": 1, "title": "perdue", "state": "error", "error": "Tâche introuvable"}
+
+
+class TestBulkReviewApi:
+    """Tests pour /api/bulk."""
+
+    def test_open_pulls_are_reviewed(self, client, open_pulls):
+        """Test que chaque PR ouverte (hors brouillons) est relue et suivie jusqu'au bout."""
+        response = client.post("/api/bulk", json={"owner": "octo", "repo": f"app-{uuid.uuid4().hex[:8]}"})
+        assert response.status_code == 202
+        bulk_id = response.get_json()["bulk_id"]
+
+        deadline = time.time() + 5
+        while True:
+            progress = client.get(f"/api/bulk/{bulk_id}").get_json()
+            if progress["done"] == progress["total"] or time.time() > deadline:
+                break
+            time.sleep(0.01)
+
+        assert [item["pr"] for item in progress["pulls"]] == [1, 2]
+        assert all(item["state"] == "success" for item in progress["pulls"])
+        assert progress["drafts_skipped"] == 1
+
+    @pytest.mark.parametrize("body", [
+        {"owner": "octo"},
+        {"owner": "octo", "repo": "../app"},
+        {"owner": "octo", "repo": "app", "level": "expert"},
+    ])
+    def test_invalid_requests_are_rejected(self, client, open_pulls, body):
+        """Test qu'un dépôt manquant ou invalide, ou un niveau inconnu, renvoie 400."""
+        assert client.post("/api/bulk", json=body).status_code == 400
+
+
+class TestBulkReviewCommand:
+    """Tests pour la commande flask bulk-review."""
+
+    @pytest.fixture
+    def runner(self, monkeypatch, app_module):
+        # Pas d'attente de 5 s entre deux affichages de l'avancement
+        sleep = time.sleep
+        monkeypatch.setattr(time, "sleep", lambda seconds: sleep(min(seconds, 0.01)))
+        return app_module.app.test_cli_runner()
+
+    def test_reviews_open_pulls(self, runner, open_pulls):
+        """Test que la commande relit les PR ouvertes et affiche chaque revue."""
+        result = runner.invoke(args=["bulk-review", f"octo/app-{uuid.uuid4().hex[:8]}"])
+
+        assert result.exit_code == 0, result.output
+        assert "✅ PR #1" in result.output and "✅ PR #2" in result.output
+
+    @pytest.mark.parametrize("repository", ["octo", "octo/", "/app", "octo/app/extra", "../app"])
+    def test_invalid_repository_is_a_usage_error(self, runner, open_pulls, repository):
+        """Test qu'un dépôt qui n'est pas owner/repo donne une erreur d'utilisation, sans trace Python."""
+        result = runner.invoke(args=["bulk-review", repository])
+
+        assert result.exit_code == 2
+        assert "owner/repo" in result.output
+
+    def test_github_error_is_reported(self, runner, open_pulls):
+        """Test qu'une erreur de GitHub est affichée proprement."""
+        result = runner.invoke(args=["bulk-review", "absent/app"])
+
+        assert result.exit_code == 1
+        assert "Code d'erreur : 404" in result.output
+
+    def test_unknown_user(self, runner, open_pulls):
+        """Test qu'un compte inconnu est refusé."""
+        result = runner.invoke(args=["bulk-review", "octo/app", "--user", "personne"])
+
+        assert result.exit_code == 1
+        assert "Utilisateur inconnu" in result.output
@@ -0,0 +1,74 @@
+"""Tests pour le contexte du chat côté serveur (budget de tokens et résumé glissant)."""
+
+from src.chat_context import build_messages, context_messages, split_window, truncate_to_tokens, CHAT_SYSTEM_PROMPT
+
+
+def _turns(count, size=10):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": f"{i} " + "x" * size} for i in range(count)]
+
+
+class TestChatContext:
+    """Tests pour la construction des messages envoyés à l'IA."""
+
+    def test_short_discussion_is_sent_whole(self):
+        """Test que peu de messages tenant dans le budget sont tous gardés, sans résumé."""
+        turns = _turns(6)
+        assert split_window(turns, keep_last=4, budget_tokens=1000) == ([], turns)
+
+    def test_long_discussion_keeps_the_last_messages(self):
+        """Test qu'au-delà, seuls les keep_last derniers restent et le reste part au résumé."""
+        turns = _turns(20)
+        to_fold, window = split_window(turns, keep_last=4, budget_tokens=1000)
+
+        assert window == turns[-4:]
+        assert to_fold == turns[:-4]
+
+    def test_window_respects_the_token_budget(self):
+        """Test que la fenêtre s'arrête au budget de tokens, en gardant au moins le dernier message."""
+        turns = _turns(20, size=400)
+        to_fold, window = split_window(turns, keep_last=8, budget_tokens=250)
+
+        assert window == turns[-2:]
+        assert to_fold + window == turns
+        assert split_window(_turns(20, size=4000), keep_last=8, budget_tokens=10)[1] == _turns(20, size=4000)[-1:]
+
+    def test_messages_order(self):
+        """Test l'ordre : consigne, diff, rapport, résumé, fenêtre puis nouvelle question."""
+        context = context_messages("+a = 1", "### Rapport", diff_tokens=100)
+        messages = build_messages(context, "On a parlé de a.", _turns(2), "Et b ?")
+
+        assert messages[0] == {"role": "system", "content": CHAT_SYSTEM_PROMPT}
+        assert "+a = 1" in messages[1]["content"]
+        assert messages[2] == {"role": "assistant", "content": "### Rapport"}
+        assert "On a parlé de a." in messages[3]["content"]
+        assert messages[4:6] == _turns(2)
+        assert messages[-1] == {"role": "user", "content": "Et b ?"}
+        assert len(build_messages(context, None, [], "Et b ?")) == 4
+
+    def test_long_diff_is_truncated(self):
+        """Test qu'un diff trop long est coupé et signalé."""
+        text = truncate_to_tokens("x" * 10_000, 100)
+        assert len(text) < 500 and "tronqué" in text
+        assert truncate_to_tokens("court", 100) == "court"
+
+
+class TestChatSummary:
+    """Tests pour le résumé des anciens échanges d'une discussion."""
+
+    def test_old_turns_are_folded_into_the_summary(self, monkeypatch, app_module, client, review_id):
+        """Test que les échanges sortis de la fenêtre sont résumés et que seule la fenêtre est renvoyée."""
+        sent = []
+        folded = []
+        monkeypatch.setattr(app_module, "CHAT_KEEP_LAST", 2)
+        monkeypatch.setattr(app_module, "chat_with_ia", lambda messages: sent.append(messages) or "ok")
+        monkeypatch.setattr(app_module, "summarize_chat",
+                            lambda summary, messages: folded.extend(messages) or f"résumé de {len(folded)} messages")
+
+        for i in range(6):
+            assert client.post("/api/chat", json={"review_id": review_id, "message": f"question {i}"}).status_code == 200
+
+        last = sent[-1]
+        assert any("résumé de" in m["content"] for m in last if m["role"] == "system")
+        assert last[-1]["content"] == "question 5"
+        assert len(last) < 3 + 2 * 6
+        assert folded
@@ -0,0 +1,55 @@
+"""Tests pour la table des messages de chat (ajout seul, numéros de séquence par revue)."""
+
+from sqlalchemy import text
+
+from src.metrics import Usage
+
+
+class TestChatMessages:
+    """Tests pour l'enregistrement et la lecture des messages."""
+
+    def _chat(self, monkeypatch, app_module, client, review_id, count):
+        monkeypatch.setattr(app_module, "chat_with_ia", lambda messages: f"réponse {len(messages)}")
+        for i in range(count):
+            assert client.post("/api/chat", json={"review_id": review_id, "message": f"q{i}"}).status_code == 200
+
+    def test_turns_are_appended_in_order(self, monkeypatch, app_module, client, review_id):
+        """Test que chaque tour ajoute la question puis la réponse, avec des numéros qui se suivent."""
+        self._chat(monkeypatch, app_module, client, review_id, 3)
+
+        messages = client.get(f"/api/reviews/{review_id}/messages").get_json()["messages"]
+        assert [m["seq"] for m in messages] == [1, 2, 3, 4, 5, 6]
+        assert [m["role"] for m in messages] == ["user", "assistant"] * 3
+        assert messages[4]["content"] == "q2"
+
+    def test_messages_are_paginated_backwards(self, monkeypatch, app_module, client, review_id):
+        """Test la pagination du plus récent au plus ancien avec ?before et ?limit."""
+        self._chat(monkeypatch, app_module, client, review_id, 3)
+
+        page = client.get(f"/api/reviews/{review_id}/messages?limit=4").get_json()
+        assert [m["seq"] for m in page["messages"]] == [3, 4, 5, 6]
+        older = client.get(f"/api/reviews/{review_id}/messages?limit=4&before={page['next_before']}").get_json()
+        assert [m["seq"] for m in older["messages"]] == [1, 2]
+        assert older["next_before"] is None
+
+    def test_concurrent_turn_on_the_same_seq_is_retried(self, monkeypatch, app_module, review_id):
+        """Test qu'un tour qui perd la course sur un numéro recommence avec les suivants."""
+        raced = []
+
+        def estimate_tokens(value):
+            # Un autre tour enregistre sa question entre la lecture du dernier numéro et l'insertion
+            if not raced:
+                raced.append(True)
+                with app_module.db.engine.begin() as conn:
+                    conn.execute(text(
+                        "INSERT INTO chat_message (review_id, seq, role, content) VALUES (:id, 1, 'user', 'autre')"
+                    ), {"id": review_id})
+            return 1
+
+        monkeypatch.setattr(app_module, "estimate_tokens", estimate_tokens)
+        with app_module.app.app_context():
+            review = app_module.db.session.get(app_module.Review, review_id)
+            app_module.save_chat_turn(review, "question", "réponse", Usage(), 0.1)
+
+            rows = app_module.ChatMessage.query.filter_by(review_id=review_id).order_by(app_module.ChatMessage.seq).all()
+            assert [(m.seq, m.content) for m in rows] == [(1, "autre"), (2, "question"), (3, "réponse")]
@@ -0,0 +1,73 @@
+"""Tests pour le retrait des fichiers sans intérêt pour la revue (lockfiles, générés, binaires...)."""
+
+import uuid
+
+from src.diff_filter import filter_diff
+
+
+def _file(path, hunks, header_extra=""):
+    header = f"diff --git a/{path} b/{path}\n{header_extra}--- a/{path}\n+++ b/{path}\n"
+    return header + "".join(hunks)
+
+
+def _hunk(start, lines):
+    return f"@@ -{start},1 +{start},{len(lines)} @@\n" + "".join(f"+{line}\n" for line in lines)
+
+
+DIFF = _file("app.py", [_hunk(1, ["a = 1"])]) + _file("README.md", [_hunk(1, ["Doc"])])
+
+
+class TestFilterDiff:
+    """Tests pour le retrait des fichiers sans intérêt pour la revue."""
+
+    def test_lockfiles_and_binaries_are_summarized(self):
+        """Test que lockfiles et binaires sont remplacés par une ligne de résumé."""
+        diff = (
+            _file("package-lock.json", [_hunk(1, ['"lodash": "4.17.21"'] * 50)])
+            + "diff --git a/logo.png b/logo.png\nBinary files a/logo.png and b/logo.png differ\n"
+            + _file("app.py", [_hunk(1, ["a = 1"])])
+        )
+
+        filtered, report = filter_diff(diff)
+
+        assert [(s["path"], s["reason"]) for s in report["skipped"]] == [
+            ("package-lock.json", "motif package-lock.json"), ("logo.png", "binaire"),
+        ]
+        assert "# Fichier non relu (motif package-lock.json) : +50 / -0 lignes" in filtered
+        assert _file("app.py", [_hunk(1, ["a = 1"])]) in filtered
+        assert report["tokens_saved"] > 0
+
+    def test_generated_minified_and_oversized_files(self):
+        """Test les fichiers générés, minifiés et trop gros."""
+        diff = (
+            _file("api_client.py", [_hunk(1, ["# Code generated by openapi. DO NOT EDIT."])])
+            + _file("web/app.js", [_hunk(1, ["x" * 600])])
+            + _file("data.py", [_hunk(1, [f"v{n} = {n}" for n in range(400)])])
+        )
+
+        _, report = filter_diff(diff, skip_globs=[], max_file_tokens=500)
+
+        assert [s["reason"] for s in report["skipped"]] == ["fichier généré", "code minifié", "plus de 500 tokens"]
+
+    def test_custom_globs(self):
+        """Test que les motifs fournis remplacent ceux par défaut."""
+        _, report = filter_diff(DIFF, skip_globs=["*.md"])
+        assert [s["path"] for s in report["skipped"]] == ["README.md"]
+
+
+class TestPruningReport:
+    """Tests pour le rapport de filtrage renvoyé avec la revue."""
+
+    def test_report_is_stored_with_the_review(self, monkeypatch, app_module, client, fake_github, fake_ai, wait_job):
+        """Test que le lockfile n'est pas envoyé à l'IA et que le rapport revient avec la revue réutilisée."""
+        diff = _file("package-lock.json", [_hunk(1, ['"a": "1"'] * 30)]) + _file("app.py", [_hunk(1, ["a = 1"])])
+        monkeypatch.setattr(app_module.github_client, "get_pr_diff", lambda *args, **kwargs: diff)
+        body = {"owner": "octo", "repo": f"app-{uuid.uuid4().hex[:8]}", "pr": 1}
+
+        first = wait_job(client.post("/api/analyze", json=body).get_json()["job_id"])
+        second = wait_job(client.post("/api/analyze", json=body).get_json()["job_id"])
+
+        assert '"a": "1"' not in fake_ai[0] and "package-lock.json" in fake_ai[0]
+        assert [s["path"] for s in first["pruning"]["skipped"]] == ["package-lock.json"]
+        assert second["cached"]
+        assert second["pruning"] == first["pruning"]
@@ -0,0 +1,121 @@
+"""Tests pour l'index du diff par fichier et son affichage à la demande."""
+
+import uuid
+
+from src.diff_index import diff_stats, index_diff
+from src.diff_splitter import count_changes
+
+DIFF = (
+    "diff --git a/app.py b/app.py\nindex 1111111..2222222 100644\n--- a/app.py\n+++ b/app.py\n"
+    "@@ -1,2 +1,2 @@\n-a = 1\n+a = 2\n b = 3\n"
+    "@@ -10,1 +10,3 @@\n c = 4\n+d = 5\n+e = 6\n"
+    "diff --git a/new.txt b/new.txt\nnew file mode 100644\n--- /dev/null\n+++ b/new.txt\n"
+    "@@ -0,0 +1,1 @@\n+bonjour\n"
+    "diff --git a/old.txt b/old.txt\ndeleted file mode 100644\n--- a/old.txt\n+++ /dev/null\n"
+    "@@ -1,2 +0,0 @@\n-au\n-revoir\n"
+    "diff --git a/src/a.py b/src/b.py\nsimilarity index 90%\nrename from src/a.py\nrename to src/b.py\n"
+    "diff --git a/logo.png b/logo.png\nBinary files a/logo.png and b/logo.png differ\n"
+)
+
+
+class TestDiffIndex:
+    """Tests pour index_diff, diff_stats et count_changes."""
+
+    def test_files_statuses_and_paths(self):
+        """Test le statut et les chemins de chaque fichier, dans l'ordre du diff."""
+        files = index_diff(DIFF)
+
+        assert [(f["path"], f["status"]) for f in files] == [
+            ("app.py", "modified"), ("new.txt", "added"), ("old.txt", "deleted"),
+            ("src/b.py", "renamed"), ("logo.png", "binary"),
+        ]
+        assert files[3]["old_path"] == "src/a.py"
+        assert files[0]["old_path"] is None
+
+    def test_changes_and_totals(self):
+        """Test les lignes ajoutées / supprimées par fichier et les totaux du diff."""
+        files = index_diff(DIFF)
+
+        assert [(f["additions"], f["deletions"]) for f in files] == [(3, 1), (1, 0), (0, 2), (0, 0), (0, 0)]
+        assert len(files[0]["hunks"]) == 2
+        assert diff_stats(files) == {"files": 5, "additions": 4, "deletions": 3}
+
+    def test_count_changes_ignores_hunk_headers_and_context(self):
+        """Test que seules les lignes +/- comptent, pas l'en-tête @@ ni le contexte."""
+        hunk = "@@ -1,3 +1,3 @@ def f():\n-    return 1\n+    return 2\n     pass\n"
+
+        assert count_changes([hunk, hunk]) == (2, 2)
+        assert count_changes([]) == (0, 0)
+
+    def test_files_rebuild_the_diff(self):
+        """Test que l'en-tête et les hunks de chaque fichier redonnent le diff d'origine."""
+        assert "".join(f["header"] + "".join(f["hunks"]) for f in index_diff(DIFF)) == DIFF
+
+
+class TestReviewDiffApi:
+    """Tests pour /api/reviews/<id>/diff et le chargement des hunks par pages."""
+
+    def _review(self, app_module, client, head_sha, diff_text=None):
+        """Revue sur un dépôt neuf ; avec diff_text, son diff est déjà enregistré."""
+        with client.session_transaction() as session:
+            user_id = session["user_id"]
+        repo = f"octo/app-{uuid.uuid4().hex[:8]}"
+        with app_module.app.app_context():
+            if diff_text is not None:
+                app_module.store_pull_diff(repo, head_sha, diff_text)
+            review = app_module.Review(repo_name=repo, pr_number=1, user_id=user_id, ai_result="RAS",
+                                       head_sha=head_sha, level="senior")
+            app_module.db.session.add(review)
+            app_module.db.session.commit()
+            return review.id
+
+    def test_files_are_listed_without_hunks(self, app_module, client):
+        """Test que la liste donne le résumé de chaque fichier et les totaux, sans les hunks."""
+        review_id = self._review(app_module, client, "a" * 40, DIFF)
+
+        response = client.get(f"/api/reviews/{review_id}/diff").get_json()
+        assert response["stats"] == {"files": 5, "additions": 4, "deletions": 3}
+        assert response["files"][0] == {
+            "index": 0, "path": "app.py", "old_path": None, "status": "modified",
+            "additions": 3, "deletions": 1, "hunk_count": 2,
+        }
+
+    def test_hunks_are_paginated(self, monkeypatch, app_module, client):
+        """Test que les hunks d'un fichier sont servis DIFF_HUNKS_PER_PAGE par page."""
+        monkeypatch.setattr(app_module, "DIFF_HUNKS_PER_PAGE", 1)
+        review_id = self._review(app_module, client, "a" * 40, DIFF)
+
+        first = client.get(f"/api/reviews/{review_id}/diff/0").get_json()
+        assert first["hunks"] == [index_diff(DIFF)[0]["hunks"][0]]
+        assert first["next_page"] == 2
+        second = client.get(f"/api/reviews/{review_id}/diff/0?page=2").get_json()
+        assert second["hunks"] == [index_diff(DIFF)[0]["hunks"][1]]
+        assert second["next_page"] is None
+        assert client.get(f"/api/reviews/{review_id}/diff/9").status_code == 404
+
+    def test_old_review_diff_is_fetched_once(self, app_module, client, fake_github):
+        """Test que le diff d'une revue sans diff enregistré est récupéré puis gardé en base."""
+        review_id = self._review(app_module, client, "a" * 40)
+
+        assert client.get(f"/api/reviews/{review_id}/diff").get_json()["stats"]["files"] == 1
+        assert client.get(f"/api/reviews/{review_id}/diff").status_code == 200
+        assert fake_github.calls.count(("diff", 1)) == 1
+
+    def test_moved_pull_request_uses_compare(self, app_module, client, fake_github):
+        """Test que si la PR a avancé depuis la revue, le diff est reconstruit depuis la base de la PR."""
+        review_id = self._review(app_module, client, "e" * 40)
+
+        assert client.get(f"/api/reviews/{review_id}/diff").status_code == 200
+        assert ("compare", "b" * 40, "e" * 40) in fake_github.calls
+        assert ("diff", 1) not in fake_github.calls
+
+    def test_other_users_diff_is_hidden(self, app_module, client):
+        """Test que le diff d'une revue d'un autre utilisateur n'est pas accessible."""
+        review_id = self._review(app_module, client, "a" * 40, DIFF)
+        other = app_module.app.test_client()
+        name = f"user-{uuid.uuid4().hex[:8]}"
+        other.post("/register", data={"username": name, "password": "secret"})
+        other.post("/login", data={"username": name, "password": "secret"})
+
+        assert other.get(f"/api/reviews/{review_id}/diff").status_code == 404
+        assert other.get(f"/api/reviews/{review_id}/diff/0").status_code == 404
@@ -0,0 +1,77 @@
+"""Tests pour le découpage des gros diffs en lots relus en parallèle."""
+
+from src.diff_splitter import parse_diff, pack_batches, estimate_tokens
+
+
+def _file(path, hunks, header_extra=""):
+    header = f"diff --git a/{path} b/{path}\n{header_extra}--- a/{path}\n+++ b/{path}\n"
+    return header + "".join(hunks)
+
+
+def _hunk(start, lines):
+    return f"@@ -{start},1 +{start},{len(lines)} @@\n" + "".join(f"+{line}\n" for line in lines)
+
+
+DIFF = _file("app.py", [_hunk(1, ["a = 1"]), _hunk(10, ["b = 2", "c = 3"])]) + _file("README.md", [_hunk(1, ["Doc"])])
+
+
+class TestParseDiff:
+    """Tests pour le découpage d'un diff en fichiers et hunks."""
+
+    def test_files_and_hunks(self):
+        """Test qu'un diff est découpé par fichier puis par hunk."""
+        files = parse_diff(DIFF)
+
+        assert [f["path"] for f in files] == ["app.py", "README.md"]
+        assert len(files[0]["hunks"]) == 2
+        assert files[0]["hunks"][1].startswith("@@ -10,1")
+        assert files[0]["header"].startswith("diff --git a/app.py b/app.py\n")
+
+    def test_round_trip(self):
+        """Test que les morceaux recollés redonnent le diff d'origine."""
+        assert "".join(f["header"] + "".join(f["hunks"]) for f in parse_diff(DIFF)) == DIFF
+
+
+class TestPackBatches:
+    """Tests pour le regroupement du diff en lots."""
+
+    def test_small_diff_is_one_batch(self):
+        """Test qu'un petit diff tient dans un seul lot."""
+        assert pack_batches(parse_diff(DIFF), 10_000) == [DIFF]
+
+    def test_large_file_is_split_by_hunk_with_its_header(self):
+        """Test qu'un fichier trop gros est découpé par hunks, chacun avec l'en-tête du fichier."""
+        hunks = [_hunk(i * 100, [f"ligne_{i}_{n} = {n}" for n in range(20)]) for i in range(4)]
+        diff = _file("big.py", hunks)
+        max_tokens = estimate_tokens(hunks[0]) + 30
+
+        batches = pack_batches(parse_diff(diff), max_tokens)
+
+        assert len(batches) == 4
+        assert all(batch.startswith("diff --git a/big.py b/big.py\n") for batch in batches)
+        assert all(estimate_tokens(batch) <= max_tokens for batch in batches)
+
+
+class TestBatchedReview:
+    """Tests pour la revue d'un gros diff en plusieurs lots puis une fusion."""
+
+    def test_large_diff_is_reviewed_in_batches_then_merged(self, monkeypatch, fake_llm):
+        """Test qu'un diff trop long donne un appel par lot, puis un appel de fusion."""
+        import src.ai_reviewer as ai_reviewer
+        monkeypatch.setattr(ai_reviewer, "REVIEW_BATCH_TOKENS", 200)
+        diff = "".join(_file(f"module_{i}.py", [_hunk(1, [f"valeur_{i}_{n} = {n}" for n in range(20)])]) for i in range(3))
+
+        text, model = ai_reviewer.review_code(diff, "senior")
+
+        prompts = [call["messages"][-1]["content"] for call in fake_llm.calls]
+        assert len(prompts) == 4
+        assert sum("partie" in prompt for prompt in prompts[:3]) == 3
+        assert all(f"module_{i}.py" in "".join(prompts[:3]) for i in range(3))
+        assert "réponse de" in prompts[3]
+        assert text == f"réponse de {model}"
+
+    def test_small_diff_is_a_single_call(self, fake_llm):
+        """Test qu'un petit diff est relu en un seul appel."""
+        import src.ai_reviewer as ai_reviewer
+        ai_reviewer.review_code(DIFF, "junior")
+        assert len(fake_llm.calls) == 1
@@ -0,0 +1,95 @@
+"""Tests pour le client GitHub (session, cache disque, requêtes conditionnelles)."""
+
+import os
+import time
+import types
+
+import pytest
+
+from src.git_parser import GitHubClient, is_valid_name
+
+HEAD = "a" * 40
+
+
+class FakeGitHub:
+    """Remplace session.get : métadonnées de PR avec ETag, diff de la PR."""
+
+    def __init__(self, head=HEAD):
+        self.head = head
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        headers = headers or {}
+        path = url.split("/repos/", 1)[1]
+        if "diff" in headers.get("Accept", ""):
+            self.requests.append(("diff", path))
+            return types.SimpleNamespace(status_code=200, headers={}, text=f"diff de {path}\n" + "+x\n" * 100)
+        self.requests.append(("pull", path, headers.get("If-None-Match")))
+        if headers.get("If-None-Match") == f'"{self.head}"':
+            return types.SimpleNamespace(status_code=304, headers={}, text="")
+        data = {"head": {"sha": self.head}}
+        return types.SimpleNamespace(status_code=200, headers={"ETag": f'"{self.head}"'}, json=lambda: data, text="")
+
+
+@pytest.fixture
+def github(tmp_path):
+    client = GitHubClient(cache_dir=str(tmp_path / "cache"))
+    client.session.get = FakeGitHub().get
+    client.fake = client.session.get.__self__
+    return client
+
+
+class TestCache:
+    """Tests pour le cache disque des diffs et des métadonnées."""
+
+    def test_diff_is_downloaded_once_per_head(self, github):
+        """Test qu'un diff déjà téléchargé pour ce commit est relu depuis le disque."""
+        first = github.get_pr_diff("octo", "app", 1, head_sha=HEAD)
+        count = len(github.fake.requests)
+
+        assert github.get_pr_diff("octo", "app", 1, head_sha=HEAD) == first
+        assert len(github.fake.requests) == count
+
+    def test_diff_of_an_older_head_is_refused(self, github):
+        """Test qu'un diff téléchargé alors que la PR a avancé n'est ni renvoyé ni mis en cache."""
+        github.fake.head = "c" * 40
+
+        with pytest.raises(Exception, match="a avancé"):
+            github.get_pr_diff("octo", "app", 1, head_sha=HEAD)
+        assert not os.path.exists(github._cache_path("diffs", "octo", "app", f"{HEAD}.diff"))
+
+    def test_pull_metadata_is_revalidated_with_etag(self, github):
+        """Test que la PR est redemandée avec If-None-Match et qu'un 304 renvoie le cache."""
+        assert github.get_pull("octo", "app", 1)["head"]["sha"] == HEAD
+        assert github.get_pull("octo", "app", 1)["head"]["sha"] == HEAD
+
+        assert github.fake.requests[-1] == ("pull", "octo/app/pulls/1", f'"{HEAD}"')
+
+    def test_invalid_names_never_reach_the_disk(self, github):
+        """Test qu'un propriétaire ou dépôt invalide est refusé avant toute écriture."""
+        assert is_valid_name("octo-cat.io") and is_valid_name("my_repo")
+        assert not any(is_valid_name(v) for v in ("..", ".", "a/b", "", None, "x y"))
+        with pytest.raises(Exception, match="invalide"):
+            github.get_pr_diff("..", "app", 1, head_sha=HEAD)
+        assert not os.path.exists(github.cache_dir)
+
+    def test_cache_evicts_least_recently_used_files(self, github):
+        """Test qu'au-delà du budget, les fichiers les moins récemment lus sont supprimés."""
+        def fetch(sha):
+            github.fake.head = sha
+            github.get_pr_diff("octo", "app", 1, head_sha=sha)
+
+        github.max_cache_bytes = 1000
+        fetch("1" * 40)
+        fetch("2" * 40)
+        diffs = os.path.join(github.cache_dir, "diffs", "octo", "app")
+        # Le diff du commit 1 est relu : c'est celui du commit 2 qui devient le plus ancien
+        old = time.time() - 60
+        os.utime(os.path.join(diffs, f"{'2' * 40}.diff"), (old, old))
+        fetch("1" * 40)
+
+        fetch("3" * 40)
+
+        assert os.path.exists(os.path.join(diffs, f"{'1' * 40}.diff"))
+        assert not os.path.exists(os.path.join(diffs, f"{'2' * 40}.diff"))
+        assert sum(size for _, size, _ in github._cache_files()) <= github.max_cache_bytes
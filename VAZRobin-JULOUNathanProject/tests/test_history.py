@@ -0,0 +1,69 @@
+"""Tests pour la page d'historique paginée et le chargement du rapport à la demande."""
+
+import re
+from datetime import datetime, timedelta
+
+CARD = re.compile(r'class="card-body" data-review-id="(\d+)"')
+NEXT = re.compile(r'cursor=([^"]+)"')
+
+
+def _add_reviews(app_module, client, count):
+    """Ajoute des revues datées d'une minute d'écart et renvoie leurs ids, de la plus ancienne à la plus récente."""
+    with client.session_transaction() as session:
+        user_id = session["user_id"]
+    start = datetime(2025, 1, 1)
+    with app_module.app.app_context():
+        reviews = [
+            app_module.Review(repo_name="octo/app", pr_number=i, user_id=user_id, ai_result=f"rapport {i}",
+                              level="senior", date_created=start + timedelta(minutes=i))
+            for i in range(count)
+        ]
+        app_module.db.session.add_all(reviews)
+        app_module.db.session.commit()
+        return [review.id for review in reviews]
+
+
+class TestHistoryPagination:
+    """Tests pour la pagination par curseur de /historique."""
+
+    def test_pages_follow_each_other_without_overlap(self, app_module, client):
+        """Test que les pages successives couvrent toutes les revues, les plus récentes d'abord."""
+        ids = _add_reviews(app_module, client, app_module.HISTORY_PAGE_SIZE + 5)
+
+        first = client.get("/historique").get_data(as_text=True)
+        assert [int(i) for i in CARD.findall(first)] == ids[::-1][:app_module.HISTORY_PAGE_SIZE]
+
+        second = client.get(f"/historique?cursor={NEXT.search(first).group(1)}").get_data(as_text=True)
+        assert [int(i) for i in CARD.findall(second)] == ids[::-1][app_module.HISTORY_PAGE_SIZE:]
+        assert not NEXT.search(second)
+
+    def test_ascending_order(self, app_module, client):
+        """Test l'ordre chronologique avec ?order=asc."""
+        ids = _add_reviews(app_module, client, 3)
+
+        page = client.get("/historique?order=asc").get_data(as_text=True)
+        assert [int(i) for i in CARD.findall(page)] == ids
+
+    def test_invalid_cursor_shows_first_page(self, app_module, client):
+        """Test qu'un curseur illisible affiche simplement la première page."""
+        ids = _add_reviews(app_module, client, 2)
+
+        page = client.get("/historique?cursor=nimporte-quoi").get_data(as_text=True)
+        assert [int(i) for i in CARD.findall(page)] == ids[::-1]
+
+    def test_list_does_not_include_reports(self, app_module, client):
+        """Test que la liste n'embarque pas les rapports, chargés ensuite via /api/reviews/<id>."""
+        ids = _add_reviews(app_module, client, 1)
+
+        assert "rapport 0" not in client.get("/historique").get_data(as_text=True)
+        detail = client.get(f"/api/reviews/{ids[0]}").get_json()
+        assert detail["ai_result"] == "rapport 0"
+
+    def test_other_users_reports_are_hidden(self, app_module, client):
+        """Test que le rapport d'un autre utilisateur n'est pas accessible."""
+        ids = _add_reviews(app_module, client, 1)
+        other = app_module.app.test_client()
+        other.post("/register", data={"username": "curieux", "password": "secret"})
+        other.post("/login", data={"username": "curieux", "password": "secret"})
+
+        assert other.get(f"/api/reviews/{ids[0]}").status_code == 404
@@ -0,0 +1,78 @@
+"""Tests pour la revue incrémentale (seuls les commits ajoutés depuis la dernière revue sont relus)."""
+
+import uuid
+
+
+def _repo():
+    return f"app-{uuid.uuid4().hex[:8]}"
+
+
+class TestIncrementalReview:
+    """Tests pour /api/analyze avec incremental=True."""
+
+    def _analyze(self, client, wait_job, repo, **options):
+        response = client.post("/api/analyze", json={"owner": "octo", "repo": repo, "pr": 1, **options})
+        assert response.status_code == 202
+        return wait_job(response.get_json()["job_id"])
+
+    def test_only_new_commits_are_reviewed(self, client, fake_github, fake_ai, wait_job):
+        """Test que la nouvelle revue porte sur le diff depuis le commit déjà relu et pointe vers la précédente."""
+        repo = _repo()
+        first = self._analyze(client, wait_job, repo)
+        fake_github.heads[1] = "c" * 40
+
+        second = self._analyze(client, wait_job, repo, incremental=True)
+
+        assert ("compare", "a" * 40, "c" * 40) in fake_github.calls
+        assert second["parent_review_id"] == first["review_id"]
+        assert second["base_sha"] == "a" * 40
+        assert len(fake_ai) == 2
+
+    def test_previous_report_is_given_to_the_model(self, monkeypatch, app_module, client, fake_github, fake_ai, wait_job):
+        """Test que le rapport précédent accompagne le nouveau diff."""
+        repo = _repo()
+        self._analyze(client, wait_job, repo)
+        fake_github.heads[1] = "c" * 40
+        previous = []
+
+        def review_code(diff_text, level="senior", on_token=None, previous_review=None, local_findings=None):
+            previous.append(previous_review)
+            return "### Suite\nRAS", app_module.MODEL
+
+        monkeypatch.setattr(app_module, "review_code", review_code)
+        self._analyze(client, wait_job, repo, incremental=True)
+
+        assert previous == ["### Rapport\nRAS"]
+
+    def test_full_review_without_previous_review(self, client, fake_github, fake_ai, wait_job):
+        """Test qu'une première revue incrémentale relit toute la PR."""
+        result = self._analyze(client, wait_job, _repo(), incremental=True)
+
+        assert not any(call[0] == "compare" for call in fake_github.calls)
+        assert (result["parent_review_id"], result["base_sha"]) == (None, None)
+
+    def test_compare_failure_falls_back_to_full_review(self, monkeypatch, app_module, client, fake_github, fake_ai, wait_job):
+        """Test qu'une comparaison impossible (historique réécrit) donne une revue complète."""
+        repo = _repo()
+        self._analyze(client, wait_job, repo)
+        fake_github.heads[1] = "c" * 40
+
+        def get_compare_diff(owner, repo, base_sha, head_sha):
+            raise Exception("Erreur GitHub 404")
+
+        monkeypatch.setattr(app_module.github_client, "get_compare_diff", get_compare_diff)
+        result = self._analyze(client, wait_job, repo, incremental=True)
+
+        assert result["state"] == "success"
+        assert result["parent_review_id"] is None
+
+    def test_default_review_is_not_incremental(self, client, fake_github, fake_ai, wait_job):
+        """Test qu'une revue sans incremental relit toute la PR après un nouveau commit."""
+        repo = _repo()
+        self._analyze(client, wait_job, repo)
+        fake_github.heads[1] = "c" * 40
+
+        result = self._analyze(client, wait_job, repo)
+
+        assert not any(call[0] == "compare" for call in fake_github.calls)
+        assert result["parent_review_id"] is None
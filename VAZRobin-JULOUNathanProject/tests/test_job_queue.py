@@ -0,0 +1,107 @@
+"""Tests pour la file de tâches en arrière-plan."""
+
+import threading
+import time
+
+import pytest
+
+from src.job_queue import JobQueue, QueueFullError
+
+
+def wait_for(queue, job_id, timeout=5.0):
+    """Attend la fin d'une tâche."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["state"] in ("success", "error"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("La tâche ne s'est pas terminée à temps")
+
+
+class TestJobQueue:
+    """Tests pour la file de tâches."""
+
+    def test_job_runs_to_completion(self):
+        """Test qu'une tâche s'exécute et conserve son résultat."""
+        queue = JobQueue(max_workers=1)
+        job = wait_for(queue, queue.submit(lambda a, b: a + b, 2, b=3, owner_id=7))
+
+        assert job["state"] == "success"
+        assert job["result"] == 5
+        assert job["owner_id"] == 7
+
+    def test_failed_job_keeps_error(self):
+        """Test qu'une exception de la tâche est enregistrée comme erreur."""
+        def fail():
+            raise Exception("GitHub indisponible")
+
+        queue = JobQueue(max_workers=1)
+        job = wait_for(queue, queue.submit(fail))
+
+        assert job["state"] == "error"
+        assert job["error"] == "GitHub indisponible"
+
+    def test_full_queue_rejects_jobs(self):
+        """Test qu'au-delà des workers et de l'attente autorisée, la file refuse."""
+        release = threading.Event()
+        queue = JobQueue(max_workers=1, max_pending=1)
+        ids = [queue.submit(release.wait) for _ in range(2)]
+
+        with pytest.raises(QueueFullError):
+            queue.submit(release.wait)
+        release.set()
+        for job_id in ids:
+            wait_for(queue, job_id)
+        assert queue.get(queue.submit(lambda: None)) is not None
+
+    def test_submit_many_is_all_or_nothing(self):
+        """Test qu'un lot qui ne tient pas dans la file n'est pas planifié du tout."""
+        release = threading.Event()
+        queue = JobQueue(max_workers=1, max_pending=2)
+        queue.submit(release.wait)
+
+        with pytest.raises(QueueFullError):
+            queue.submit_many([(release.wait, (), {})] * 3)
+        assert sum(queue.stats().values()) == 1
+
+        ids = queue.submit_many([(release.wait, (), {})] * 2)
+        release.set()
+        assert [wait_for(queue, job_id)["state"] for job_id in ids] == ["success", "success"]
+
+    def test_follow_streams_tokens(self):
+        """Test que follow() relaie les morceaux de texte puis la tâche terminée."""
+        def generate(on_token):
+            for word in ("Tout ", "va ", "bien"):
+                on_token(word)
+            return "fini"
+
+        queue = JobQueue(max_workers=1)
+        events = list(queue.follow(queue.submit(generate, stream=True), heartbeat=1))
+
+        assert [value for kind, value in events if kind == "token"] == ["Tout ", "va ", "bien"]
+        kind, job = events[-1]
+        assert kind == "done"
+        assert job["partial"] == "Tout va bien"
+        assert job["result"] == "fini"
+
+    def test_follow_sends_pings_while_waiting(self):
+        """Test que follow() envoie un ping quand rien n'arrive pendant heartbeat secondes."""
+        release = threading.Event()
+        queue = JobQueue(max_workers=1)
+        events = queue.follow(queue.submit(release.wait), heartbeat=0.01)
+
+        assert next(events) == ("ping", None)
+        release.set()
+        assert [kind for kind, _ in events][-1] == "done"
+
+    def test_finished_jobs_are_pruned(self):
+        """Test que les tâches terminées sont oubliées après keep_finished_seconds."""
+        queue = JobQueue(max_workers=1, keep_finished_seconds=0)
+        old_id = queue.submit(lambda: 1)
+        wait_for(queue, old_id)
+        time.sleep(0.01)
+
+        wait_for(queue, queue.submit(lambda: 2))
+        assert queue.get(old_id) is None
+
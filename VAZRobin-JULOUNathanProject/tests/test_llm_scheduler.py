@@ -0,0 +1,134 @@
+"""Tests pour l'ordonnanceur des appels à l'IA."""
+
+import threading
+import time
+
+from src.llm_scheduler import FairScheduler
+
+
+class Calls:
+    """Lance des appels qui attendent leur place et note l'ordre dans lequel ils passent."""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.order = []
+        self.threads = []
+        self.release = threading.Event()
+
+    def hold(self, user_id, lane="review"):
+        """Occupe une place jusqu'à release."""
+        started = threading.Event()
+
+        def run():
+            with self.scheduler.acting_as(user_id, lane), self.scheduler.slot(100):
+                started.set()
+                self.release.wait()
+        self._start(run)
+        started.wait(5)
+
+    def queue(self, name, user_id, lane="review", level=None):
+        """Lance un appel et attend qu'il soit dans la file ou déjà passé (ordre d'arrivée déterministe)."""
+        waiting = self.scheduler.stats()["waiting"]
+
+        def run():
+            with self.scheduler.acting_as(user_id, lane, level), self.scheduler.slot(100):
+                self.order.append(name)
+        self._start(run)
+        _until(lambda: self.scheduler.stats()["waiting"] > waiting or name in self.order)
+
+    def finish(self):
+        self.release.set()
+        for thread in self.threads:
+            thread.join(5)
+        return self.order
+
+    def _start(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+
+def _until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "Condition jamais atteinte"
+        time.sleep(0.005)
+
+
+class TestFairScheduler:
+    """Tests pour l'ordre d'admission des appels."""
+
+    def test_chat_before_review_before_bulk(self):
+        """Test que le chat passe avant les analyses, et les revues groupées en dernier."""
+        calls = Calls(FairScheduler(max_concurrency=1))
+        calls.hold("x")
+        calls.queue("bulk", 1, "bulk")
+        calls.queue("review", 2, "review")
+        calls.queue("chat", 3, "chat")
+
+        assert calls.finish() == ["chat", "review", "bulk"]
+
+    def test_users_share_a_lane_fairly(self):
+        """Test qu'un utilisateur qui envoie beaucoup de demandes ne fait pas attendre les autres."""
+        calls = Calls(FairScheduler(max_concurrency=1))
+        calls.hold("x")
+        for name in ("a1", "a2", "a3"):
+            calls.queue(name, "a")
+        calls.queue("b1", "b")
+
+        assert calls.finish() == ["a1", "b1", "a2", "a3"]
+
+    def test_per_user_limit_applies_to_bulk(self):
+        """Test que la limite par utilisateur vaut aussi pour les revues groupées."""
+        scheduler = FairScheduler(max_concurrency=4, per_user_limit=1, bulk_limit=4)
+        calls = Calls(scheduler)
+        calls.hold("a", "bulk")
+        calls.queue("a2", "a", "bulk")
+        calls.queue("b1", "b", "bulk")
+
+        _until(lambda: calls.order == ["b1"])
+        assert scheduler.stats()["lanes"]["bulk"]["waiting"] == 1
+        assert calls.finish() == ["b1", "a2"]
+
+    def test_junior_reviews_cost_double(self):
+        """Test qu'une revue « junior » compte double dans le partage entre utilisateurs."""
+        calls = Calls(FairScheduler(max_concurrency=1))
+        calls.hold("x")
+        calls.queue("a1", "a", level="junior")
+        calls.queue("a2", "a", level="junior")
+        for name in ("b1", "b2", "b3"):
+            calls.queue(name, "b", level="senior")
+
+        assert calls.finish() == ["a1", "b1", "b2", "a2", "b3"]
+
+    def test_stats_report_queue_depth_and_waits(self):
+        """Test que stats() montre les appels en attente, puis les temps d'attente une fois passés."""
+        scheduler = FairScheduler(max_concurrency=1)
+        calls = Calls(scheduler)
+        calls.hold("x", "chat")
+        calls.queue("a1", "a")
+
+        stats = scheduler.stats()
+        assert (stats["running"], stats["waiting"]) == (1, 1)
+        assert stats["lanes"]["review"]["waiting"] == 1
+
+        time.sleep(0.01)
+        calls.finish()
+        review = scheduler.stats()["lanes"]["review"]
+        assert (review["waiting"], review["running"]) == (0, 0)
+        assert 0 < review["wait_p50"] <= review["wait_max"]
+
+
+class TestServiceStatus:
+    """Tests pour GET /api/status."""
+
+    def test_status_shows_queues_and_scheduler(self, client):
+        """Test que l'état du service expose les files et l'ordonnanceur."""
+        status = client.get("/api/status").get_json()
+
+        assert set(status["llm_scheduler"]["lanes"]) == {"chat", "review", "bulk"}
+        assert "pending" in status["analysis_queue"] and "pending" in status["bulk_queue"]
+
+    def test_login_required(self, app_module):
+        """Test que l'état du service est réservé aux utilisateurs connectés."""
+        assert app_module.app.test_client().get("/api/status").status_code == 401
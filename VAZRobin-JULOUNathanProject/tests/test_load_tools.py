@@ -0,0 +1,96 @@
+"""Tests pour les outils des tests de charge (serveurs simulés et mesure des latences)."""
+
+import itertools
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+from openai import OpenAI
+
+from scripts import load_test, mock_services
+from src.diff_splitter import parse_diff
+from src.git_parser import GitHubClient
+
+
+@pytest.fixture
+def mock_server():
+    """Serveurs GitHub et OpenRouter simulés, sans latence, sur un port libre."""
+    options = mock_services.parse_args([
+        "--port", "0", "--github-latency", "0", "--llm-latency", "0", "--token-delay", "0",
+        "--tokens", "6", "--diff-files", "2", "--diff-lines", "3", "--open-pulls", "3", "--quiet",
+    ])
+    handler = type("Handler", (mock_services.MockHandler,), {"options": options})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestLoadTest:
+    """Tests pour le calcul des résultats d'un palier de charge."""
+
+    def test_percentile(self):
+        """Test le percentile par rang sur des valeurs triées, et 0 sans valeurs."""
+        values = [float(i) for i in range(1, 101)]
+
+        assert load_test.percentile(values, 0.50) == 51.0
+        assert load_test.percentile(values, 0.99) == 100.0
+        assert load_test.percentile([], 0.95) == 0.0
+
+    def test_run_level_counts_requests_and_errors(self):
+        """Test qu'un palier envoie exactement total requêtes et compte les erreurs à part."""
+        calls = itertools.count(1)
+
+        class User:
+            def analyze(self, pr_number):
+                if next(calls) % 4 == 0:
+                    raise RuntimeError("analyse en erreur")
+
+        result = load_test.run_level([User(), User()], "analyze", 2, 8, itertools.count(1))
+
+        assert (result["requests"], result["errors"]) == (8, 2)
+        assert result["first_error"] == "analyse en erreur"
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+
+class TestMockServices:
+    """Tests pour les API GitHub et OpenRouter simulées."""
+
+    def test_head_sha_is_stable_per_pull(self):
+        """Test qu'une PR garde le même commit de tête et que deux PR diffèrent."""
+        assert mock_services.head_sha("o", "r", 1) == mock_services.head_sha("o", "r", 1)
+        assert mock_services.head_sha("o", "r", 1) != mock_services.head_sha("o", "r", 2)
+
+    def test_build_diff_is_a_valid_unified_diff(self):
+        """Test que le diff simulé est lu comme files fichiers de lines lignes ajoutées."""
+        files = parse_diff(mock_services.build_diff("seed", 3, 4))
+
+        assert [f["path"] for f in files] == ["src/module_0.py", "src/module_1.py", "src/module_2.py"]
+        assert all(sum(line.startswith("+    ") for line in "".join(f["hunks"]).splitlines()) == 4 for f in files)
+
+    def test_github_client_against_mock(self, mock_server, tmp_path):
+        """Test que le client GitHub de l'application lit la PR, son diff et les PR ouvertes simulées."""
+        client = GitHubClient(cache_dir=str(tmp_path), base_url=mock_server)
+
+        pull = client.get_pull("load", "test", 7)
+        assert pull["head"]["sha"] == mock_services.head_sha("load", "test", 7)
+        diff = client.get_pr_diff("load", "test", 7, head_sha=pull["head"]["sha"])
+        assert diff.startswith("diff --git a/src/module_0.py")
+        assert [p["number"] for p in client.list_open_pulls("load", "test")] == [1, 2, 3]
+
+    def test_chat_completions_against_mock(self, mock_server):
+        """Test que le client OpenAI reçoit une réponse complète puis streamée avec l'usage."""
+        client = OpenAI(base_url=f"{mock_server}/v1", api_key="test", max_retries=0)
+
+        response = client.chat.completions.create(model="mock", messages=[{"role": "user", "content": "x"}], max_tokens=4)
+        assert response.usage.completion_tokens == 4
+        assert response.choices[0].message.content.startswith("###")
+
+        chunks = list(client.chat.completions.create(
+            model="mock", messages=[{"role": "user", "content": "x"}], stream=True,
+            stream_options={"include_usage": True},
+        ))
+        assert "".join(c.choices[0].delta.content or "" for c in chunks if c.choices).startswith("###")
+        assert chunks[-1].usage.completion_tokens == 6
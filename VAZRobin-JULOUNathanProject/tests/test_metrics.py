@@ -0,0 +1,113 @@
+"""Tests pour les métriques (format Prometheus), les étapes mesurées et la consommation de l'IA."""
+
+import contextvars
+import threading
+import types
+
+from src.metrics import Metrics, end_trace, record_llm_call, start_trace, track_usage
+
+
+class TestMetrics:
+    """Tests pour les compteurs, histogrammes et leur rendu texte."""
+
+    def test_counters_are_summed_per_label_set(self):
+        """Test que les compteurs s'additionnent par combinaison d'étiquettes, quel que soit leur ordre."""
+        metrics = Metrics()
+        metrics.inc("reviews_total", level="senior", source="llm")
+        metrics.inc("reviews_total", 2, source="llm", level="senior")
+        metrics.inc("reviews_total", level="junior", source="cache")
+
+        text = metrics.render()
+        assert '# TYPE reviews_total counter' in text
+        assert 'reviews_total{level="senior",source="llm"} 3' in text
+        assert 'reviews_total{level="junior",source="cache"} 1' in text
+        assert text.count("# HELP reviews_total") == 1
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test que chaque bucket compte les valeurs inférieures ou égales à sa borne."""
+        metrics = Metrics(buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            metrics.observe("span_duration_seconds", value, span="db_commit")
+
+        lines = metrics.render().splitlines()
+        assert 'span_duration_seconds_bucket{span="db_commit",le="0.1"} 1' in lines
+        assert 'span_duration_seconds_bucket{span="db_commit",le="1"} 2' in lines
+        assert 'span_duration_seconds_bucket{span="db_commit",le="+Inf"} 3' in lines
+        assert 'span_duration_seconds_count{span="db_commit"} 3' in lines
+        assert 'span_duration_seconds_sum{span="db_commit"} 5.55' in lines
+
+    def test_label_values_are_escaped(self):
+        """Test que les guillemets et retours à la ligne des étiquettes sont échappés."""
+        metrics = Metrics()
+        metrics.inc("http_requests_total", route='a"b\nc')
+
+        assert 'http_requests_total{route="a\\"b\\nc"} 1' in metrics.render()
+
+    def test_spans_are_added_to_the_request_trace(self):
+        """Test que les étapes d'une requête sont cumulées par nom pour l'en-tête Server-Timing."""
+        metrics = Metrics()
+        token = start_trace()
+        for _ in range(2):
+            with metrics.span("github_fetch"):
+                pass
+        with metrics.span("db_commit"):
+            pass
+
+        spans = end_trace(token)
+        assert set(spans) == {"github_fetch", "db_commit"}
+        assert 'span_duration_seconds_count{span="github_fetch"} 2' in metrics.render()
+
+
+class TestTrackUsage:
+    """Tests pour le suivi des tokens d'une revue ou d'un tour de chat."""
+
+    def test_usage_of_successful_calls_is_summed(self):
+        """Test que les tokens des appels réussis s'additionnent, y compris depuis un thread qui copie le contexte."""
+        usage_a = types.SimpleNamespace(prompt_tokens=100, completion_tokens=20)
+        with track_usage() as usage:
+            record_llm_call("m", "review", 1.0, True, usage_a)
+            thread = threading.Thread(target=contextvars.copy_context().run,
+                                      args=(record_llm_call, "m", "review", 2.0, True, usage_a))
+            thread.start()
+            thread.join()
+            record_llm_call("m", "review", 0.5, False)
+
+        assert (usage.calls, usage.prompt_tokens, usage.completion_tokens) == (2, 200, 40)
+        assert usage.llm_seconds == 3.0
+
+    def test_calls_outside_a_tracked_block_are_not_counted(self):
+        """Test qu'un appel hors bloc track_usage ne touche pas le suivi terminé."""
+        with track_usage() as usage:
+            pass
+        record_llm_call("m", "chat", 1.0, True, types.SimpleNamespace(prompt_tokens=1, completion_tokens=1))
+
+        assert usage.calls == 0
+
+
+class TestMetricsEndpoint:
+    """Tests pour GET /metrics et l'en-tête Server-Timing."""
+
+    def test_local_requests_only_without_token(self, monkeypatch, app_module):
+        """Test que sans METRICS_TOKEN, seules les requêtes locales lisent les métriques."""
+        monkeypatch.setattr(app_module, "METRICS_TOKEN", "")
+        client = app_module.app.test_client()
+
+        assert client.get("/metrics", environ_base={"REMOTE_ADDR": "203.0.113.7"}).status_code == 403
+        response = client.get("/metrics", environ_base={"REMOTE_ADDR": "127.0.0.1"})
+        assert response.status_code == 200
+        assert "http_requests_total" in response.get_data(as_text=True)
+
+    def test_token_is_required_when_configured(self, monkeypatch, app_module):
+        """Test qu'avec METRICS_TOKEN, le jeton est exigé, même en local."""
+        monkeypatch.setattr(app_module, "METRICS_TOKEN", "jeton")
+        client = app_module.app.test_client()
+
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer autre"}).status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer jeton"}).status_code == 200
+
+    def test_requests_carry_server_timing(self, app_module):
+        """Test que chaque réponse indique sa durée dans l'en-tête Server-Timing."""
+        response = app_module.app.test_client().get("/login")
+
+        assert response.headers["Server-Timing"].startswith("app;dur=")
@@ -0,0 +1,160 @@
+"""Tests pour le choix du modèle, les replis et les requêtes de secours (hedging)."""
+
+import threading
+import time
+
+import pytest
+
+import src.ai_reviewer as ai_reviewer
+from src.llm_scheduler import FairScheduler
+from src.model_router import ModelRouter
+
+
+def _router(samples):
+    """Routeur avec des mesures déjà enregistrées : {modèle: [(latence, succès), ...]}."""
+    router = ModelRouter(list(samples), min_samples=3)
+    for model, calls in samples.items():
+        for latency, ok in calls:
+            router.record(model, latency, ok)
+    return router
+
+
+def _until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "Condition jamais atteinte"
+        time.sleep(0.005)
+
+
+class TestModelRouter:
+    """Tests pour l'ordre d'essai des modèles et le délai de secours."""
+
+    def test_configured_order_without_samples(self):
+        """Test que sans mesures, l'ordre configuré est gardé et qu'il n'y a pas de délai de secours."""
+        router = ModelRouter(["a", "b", "c"], min_samples=3)
+        router.record("b", 0.1, True)
+
+        assert router.order() == ["a", "b", "c"]
+        assert router.hedge_delay("b") is None
+
+    def test_fastest_healthy_model_first(self):
+        """Test que les modèles mesurés passent du plus rapide (médiane) au plus lent."""
+        router = _router({
+            "lent": [(3.0, True)] * 3,
+            "rapide": [(0.5, True), (0.4, True), (5.0, True)],
+            "nouveau": [],
+        })
+
+        assert router.order() == ["rapide", "lent", "nouveau"]
+
+    def test_failing_model_goes_last(self):
+        """Test qu'un modèle qui échoue plus d'une fois sur deux passe en dernier recours."""
+        router = _router({
+            "instable": [(0.1, False), (0.1, False), (0.1, True)],
+            "fiable": [(2.0, True)] * 3,
+        })
+
+        assert router.order() == ["fiable", "instable"]
+        assert router.stats()["instable"]["healthy"] is False
+
+    def test_hedge_delay_is_p90_of_successful_calls(self):
+        """Test que le délai de secours est la latence p90 des appels réussis."""
+        router = _router({"m": [(float(i), True) for i in range(1, 11)] + [(60.0, False)]})
+
+        assert router.hedge_delay("m") == 10.0
+        assert router.stats()["m"]["latency_p50"] == 6.0
+
+    def test_window_forgets_old_calls(self):
+        """Test que seuls les window derniers appels comptent."""
+        router = ModelRouter(["m"], window=3, min_samples=3)
+        for latency in (9.0, 9.0, 9.0, 1.0, 1.0, 1.0):
+            router.record("m", latency, True)
+
+        assert router.hedge_delay("m") == 1.0
+
+
+class TestFallback:
+    """Tests pour les appels complets : repli sur le modèle suivant et requête de secours."""
+
+    @pytest.fixture
+    def models(self, monkeypatch):
+        """Deux modèles, sans requête de secours ni nouvelle tentative."""
+        monkeypatch.setattr(ai_reviewer, "model_router", ModelRouter(["m1", "m2"], min_samples=3))
+        monkeypatch.setattr(ai_reviewer, "LLM_HEDGE", False)
+        monkeypatch.setattr(ai_reviewer, "LLM_RETRIES", 0)
+        return ai_reviewer.model_router
+
+    def test_next_model_answers_when_first_fails(self, fake_llm, models):
+        """Test que l'échec du premier modèle passe la main au suivant, qui est noté comme auteur."""
+        def fail():
+            raise Exception("modèle indisponible")
+        fake_llm.behaviour["m1"] = fail
+
+        assert ai_reviewer._complete([], 100) == ("réponse de m2", "m2")
+        assert models.stats()["m1"]["success_rate"] == 0.0
+
+    def test_all_models_failing_raises_last_error(self, fake_llm, models):
+        """Test que l'erreur remonte quand aucun modèle ne répond."""
+        def fail():
+            raise Exception("panne")
+        fake_llm.behaviour["m1"] = fake_llm.behaviour["m2"] = fail
+
+        with pytest.raises(Exception, match="panne"):
+            ai_reviewer._complete([], 100)
+        assert [call["model"] for call in fake_llm.calls] == ["m1", "m2"]
+
+    def test_streamed_call_reports_its_model(self, fake_llm, models):
+        """Test qu'un appel en streaming renvoie aussi le modèle qui a répondu."""
+        tokens = []
+        assert ai_reviewer._complete([], 100, on_token=tokens.append) == ("réponsedem1", "m1")
+        assert tokens == ["réponse", "de", "m1"]
+
+
+class TestHedging:
+    """Tests pour les requêtes de secours et l'annulation de l'appel perdant."""
+
+    @pytest.fixture
+    def hedged(self, monkeypatch):
+        """m1 mesuré à 10 ms (p90), m2 en secours ; une seule place d'appel simultané."""
+        router = _router({"m1": [(0.01, True)] * 3, "m2": []})
+        scheduler = FairScheduler(max_concurrency=1)
+        monkeypatch.setattr(ai_reviewer, "model_router", router)
+        monkeypatch.setattr(ai_reviewer, "llm_scheduler", scheduler)
+        monkeypatch.setattr(ai_reviewer, "LLM_HEDGE", True)
+        monkeypatch.setattr(ai_reviewer, "LLM_RETRIES", 0)
+        return scheduler
+
+    def _slow_m1(self, fake_llm, scheduler):
+        """m1 répond une fois que la requête de secours attend sa place."""
+        fake_llm.behaviour["m1"] = lambda: _until(lambda: scheduler.stats()["waiting"] == 1)
+
+    def _idle(self, scheduler):
+        _until(lambda: scheduler.stats()["running"] == scheduler.stats()["waiting"] == 0)
+        time.sleep(0.02)
+
+    def test_backup_answers_when_primary_is_slow(self, monkeypatch, fake_llm):
+        """Test que la requête de secours répond quand le modèle principal dépasse sa latence p90."""
+        monkeypatch.setattr(ai_reviewer, "model_router", _router({"m1": [(0.01, True)] * 3, "m2": []}))
+        monkeypatch.setattr(ai_reviewer, "LLM_HEDGE", True)
+        release = threading.Event()
+        fake_llm.behaviour["m1"] = lambda: release.wait(5)
+        try:
+            assert ai_reviewer._complete([], 100) == ("réponse de m2", "m2")
+        finally:
+            release.set()
+
+    def test_losing_call_waiting_for_a_slot_is_not_sent(self, fake_llm, hedged):
+        """Test qu'une requête de secours devenue inutile n'est pas envoyée quand elle obtient sa place."""
+        self._slow_m1(fake_llm, hedged)
+
+        assert ai_reviewer._complete([], 100) == ("réponse de m1", "m1")
+        self._idle(hedged)
+        assert [call["model"] for call in fake_llm.calls] == ["m1"]
+
+    def test_losing_stream_waiting_for_a_slot_is_not_sent(self, fake_llm, hedged):
+        """Test qu'un flux de secours annulé avant d'avoir sa place n'appelle pas l'API."""
+        self._slow_m1(fake_llm, hedged)
+
+        assert "".join(ai_reviewer._stream_completion([], 100)) == "réponsedem1"
+        self._idle(hedged)
+        assert [call["model"] for call in fake_llm.calls] == ["m1"]
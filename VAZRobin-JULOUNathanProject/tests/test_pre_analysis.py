@@ -0,0 +1,64 @@
+"""Tests pour la pré-analyse locale du diff."""
+
+from src.pre_analysis import classify_hunk
+
+
+def _hunk(removed, added):
+    lines = [f"-{line}" for line in removed] + [f"+{line}" for line in added]
+    return "@@ -1,%d +1,%d @@\n" % (len(removed), len(added)) + "\n".join(lines) + "\n"
+
+
+class TestClassifyHunk:
+    """Tests pour la classification des hunks."""
+
+    def test_reformatting_is_whitespace(self):
+        """Test que des espaces ajoutés autour des symboles sont de la mise en forme."""
+        hunk = _hunk(["x=f(a,b)"], ["x = f(a, b)"])
+        assert classify_hunk(hunk, ".py") == "whitespace"
+
+    def test_blank_lines_are_whitespace(self):
+        """Test que des lignes vides ajoutées sont de la mise en forme."""
+        hunk = _hunk(["a = 1", "b = 2"], ["a = 1", "", "b = 2"])
+        assert classify_hunk(hunk, ".py") == "whitespace"
+
+    def test_spaces_inside_strings_are_code(self):
+        """Test qu'un espace retiré d'une chaîne change le comportement."""
+        assert classify_hunk(_hunk(['    return "Hello world"'], ['    return "Helloworld"']), ".py") == "code"
+        assert classify_hunk(_hunk(['const msg = "a b";'], ['const msg = "ab";']), ".js") == "code"
+        assert classify_hunk(_hunk(["x = 'a  b'"], ["x = 'a b'"]), ".py") == "code"
+
+    def test_joined_identifiers_are_code(self):
+        """Test que coller deux mots en change le sens."""
+        assert classify_hunk(_hunk(["return x"], ["returnx"]), ".js") == "code"
+
+    def test_spaces_around_multi_char_operators(self):
+        """Test qu'un espace déplacé autour d'un opérateur de plusieurs symboles en change le sens."""
+        assert classify_hunk(_hunk(["x = i++ + j;"], ["x = i + ++j;"]), ".c") == "code"
+        assert classify_hunk(_hunk(["a = b == c"], ["a = b = = c"]), ".py") == "code"
+        assert classify_hunk(_hunk(["y = x**2"], ["y = x * *2"]), ".py") == "code"
+        assert classify_hunk(_hunk(["if(a&&b){x+=1;}"], ["if (a && b) { x += 1; }"]), ".js") == "whitespace"
+
+    def test_indentation_matters_only_where_meaningful(self):
+        """Test qu'un changement d'indentation est du code en Python, de la mise en forme en JS."""
+        assert classify_hunk(_hunk(["if x:"], ["    if x:"]), ".py") == "code"
+        assert classify_hunk(_hunk(["if(x){"], ["  if (x) {"]), ".js") == "whitespace"
+
+    def test_comment_and_imports(self):
+        """Test les hunks de commentaires et d'imports réordonnés."""
+        assert classify_hunk(_hunk(["# ancien"], ["# nouveau"]), ".py") == "comment"
+        assert classify_hunk(_hunk(["x = 1  # noqa"], ["x = 1"]), ".py") == "code"
+        assert classify_hunk(_hunk(["import os", "import re"], ["import re", "import os"]), ".py") == "imports"
+
+    def test_block_comments(self):
+        """Test que les lignes " * ..." ne sont des commentaires que dans un bloc /* ... */ ouvert dans le hunk."""
+        doc = "@@ -1,4 +1,4 @@\n /**\n- * Ancienne description.\n+ * Nouvelle description.\n  */\n"
+        assert classify_hunk(doc, ".java") == "comment"
+        assert classify_hunk(_hunk(["/* a */"], ["/* b */"]), ".c") == "comment"
+        assert classify_hunk(_hunk(["/* a */ x = 1;"], ["/* a */ x = 2;"]), ".c") == "code"
+
+    def test_star_lines_outside_a_block_are_code(self):
+        """Test qu'une ligne qui commence par "*" hors d'un bloc de commentaire est du code."""
+        assert classify_hunk(_hunk(["*out = len;"], ["*out = len + 1;"]), ".c") == "code"
+        assert classify_hunk(_hunk(["* { margin: 0 }"], ["* { margin: 4px }"]), ".css") == "code"
+        continuation = "@@ -1,2 +1,2 @@\n const total = a\n-    * b;\n+    * c;\n"
+        assert classify_hunk(continuation, ".js") == "code"
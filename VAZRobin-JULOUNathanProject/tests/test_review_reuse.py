@@ -0,0 +1,142 @@
+"""Tests pour la réutilisation des revues (même PR, même commit, même niveau)."""
+
+import threading
+import time
+import types
+import uuid
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, inspect, text
+from sqlalchemy.orm import declarative_base
+
+from src.db_migrations import ensure_schema
+from src.single_flight import SingleFlight
+
+
+def _repo():
+    return f"app-{uuid.uuid4().hex[:8]}"
+
+
+class TestReviewReuse:
+    """Tests pour le cache des revues en base."""
+
+    def _analyze(self, client, wait_job, repo, **options):
+        response = client.post("/api/analyze", json={"owner": "octo", "repo": repo, "pr": 1, **options})
+        assert response.status_code == 202
+        return wait_job(response.get_json()["job_id"])
+
+    def test_same_head_and_level_is_reused(self, client, fake_github, fake_ai, wait_job):
+        """Test qu'une deuxième demande identique renvoie la revue existante sans appel à l'IA."""
+        repo = _repo()
+        first = self._analyze(client, wait_job, repo)
+        second = self._analyze(client, wait_job, repo)
+
+        assert (first["cached"], second["cached"]) == (False, True)
+        assert second["review_id"] == first["review_id"]
+        assert len(fake_ai) == 1
+
+    def test_new_head_level_or_force_runs_a_new_review(self, client, fake_github, fake_ai, wait_job):
+        """Test qu'un nouveau commit, un autre niveau ou force relancent l'analyse."""
+        repo = _repo()
+        self._analyze(client, wait_job, repo)
+        assert not self._analyze(client, wait_job, repo, level="junior")["cached"]
+        assert not self._analyze(client, wait_job, repo, force=True)["cached"]
+        fake_github.heads[1] = "c" * 40
+        assert not self._analyze(client, wait_job, repo)["cached"]
+        assert len(fake_ai) == 4
+
+    def test_other_user_gets_a_copy(self, app_module, client, fake_github, fake_ai, wait_job):
+        """Test qu'un autre utilisateur reçoit une copie de la revue, sans appel à l'IA."""
+        repo = _repo()
+        first = self._analyze(client, wait_job, repo)
+
+        other = app_module.app.test_client()
+        other.post("/register", data={"username": f"u-{repo}", "password": "x"})
+        other.post("/login", data={"username": f"u-{repo}", "password": "x"})
+        job_id = other.post("/api/analyze", json={"owner": "octo", "repo": repo, "pr": 1}).get_json()["job_id"]
+        while (job := other.get(f"/api/jobs/{job_id}").get_json())["state"] not in ("success", "error"):
+            time.sleep(0.01)
+
+        assert job["cached"]
+        assert job["review_id"] != first["review_id"]
+        assert len(fake_ai) == 1
+
+    @pytest.mark.parametrize("body", [
+        {"owner": "octo", "repo": "app", "pr": 1, "level": None},
+        {"owner": "octo", "repo": "app", "pr": 1, "level": "expert"},
+        {"owner": "octo", "repo": "app", "pr": 1, "level": "x" * 50},
+        {"owner": "octo", "repo": "app", "pr": "abc"},
+        ["octo", "app", 1],
+    ])
+    def test_invalid_requests_are_rejected(self, client, body):
+        """Test qu'un niveau inconnu ou une requête mal formée donne 400 (et non 500)."""
+        assert client.post("/api/analyze", json=body).status_code == 400
+
+
+class TestSingleFlight:
+    """Tests pour le regroupement des appels identiques simultanés."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test que des appels simultanés sur la même clé n'exécutent la fonction qu'une fois."""
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return "revue"
+
+        leader = threading.Thread(target=lambda: results.append(flights.do("pr-1", slow)))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=lambda: results.append(flights.do("pr-1", slow))) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(results) == [("revue", False)] + [("revue", True)] * 3
+
+    def test_error_is_shared_then_key_is_freed(self):
+        """Test qu'une erreur remonte et que la clé est libérée pour l'appel suivant."""
+        flights = SingleFlight()
+
+        def fail():
+            raise Exception("IA indisponible")
+
+        with pytest.raises(Exception, match="IA indisponible"):
+            flights.do("pr-1", fail)
+        assert flights.do("pr-1", lambda: "revue") == ("revue", False)
+
+
+class TestEnsureSchema:
+    """Tests pour l'ajout des colonnes et index manquants au démarrage."""
+
+    def test_missing_columns_and_indexes_are_added(self, tmp_path):
+        """Test qu'une table créée par une ancienne version est complétée sans perte de données."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE review (id INTEGER PRIMARY KEY, repo_name VARCHAR(100))"))
+            conn.execute(text("INSERT INTO review (id, repo_name) VALUES (1, 'octo/app')"))
+
+        class Review(declarative_base()):
+            __tablename__ = "review"
+            id = Column(Integer, primary_key=True)
+            repo_name = Column(String(100))
+            head_sha = Column(String(40), index=True)
+
+        ensure_schema(types.SimpleNamespace(engine=engine), Review)
+        ensure_schema(types.SimpleNamespace(engine=engine), Review)
+
+        columns = {c["name"] for c in inspect(engine).get_columns("review")}
+        assert columns == {"id", "repo_name", "head_sha"}
+        assert "ix_review_head_sha" in {i["name"] for i in inspect(engine).get_indexes("review")}
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT repo_name, head_sha FROM review")).one() == ("octo/app", None)
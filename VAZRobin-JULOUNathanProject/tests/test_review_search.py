@@ -0,0 +1,136 @@
+"""Tests pour le stockage compressé des rapports et l'index plein texte des revues (SQLite FTS5)."""
+
+import types
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.compression import compress_text, decompress_text
+from src.review_search import ReviewSearch, snippet
+
+
+@pytest.fixture
+def search(tmp_path):
+    """Index sur une base SQLite avec une table review minimale."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'reviews.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE review (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL)"))
+
+    review_search = ReviewSearch(types.SimpleNamespace(engine=engine))
+    review_search.setup()
+    reviews = [
+        (1, 1, "octo/api", 3, "### Sécurité\nRequête SQL construite par concaténation."),
+        (2, 1, "octo/web", 8, "### Performance\nBoucle inutile, la requête SQL est faite à chaque tour."),
+        (3, 1, "octo/web", 9, "### Style\nNommage des variables."),
+        (4, 2, "autre/api", 1, "### Sécurité\nInjection SQL possible."),
+    ]
+    with engine.begin() as conn:
+        for review_id, user_id, repo, pr, body in reviews:
+            conn.execute(text("INSERT INTO review (id, user_id) VALUES (:id, :user)"), {"id": review_id, "user": user_id})
+            review_search.index(conn, review_id, repo, pr, body)
+    return review_search
+
+
+class TestReviewSearch:
+    """Tests pour la recherche dans les revues."""
+
+    def test_available_on_sqlite(self, search):
+        """Test que SQLite dispose de la recherche."""
+        assert search.available
+        with search.db.engine.connect() as conn:
+            assert search.indexed_ids(conn) == {1, 2, 3, 4}
+
+    def test_only_own_reviews_containing_all_terms(self, search):
+        """Test que seules les revues de l'utilisateur qui contiennent tous les mots sont trouvées."""
+        assert {review_id for review_id, _ in search.search(1, "requête sql", 10)} == {1, 2}
+        assert [review_id for review_id, _ in search.search(2, "sql", 10)] == [4]
+
+    def test_accents_prefixes_and_repository(self, search):
+        """Test que les accents sont ignorés, les préfixes acceptés et le dépôt cherché."""
+        assert [review_id for review_id, _ in search.search(1, "securite", 10)] == [1]
+        assert [review_id for review_id, _ in search.search(1, "concat", 10)] == [1]
+        assert {review_id for review_id, _ in search.search(1, "web", 10)} == {2, 3}
+
+    def test_pagination_and_empty_query(self, search):
+        """Test la pagination et une requête sans mot."""
+        first = search.search(1, "octo", 2)
+        second = search.search(1, "octo", 2, offset=2)
+        assert len(first) == 2 and len(second) == 1
+        assert {r for r, _ in first + second} == {1, 2, 3}
+        assert search.search(1, "  ?! ", 10) == []
+
+
+class TestSnippet:
+    """Tests pour l'extrait affiché autour du terme trouvé."""
+
+    def test_snippet_around_term(self):
+        """Test que l'extrait commence près du terme, sans Markdown."""
+        body = "### Titre\n" + "mot " * 100 + "**injection** SQL ici"
+        excerpt = snippet(body, "injection", length=40)
+
+        assert excerpt.startswith("…")
+        assert "injection SQL ici" in excerpt
+        assert "**" not in excerpt
+
+
+class TestCompression:
+    """Tests pour la compression des rapports."""
+
+    def test_round_trip(self):
+        """Test qu'un rapport compressé puis décompressé est identique, accents et emojis compris."""
+        report = "### Sécurité 🔒\n" + "- Requête SQL construite par concaténation.\n" * 200
+
+        data = compress_text(report)
+        assert decompress_text(data) == report
+        assert len(data) < len(report.encode("utf-8")) / 10
+
+    def test_empty_report(self):
+        """Test qu'un rapport vide ou absent redonne une chaîne vide."""
+        assert decompress_text(compress_text("")) == ""
+        assert decompress_text(compress_text(None)) == ""
+
+    def test_review_stores_compressed_report(self, app_module):
+        """Test que Review.ai_result est écrit compressé et vide l'ancienne colonne texte."""
+        # Revue enregistrée avant la compression : seul l'ancien texte est rempli
+        review = app_module.Review(repo_name="octo/app", pr_number=1, ai_result_text="ancien")
+        assert review.ai_result == "ancien"
+
+        review.ai_result = "nouveau"
+        assert (review.ai_result_text, decompress_text(review.ai_result_z)) == ("", "nouveau")
+        assert review.ai_result == "nouveau"
+
+
+class TestSearchApi:
+    """Tests pour GET /api/search et la recherche de /historique."""
+
+    def _add_review(self, app_module, client, pr_number, report):
+        with client.session_transaction() as session:
+            user_id = session["user_id"]
+        with app_module.app.app_context():
+            review = app_module.Review(repo_name="octo/app", pr_number=pr_number, user_id=user_id,
+                                       ai_result=report, level="senior")
+            app_module.db.session.add(review)
+            app_module.db.session.commit()
+            return review.id
+
+    def test_new_reviews_are_searchable(self, app_module, client):
+        """Test qu'une revue enregistrée est trouvée aussitôt, avec un extrait de son rapport."""
+        found = self._add_review(app_module, client, 1, "### Sécurité\nInjection SQL possible.")
+        self._add_review(app_module, client, 2, "### Style\nNommage des variables.")
+
+        response = client.get("/api/search?q=injection").get_json()
+        assert [r["id"] for r in response["results"]] == [found]
+        assert "Injection" in response["results"][0]["snippet"]
+        assert response["next_page"] is None
+
+    def test_search_is_shown_in_history(self, app_module, client):
+        """Test que /historique?q= affiche les revues trouvées."""
+        found = self._add_review(app_module, client, 1, "### Performance\nBoucle inutile.")
+
+        page = client.get("/historique?q=boucle").get_data(as_text=True)
+        assert f'data-review-id="{found}"' in page
+
+    def test_empty_query_and_login(self, app_module, client):
+        """Test qu'une recherche vide renvoie 400 et qu'une connexion est exigée."""
+        assert client.get("/api/search?q=%20").status_code == 400
+        assert app_module.app.test_client().get("/api/search?q=sql").status_code == 401
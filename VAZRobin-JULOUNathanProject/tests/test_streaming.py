@@ -0,0 +1,41 @@
+"""Tests pour le streaming (SSE) des revues et des réponses du chat."""
+
+import json
+
+
+def _events(response):
+    """Événements SSE d'une réponse : liste de (nom, données)."""
+    events = []
+    for block in response.get_data(as_text=True).split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreaming:
+    """Tests pour les flux SSE."""
+
+    def test_job_stream_relays_tokens_then_result(self, client, fake_github, fake_ai):
+        """Test que le flux d'une analyse relaie les tokens puis le résultat."""
+        job_id = client.post("/api/analyze", json={"owner": "octo", "repo": "app", "pr": 3, "force": True}).get_json()["job_id"]
+        events = _events(client.get(f"/api/jobs/{job_id}/stream"))
+
+        assert events[0] == ("token", {"text": "### Rapport\n"})
+        name, result = events[-1]
+        assert name == "done"
+        assert result["review_id"]
+
+    def test_chat_stream_saves_the_full_reply(self, monkeypatch, app_module, client, review_id):
+        """Test que le chat streamé relaie chaque morceau et enregistre la réponse complète."""
+        monkeypatch.setattr(app_module, "stream_chat_with_ia", lambda messages: iter(["Bon", "jour"]))
+
+        events = _events(client.post("/api/chat/stream", json={"review_id": review_id, "message": "Salut"}))
+
+        assert events == [("token", {"text": "Bon"}), ("token", {"text": "jour"}), ("done", {"reply": "Bonjour"})]
+        messages = client.get(f"/api/reviews/{review_id}/messages").get_json()["messages"]
+        assert [(m["role"], m["content"]) for m in messages] == [("user", "Salut"), ("assistant", "Bonjour")]
+
+    def test_stream_of_unknown_job(self, client):
+        """Test qu'un flux de tâche inconnue répond 404."""
+        assert client.get("/api/jobs/inconnu/stream").status_code == 404
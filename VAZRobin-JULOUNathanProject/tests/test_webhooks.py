@@ -0,0 +1,110 @@
+"""Tests pour la vérification et la lecture des webhooks GitHub."""
+
+import json
+import threading
+
+from src.job_queue import JobQueue
+from src.webhooks import sign_payload, verify_signature, parse_pull_request_event
+
+SECRET = "s3cret"
+BODY = b'{"action": "opened"}'
+
+
+def _event(action="opened", draft=False):
+    return {
+        "action": action,
+        "repository": {"name": "app", "owner": {"login": "octo"}},
+        "pull_request": {"number": 12, "draft": draft, "head": {"sha": "a" * 40}},
+    }
+
+
+class TestVerifySignature:
+    """Tests pour la signature HMAC des webhooks."""
+
+    def test_valid_signature(self):
+        """Test qu'une signature calculée avec le secret est acceptée."""
+        assert verify_signature(SECRET, BODY, sign_payload(SECRET, BODY))
+
+    def test_wrong_secret_or_tampered_body(self):
+        """Test qu'un autre secret ou un corps modifié est refusé."""
+        assert not verify_signature(SECRET, BODY, sign_payload("autre", BODY))
+        assert not verify_signature(SECRET, BODY + b" ", sign_payload(SECRET, BODY))
+
+    def test_missing_secret_or_header(self):
+        """Test que sans secret configuré ou sans en-tête, tout est refusé."""
+        assert not verify_signature("", BODY, sign_payload("", BODY))
+        assert not verify_signature(SECRET, BODY, None)
+
+
+class TestParsePullRequestEvent:
+    """Tests pour l'extraction de la PR à relire."""
+
+    def test_opened_pull_request(self):
+        """Test qu'une PR ouverte donne le dépôt, le numéro et le commit de tête."""
+        assert parse_pull_request_event("pull_request", _event()) == {
+            "owner": "octo", "repo": "app", "pr": 12, "head_sha": "a" * 40,
+        }
+
+    def test_ignored_events(self):
+        """Test que les autres événements, actions et brouillons sont ignorés."""
+        assert parse_pull_request_event("push", _event()) is None
+        assert parse_pull_request_event("pull_request", _event(action="closed")) is None
+        assert parse_pull_request_event("pull_request", _event(draft=True)) is None
+        assert parse_pull_request_event("pull_request", {"action": "opened"}) is None
+
+
+class TestWebhookEndpoint:
+    """Tests pour POST /api/webhooks/github."""
+
+    def _post(self, app_module, body, signature=None, event="pull_request"):
+        return app_module.app.test_client().post("/api/webhooks/github", data=body, headers={
+            "X-GitHub-Event": event,
+            "X-Hub-Signature-256": signature or sign_payload(SECRET, body),
+            "Content-Type": "application/json",
+        })
+
+    def _queue(self, monkeypatch, app_module, max_workers, max_pending, levels=("junior", "senior")):
+        """File de fond réduite dont les tâches attendent release pour se terminer."""
+        release = threading.Event()
+        queue = JobQueue(max_workers=max_workers, max_pending=max_pending)
+        monkeypatch.setattr(app_module, "GITHUB_WEBHOOK_SECRET", SECRET)
+        monkeypatch.setattr(app_module, "WEBHOOK_LEVELS", list(levels))
+        monkeypatch.setattr(app_module, "bulk_queue", queue)
+        monkeypatch.setattr(app_module, "run_analysis", lambda *args, **kwargs: release.wait(5))
+        return queue, release
+
+    def test_disabled_without_secret(self, monkeypatch, app_module):
+        """Test que le webhook répond 503 tant qu'aucun secret n'est configuré."""
+        monkeypatch.setattr(app_module, "GITHUB_WEBHOOK_SECRET", "")
+        assert self._post(app_module, BODY).status_code == 503
+
+    def test_invalid_signature_is_rejected(self, monkeypatch, app_module):
+        """Test qu'une signature faite avec un autre secret est refusée."""
+        monkeypatch.setattr(app_module, "GITHUB_WEBHOOK_SECRET", SECRET)
+        assert self._post(app_module, BODY, signature=sign_payload("autre", BODY)).status_code == 401
+
+    def test_invalid_json_is_rejected(self, monkeypatch, app_module):
+        """Test qu'un corps signé mais illisible renvoie 400."""
+        monkeypatch.setattr(app_module, "GITHUB_WEBHOOK_SECRET", SECRET)
+        assert self._post(app_module, b"pas du json").status_code == 400
+
+    def test_one_job_per_level(self, monkeypatch, app_module):
+        """Test qu'une PR ouverte planifie une revue par niveau configuré."""
+        queue, release = self._queue(monkeypatch, app_module, max_workers=2, max_pending=0)
+        try:
+            response = self._post(app_module, json.dumps(_event()).encode())
+            assert response.status_code == 202
+            assert len(response.get_json()["job_ids"]) == 2
+        finally:
+            release.set()
+
+    def test_full_queue_schedules_nothing(self, monkeypatch, app_module):
+        """Test que sans place pour tous les niveaux, aucune revue n'est planifiée (503)."""
+        queue, release = self._queue(monkeypatch, app_module, max_workers=1, max_pending=0)
+        try:
+            response = self._post(app_module, json.dumps(_event()).encode())
+            assert response.status_code == 503
+            assert "job_ids" not in response.get_json()
+            assert queue.stats() == {"pending": 0, "running": 0, "success": 0, "error": 0}
+        finally:
+            release.set()